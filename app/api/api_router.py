@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
 from app.api.routers.auth import auth_router
+from app.api.routers.metrics import metrics_router
 from app.api.routers.post import post_router
 from app.api.routers.user import user_router
 
@@ -9,3 +10,4 @@ api_router = APIRouter(prefix="/api")
 api_router.include_router(auth_router, prefix="/auth", tags=["Auth"])
 api_router.include_router(user_router, prefix="/users", tags=["Users"])
 api_router.include_router(post_router, prefix="/posts", tags=["Posts"])
+api_router.include_router(metrics_router, prefix="/metrics", tags=["Metrics"])
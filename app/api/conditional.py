@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.api.responses import DTOResponse
+
+NOT_MODIFIED = {304: {"description": "The cached copy is still current"}}
+
+
+class ConditionalGet:
+    """``If-None-Match`` and ``If-Modified-Since`` of a GET, as a dependency.
+
+    Routes compute the validators from something cheaper than the response,
+    a version counter or a single ``updated_at``, and answer 304 before
+    building the DTO when the client's copy is current. If-None-Match takes
+    precedence, as RFC 9110 asks.
+    """
+
+    def __init__(self, request: Request) -> None:
+        self.request = request
+        self.if_none_match = _parse_etags(request.headers.get("if-none-match"))
+        self.if_modified_since = _parse_date(request.headers.get("if-modified-since"))
+
+    @property
+    def present(self) -> bool:
+        return self.if_none_match is not None or self.if_modified_since is not None
+
+    def list_etag(self, version: int) -> str:
+        """ETag of a list page: the version of the list plus the path and
+        query, which select the page."""
+        url = self.request.url
+        query = urlencode(sorted(self.request.query_params.multi_items()))
+        digest = blake2b(f"{url.path}?{query}".encode(), digest_size=8).hexdigest()
+        return f'"{version}-{digest}"'
+
+    def is_fresh(self, etag: str, last_modified: datetime | None = None) -> bool:
+        if self.if_none_match is not None:
+            return "*" in self.if_none_match or etag in self.if_none_match
+        if self.if_modified_since is not None and last_modified is not None:
+            # HTTP dates have whole seconds.
+            return _utc(last_modified).replace(microsecond=0) <= self.if_modified_since
+        return False
+
+    def not_modified(
+        self, etag: str, last_modified: datetime | None = None
+    ) -> Response:
+        return Response(status_code=304, headers=_validators(etag, last_modified))
+
+    def respond(
+        self, content: BaseModel, etag: str, last_modified: datetime | None = None
+    ) -> Response:
+        if self.is_fresh(etag, last_modified):
+            return self.not_modified(etag, last_modified)
+        return DTOResponse(content, headers=_validators(etag, last_modified))
+
+
+def entity_etag(kind: str, entity_id: int, updated_at: datetime | None) -> str:
+    stamp = f"{updated_at:%Y%m%d%H%M%S%f}" if updated_at else "0"
+    return f'"{kind}-{entity_id}-{stamp}"'
+
+
+def _validators(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+    return headers
+
+
+def _utc(value: datetime) -> datetime:
+    # Timestamps are stored without a time zone, in UTC.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _parse_etags(header: str | None) -> set[str] | None:
+    if header is None:
+        return None
+    # If-None-Match uses the weak comparison, so W/ is ignored.
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def _parse_date(header: str | None) -> datetime | None:
+    if header is None:
+        return None
+    try:
+        return _utc(parsedate_to_datetime(header))
+    except (TypeError, ValueError):
+        # An invalid date is ignored, like a missing one.
+        return None
@@ -8,6 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import sessionmanager
 from app.models.common.enums.token_type import TokenType
 from app.repositories.comment_gateway import CommentDbGateway
+from app.repositories.comment_stats_gateway import CommentStatsDbGateway
+from app.repositories.counter_gateway import CounterDbGateway
 from app.repositories.post_gateway import PostDbGateway
 from app.repositories.user_gateway import UserDbGateway
 from app.schemas.auth import RefreshToken
@@ -21,7 +23,8 @@ bearer = HTTPBearer(auto_error=False)
 
 
 async def get_db() -> AsyncIterator[AsyncSession]:
-    async with sessionmanager.session() as db:
+    # One transaction per request, committed after the endpoint returns.
+    async with sessionmanager.transaction() as db:
         yield db
 
 
@@ -33,16 +36,27 @@ async def get_post_gateway(db: AsyncSession = Depends(get_db)) -> PostDbGateway:
     return PostDbGateway(db)
 
 
+async def get_counter_gateway(db: AsyncSession = Depends(get_db)) -> CounterDbGateway:
+    return CounterDbGateway(db)
+
+
 async def get_post_service(
     gateway: PostDbGateway = Depends(get_post_gateway),
+    counter_gateway: CounterDbGateway = Depends(get_counter_gateway),
 ) -> PostService:
-    return PostService(gateway)
+    return PostService(gateway, counter_gateway)
 
 
 async def get_comment_gateway(db: AsyncSession = Depends(get_db)) -> CommentDbGateway:
     return CommentDbGateway(db)
 
 
+async def get_comment_stats_gateway(
+    db: AsyncSession = Depends(get_db),
+) -> CommentStatsDbGateway:
+    return CommentStatsDbGateway(db)
+
+
 async def get_auth_service(
     gateway: UserDbGateway = Depends(get_user_gateway),
 ) -> AuthenticationService:
@@ -52,14 +66,17 @@ async def get_auth_service(
 async def get_comment_service(
     comment_gateway: CommentDbGateway = Depends(get_comment_gateway),
     post_gateway: PostDbGateway = Depends(get_post_gateway),
+    counter_gateway: CounterDbGateway = Depends(get_counter_gateway),
+    stats_gateway: CommentStatsDbGateway = Depends(get_comment_stats_gateway),
 ) -> CommentService:
-    return CommentService(comment_gateway, post_gateway)
+    return CommentService(comment_gateway, post_gateway, counter_gateway, stats_gateway)
 
 
 async def get_user_service(
     gateway: UserDbGateway = Depends(get_user_gateway),
+    counter_gateway: CounterDbGateway = Depends(get_counter_gateway),
 ) -> UserService:
-    return UserService(gateway)
+    return UserService(gateway, counter_gateway)
 
 
 async def get_current_auth_user(
@@ -70,6 +87,14 @@ async def get_current_auth_user(
     return await auth_service.get_auth_user(credentials, TokenType.ACCESS)
 
 
+async def get_current_token_user(
+    token: HTTPAuthorizationCredentials = Depends(bearer),
+    auth_service: AuthenticationService = Depends(get_auth_service),
+) -> UserDTO:
+    credentials = token.credentials if token else None
+    return await auth_service.get_token_user(credentials)
+
+
 async def get_current_auth_user_refresh(
     token: RefreshToken,
     auth_service: AuthenticationService = Depends(get_auth_service),
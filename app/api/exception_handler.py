@@ -3,7 +3,7 @@ from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 
 from app.core.exceptions.auth import AuthenticationError
-from app.core.exceptions.common import AccessDenied, ProfanityContent
+from app.core.exceptions.common import AccessDenied, ProfanityContent, ServiceOverloaded
 from app.core.exceptions.entity import EntityNotFoundError, UserAlreadyExists
 
 
@@ -29,3 +29,11 @@ async def entity_not_found_error_handler(request: Request, exc: EntityNotFoundEr
 
 async def user_already_exists_handler(request: Request, exc: UserAlreadyExists):
     return JSONResponse(status_code=409, content={"detail": exc.detail})
+
+
+async def service_overloaded_handler(request: Request, exc: ServiceOverloaded):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
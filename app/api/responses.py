@@ -0,0 +1,20 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class DTOResponse(JSONResponse):
+    """JSON body rendered straight from a DTO by pydantic's compiled
+    serializer.
+
+    A route that returns one skips FastAPI's handling of the return value,
+    which validates the DTO again against ``response_model``, converts it to
+    plain Python objects and only then encodes them. Declare the
+    ``response_model`` anyway, it still documents the endpoint.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, status
+from fastapi.security.http import HTTPAuthorizationCredentials
 
 from app.api.dependencies import (
+    bearer,
     get_auth_service,
     get_current_auth_user,
     get_current_auth_user_refresh,
@@ -21,7 +23,7 @@ async def sign_up(
     auth_service: AuthenticationService = Depends(get_auth_service),
 ) -> SignUpResultDTO:
     user = await user_service.create_user(user_data)
-    tokens = auth_service.generate_tokens(user.id)
+    tokens = auth_service.generate_tokens(user)
     return SignUpResultDTO(user=user, tokens=tokens)
 
 
@@ -43,4 +45,12 @@ async def refresh_access_token(
     user: UserDTO = Depends(get_current_auth_user_refresh),
     auth_service: AuthenticationService = Depends(get_auth_service),
 ) -> TokenInfo:
-    return auth_service.generate_tokens(user.id, access_only=True)
+    return auth_service.generate_tokens(user, access_only=True)
+
+
+@auth_router.post("/logout/", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token: HTTPAuthorizationCredentials = Depends(bearer),
+    auth_service: AuthenticationService = Depends(get_auth_service),
+) -> None:
+    await auth_service.revoke_token(token.credentials if token else None)
@@ -1,11 +1,18 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import StreamingResponse
 
-from app.api.dependencies import get_comment_service, get_current_auth_user
+from app.api.conditional import NOT_MODIFIED, ConditionalGet, entity_etag
+from app.api.dependencies import get_comment_service, get_current_token_user
+from app.api.responses import DTOResponse
 from app.models.user import User
+from app.schemas.bulk import BulkCreateRequest
 from app.schemas.comment import (
+    BulkCreateCommentsDTO,
+    BulkCreateCommentsResultDTO,
     CommentDTO,
     CommentsListResultDTO,
     CommentsStatResultDTO,
+    CommentTreeDTO,
     CreateCommentDTO,
     CreateCommentRequest,
     DeleteCommentDTO,
@@ -13,6 +20,7 @@ from app.schemas.comment import (
     ReadCommentsListDTO,
     ReadCommentsStatDTO,
     ReadCommentsStatRequest,
+    ReadCommentTreeRequest,
     UpdateCommentDTO,
     UserCommentData,
 )
@@ -27,7 +35,7 @@ comment_router = APIRouter()
 async def create_comment(
     body: CreateCommentRequest,
     post_id: PostId = Depends(),
-    current_user: User = Depends(get_current_auth_user),
+    current_user: User = Depends(get_current_token_user),
     comment_service: CommentService = Depends(get_comment_service),
 ) -> CommentDTO:
     dto = CreateCommentDTO(
@@ -36,29 +44,95 @@ async def create_comment(
     return await comment_service.create_comment(dto)
 
 
-@comment_router.get("/{post_id}/comments/")
+@comment_router.post("/{post_id}/comments/bulk/")
+async def create_comments(
+    body: BulkCreateRequest,
+    post_id: PostId = Depends(),
+    current_user: User = Depends(get_current_token_user),
+    comment_service: CommentService = Depends(get_comment_service),
+) -> BulkCreateCommentsResultDTO:
+    dto = BulkCreateCommentsDTO(
+        user_id=current_user.id, post_id=post_id.post_id, items=body.items
+    )
+    return await comment_service.create_comments(dto)
+
+
+@comment_router.get(
+    "/{post_id}/comments/",
+    response_model=CommentsListResultDTO,
+    response_class=DTOResponse,
+    responses=NOT_MODIFIED,
+)
 async def read_all_comments(
     post_id: PostId = Depends(),
     pagination: Pagination = Depends(),
+    conditional: ConditionalGet = Depends(),
     comment_service: CommentService = Depends(get_comment_service),
-) -> CommentsListResultDTO:
+) -> Response:
+    etag = conditional.list_etag(await comment_service.get_comments_version(post_id))
+    if conditional.is_fresh(etag):
+        return conditional.not_modified(etag)
     dto = ReadCommentsListDTO(post_id=post_id.post_id, pagination=pagination)
-    return await comment_service.get_post_comments(dto)
+    return conditional.respond(await comment_service.get_post_comments(dto), etag)
 
 
-@comment_router.get("/{post_id}/comments/{comment_id}/")
+@comment_router.get(
+    "/{post_id}/comments/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def export_comments(
+    post_id: PostId = Depends(),
+    comment_service: CommentService = Depends(get_comment_service),
+) -> StreamingResponse:
+    lines = await comment_service.export_comments(post_id)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+@comment_router.get(
+    "/{post_id}/comments/tree/",
+    response_model=CommentTreeDTO,
+    response_class=DTOResponse,
+    responses=NOT_MODIFIED,
+)
+async def read_comment_tree(
+    query: ReadCommentTreeRequest = Depends(),
+    conditional: ConditionalGet = Depends(),
+    comment_service: CommentService = Depends(get_comment_service),
+) -> Response:
+    etag = conditional.list_etag(await comment_service.get_comments_version(query))
+    if conditional.is_fresh(etag):
+        return conditional.not_modified(etag)
+    return conditional.respond(await comment_service.get_comment_tree(query), etag)
+
+
+@comment_router.get(
+    "/{post_id}/comments/{comment_id}/",
+    response_model=CommentDTO,
+    response_class=DTOResponse,
+    responses=NOT_MODIFIED,
+)
 async def read_comment(
     query: ReadCommentRequest = Depends(),
+    conditional: ConditionalGet = Depends(),
     comment_service: CommentService = Depends(get_comment_service),
-) -> CommentDTO:
-    return await comment_service.get_comment(query)
+) -> Response:
+    if conditional.present:
+        # Revalidation reads only the timestamp, not the whole comment.
+        updated_at = await comment_service.get_comment_updated_at(query)
+        etag = entity_etag("comment", query.comment_id, updated_at)
+        if conditional.is_fresh(etag, updated_at):
+            return conditional.not_modified(etag, updated_at)
+    comment = await comment_service.get_comment(query)
+    etag = entity_etag("comment", comment.id, comment.updated_at)
+    return conditional.respond(comment, etag, comment.updated_at)
 
 
 @comment_router.patch("/{post_id}/comments/{comment_id}/")
 async def update_comment(
     body: UserCommentData,
     query: ReadCommentRequest = Depends(),
-    current_user: User = Depends(get_current_auth_user),
+    current_user: User = Depends(get_current_token_user),
     comment_service: CommentService = Depends(get_comment_service),
 ) -> CommentDTO:
     dto = UpdateCommentDTO(
@@ -70,7 +144,7 @@ async def update_comment(
 @comment_router.delete("/{post_id}/comments/{comment_id}/")
 async def delete_comment(
     query: ReadCommentRequest = Depends(),
-    current_user: User = Depends(get_current_auth_user),
+    current_user: User = Depends(get_current_token_user),
     comment_service: CommentService = Depends(get_comment_service),
 ) -> CommentDTO:
     dto = DeleteCommentDTO(user_id=current_user.id, **query.model_dump())
@@ -80,7 +154,7 @@ async def delete_comment(
 @comment_router.get("/{post_id}/comments-daily-breakdown")
 async def get_comments_statistics(
     query: ReadCommentsStatRequest = Depends(),
-    current_user: User = Depends(get_current_auth_user),
+    current_user: User = Depends(get_current_token_user),
     comment_service: CommentService = Depends(get_comment_service),
 ) -> list[CommentsStatResultDTO]:
     dto = ReadCommentsStatDTO(user_id=current_user.id, **query.model_dump())
@@ -0,0 +1,12 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from app.core.metrics import metrics
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/")
+async def read_metrics() -> dict[str, dict[str, Any]]:
+    return metrics.collect()
@@ -1,15 +1,15 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
-from app.api.dependencies import (
-    get_current_auth_user,
-    get_post_gateway,
-    get_post_service,
-)
+from app.api.conditional import NOT_MODIFIED, ConditionalGet, entity_etag
+from app.api.dependencies import get_current_token_user, get_post_service
+from app.api.responses import DTOResponse
 from app.api.routers.comment import comment_router
 from app.models.user import User
-from app.repositories.post_gateway import PostDbGateway
+from app.schemas.bulk import BulkCreateRequest
 from app.schemas.pagination import Pagination
 from app.schemas.post import (
+    BulkCreatePostsDTO,
+    BulkCreatePostsResultDTO,
     CreatePostDTO,
     CreatePostRequest,
     DeletePostDTO,
@@ -27,39 +27,63 @@ post_router.include_router(comment_router, tags=["Comments"])
 @post_router.post("/create/")
 async def create_post(
     user_data: CreatePostRequest,
-    current_user: User = Depends(get_current_auth_user),
+    current_user: User = Depends(get_current_token_user),
     post_service: PostService = Depends(get_post_service),
 ) -> PostDTO:
     dto = CreatePostDTO(user_id=current_user.id, **user_data.model_dump())
     return await post_service.create_post(dto)
 
 
-@post_router.get("/")
+@post_router.post("/bulk/")
+async def create_posts(
+    body: BulkCreateRequest,
+    current_user: User = Depends(get_current_token_user),
+    post_service: PostService = Depends(get_post_service),
+) -> BulkCreatePostsResultDTO:
+    dto = BulkCreatePostsDTO(user_id=current_user.id, items=body.items)
+    return await post_service.create_posts(dto)
+
+
+@post_router.get(
+    "/",
+    response_model=PostsListResultDTO,
+    response_class=DTOResponse,
+    responses=NOT_MODIFIED,
+)
 async def read_posts_all(
     pagination: Pagination = Depends(),
-    post_gateway: PostDbGateway = Depends(get_post_gateway),
-) -> PostsListResultDTO:
-    posts, total = await post_gateway.get_list(pagination.skip, pagination.limit)
-
-    posts_response = [
-        PostDTO.model_validate(post, from_attributes=True) for post in posts
-    ]
-    return PostsListResultDTO(posts=posts_response, total=total)
+    conditional: ConditionalGet = Depends(),
+    post_service: PostService = Depends(get_post_service),
+) -> Response:
+    # Read before the page, so a concurrent write can only make the ETag
+    # older than the body and never the other way round.
+    etag = conditional.list_etag(await post_service.get_posts_version())
+    if conditional.is_fresh(etag):
+        return conditional.not_modified(etag)
+    return conditional.respond(await post_service.get_posts(pagination), etag)
 
 
-@post_router.get("/{post_id}/")
+@post_router.get(
+    "/{post_id}/",
+    response_model=PostDTO,
+    response_class=DTOResponse,
+    responses=NOT_MODIFIED,
+)
 async def read_post(
     post_id: PostId = Depends(),
+    conditional: ConditionalGet = Depends(),
     post_service: PostService = Depends(get_post_service),
-) -> PostDTO:
-    return await post_service.get_post(post_id)
+) -> Response:
+    post = await post_service.get_post(post_id)
+    etag = entity_etag("post", post.id, post.updated_at)
+    return conditional.respond(post, etag, post.updated_at)
 
 
 @post_router.patch("/{post_id}/")
 async def update_post(
     user_data: CreatePostRequest,
     post_id: PostId = Depends(),
-    current_user: User = Depends(get_current_auth_user),
+    current_user: User = Depends(get_current_token_user),
     post_service: PostService = Depends(get_post_service),
 ) -> PostDTO:
     dto = UpdatePostDTO(
@@ -71,7 +95,7 @@ async def update_post(
 @post_router.delete("/{post_id}/")
 async def delete_post(
     post_id: PostId = Depends(),
-    current_user: User = Depends(get_current_auth_user),
+    current_user: User = Depends(get_current_token_user),
     post_service: PostService = Depends(get_post_service),
 ) -> PostDTO:
     dto = DeletePostDTO(post_id=post_id.post_id, user_id=current_user.id)
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
-from app.api.dependencies import get_user_gateway, get_user_service
-from app.repositories.user_gateway import UserDbGateway
+from app.api.conditional import NOT_MODIFIED, ConditionalGet, entity_etag
+from app.api.dependencies import get_user_service
+from app.api.responses import DTOResponse
 from app.schemas.pagination import Pagination
 from app.schemas.user import UserDTO, UserId, UsersListResultDTO
 from app.services.user_service import UserService
@@ -9,20 +10,34 @@ from app.services.user_service import UserService
 user_router = APIRouter()
 
 
-@user_router.get("/")
+@user_router.get(
+    "/",
+    response_model=UsersListResultDTO,
+    response_class=DTOResponse,
+    responses=NOT_MODIFIED,
+)
 async def read_users_all(
     pagination: Pagination = Depends(),
-    user_gateway: UserDbGateway = Depends(get_user_gateway),
-) -> UsersListResultDTO:
-    users, total = await user_gateway.get_list(pagination.skip, pagination.limit)
-    users_response = [
-        UserDTO.model_validate(user, from_attributes=True) for user in users
-    ]
-    return UsersListResultDTO(users=users_response, total=total)
+    conditional: ConditionalGet = Depends(),
+    user_service: UserService = Depends(get_user_service),
+) -> Response:
+    etag = conditional.list_etag(await user_service.get_users_version())
+    if conditional.is_fresh(etag):
+        return conditional.not_modified(etag)
+    return conditional.respond(await user_service.get_users(pagination), etag)
 
 
-@user_router.get("/{user_id}/")
+@user_router.get(
+    "/{user_id}/",
+    response_model=UserDTO,
+    response_class=DTOResponse,
+    responses=NOT_MODIFIED,
+)
 async def read_user(
-    user_id: UserId = Depends(), user_service: UserService = Depends(get_user_service)
-) -> UserDTO:
-    return await user_service.get_user(user_id)
+    user_id: UserId = Depends(),
+    conditional: ConditionalGet = Depends(),
+    user_service: UserService = Depends(get_user_service),
+) -> Response:
+    user = await user_service.get_user(user_id)
+    etag = entity_etag("user", user.id, user.updated_at)
+    return conditional.respond(user, etag, user.updated_at)
@@ -0,0 +1,99 @@
+import asyncio
+import random
+from typing import Any
+
+import httpx
+from groq import APIConnectionError, APIStatusError, AsyncGroq
+
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class AIClient:
+    """Process-wide Groq client sharing one HTTP connection pool.
+
+    The underlying ``AsyncGroq`` client is created on first use (or by
+    ``start``) and reused by every AI reply until ``close``. Retries are done
+    here with full-jitter exponential backoff instead of the SDK's own.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None,
+        base_url: str | None,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        timeout: float,
+        connect_timeout: float,
+        max_retries: int,
+        backoff: float,
+        backoff_max: float,
+    ) -> None:
+        self.api_key = api_key
+        self.base_url = base_url
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self._client: AsyncGroq | None = None
+        self._requests = 0
+        self._retries = 0
+        self._failures = 0
+
+    @property
+    def client(self) -> AsyncGroq:
+        if self._client is None:
+            self._client = AsyncGroq(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                max_retries=0,
+                http_client=httpx.AsyncClient(limits=self.limits, timeout=self.timeout),
+            )
+        return self._client
+
+    def start(self) -> None:
+        self.client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def complete(self, messages: list[dict[str, str]], model: str) -> str:
+        attempt = 0
+        while True:
+            self._requests += 1
+            try:
+                response = await self.client.chat.completions.create(
+                    messages=messages, model=model
+                )
+                return response.choices[0].message.content
+            except (APIConnectionError, APIStatusError) as exc:
+                if attempt >= self.max_retries or not self._should_retry(exc):
+                    self._failures += 1
+                    raise
+            attempt += 1
+            self._retries += 1
+            await asyncio.sleep(self._backoff_delay(attempt))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "requests": self._requests,
+            "retries": self._retries,
+            "failures": self._failures,
+            "max_connections": self.limits.max_connections,
+        }
+
+    @staticmethod
+    def _should_retry(exc: Exception) -> bool:
+        if isinstance(exc, APIStatusError):
+            return exc.status_code in RETRY_STATUS_CODES
+        return True
+
+    def _backoff_delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2**attempt))
@@ -0,0 +1,195 @@
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, TypeVar
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+T = TypeVar("T")
+
+
+class TTLCache(Generic[T]):
+    """Bounded LRU cache whose entries also expire after a deadline.
+
+    Entries are dropped on access once expired; when the cache is full the
+    least recently used entry is evicted. ``maxsize=0`` disables caching.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, T]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> T | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key: Hashable, value: T, expires_at: float | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+        deadline = time.time() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        self._entries[key] = (deadline, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+        }
+
+
+# Sets KEYS[1] only while the generation in KEYS[2] is still ARGV[3].
+SET_IF_GENERATION = """
+if (redis.call("get", KEYS[2]) or "0") ~= ARGV[3] then
+    return 0
+end
+redis.call("set", KEYS[1], ARGV[1], "ex", ARGV[2])
+return 1
+"""
+
+
+class TieredCache:
+    """In-process TTLCache in front of an optional shared Redis tier.
+
+    Values are strings; Redis errors are counted and treated as misses so a
+    Redis outage only costs cache hits. Every delete bumps a generation of
+    the key in Redis, so a value read from the source before a delete can
+    be dropped instead of set (see :meth:`generation`).
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        maxsize: int,
+        ttl: int,
+        redis: Redis | None = None,
+        local_ttl: int | None = None,
+    ) -> None:
+        self.prefix = prefix
+        self.ttl = ttl
+        self.redis = redis
+        self.local: TTLCache[str] = TTLCache(
+            maxsize=maxsize, ttl=ttl if local_ttl is None else local_ttl
+        )
+        self._redis_hits = 0
+        self._redis_errors = 0
+
+    async def get(self, key: str) -> str | None:
+        value = self.local.get(key)
+        if value is not None or self.redis is None:
+            return value
+        try:
+            value = await self.redis.get(self.prefix + key)
+        except RedisError:
+            self._redis_errors += 1
+            return None
+        if value is None:
+            return None
+        self._redis_hits += 1
+        value = value.decode()
+        self.local.set(key, value)
+        return value
+
+    async def generation(self, key: str) -> int | None:
+        """Number of deletes of ``key`` Redis knows of, None without Redis.
+
+        Read it before loading a value and pass it to :meth:`set`.
+        """
+        if self.redis is None:
+            return None
+        try:
+            value = await self.redis.get(self._generation_key(key))
+        except RedisError:
+            self._redis_errors += 1
+            return None
+        return int(value or 0)
+
+    async def set(
+        self,
+        key: str,
+        value: str,
+        ttl: int | None = None,
+        generation: int | None = None,
+    ) -> None:
+        """Sets both tiers; with ``generation``, nothing is set if the key
+        was deleted since it was read."""
+        ttl = ttl or self.ttl
+        if self.redis is not None:
+            try:
+                if generation is None:
+                    await self.redis.set(self.prefix + key, value, ex=ttl)
+                elif not await self.redis.eval(
+                    SET_IF_GENERATION,
+                    2,
+                    self.prefix + key,
+                    self._generation_key(key),
+                    value,
+                    ttl,
+                    generation,
+                ):
+                    return
+            except RedisError:
+                self._redis_errors += 1
+        self.local.set(key, value, expires_at=time.time() + ttl)
+
+    async def delete(self, key: str) -> None:
+        self.local.delete(key)
+        if self.redis is None:
+            return
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(self.prefix + key)
+                # Loads take far less than a TTL, so the generation only has
+                # to outlive the values set before it.
+                pipe.incr(self._generation_key(key))
+                pipe.expire(self._generation_key(key), self.ttl)
+                await pipe.execute()
+        except RedisError:
+            self._redis_errors += 1
+
+    def clear(self) -> None:
+        self.local.clear()
+
+    def _generation_key(self, key: str) -> str:
+        return f"{self.prefix}generation:{key}"
+
+    def stats(self) -> dict[str, Any]:
+        local = self.local.stats()
+        hits = local["hits"] + self._redis_hits
+        lookups = local["hits"] + local["misses"]
+        return {
+            **local,
+            "redis": self.redis is not None,
+            "redis_hits": self._redis_hits,
+            "redis_errors": self._redis_errors,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
@@ -8,6 +8,12 @@ load_dotenv()
 class Config:
     DB_URI = os.getenv("DB_URI")
     TEST_DB_URI = os.getenv("TEST_DB_URI")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", -1))  # seconds, -1 = never
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
 
     REDIS_HOST = os.getenv("REDIS_HOST")
     REDIS_PORT = os.getenv("REDIS_PORT")
@@ -17,11 +23,55 @@ class Config:
 
     ACCESS_TOKEN_EXPIRE_MINUTES = 30
     REFRESH_TOKEN_EXPIRE_DAYS = 30
+    JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", 10000))  # 0 disables the cache
+    JWT_CACHE_TTL = int(os.getenv("JWT_CACHE_TTL", 300))
+    TOKEN_DENYLIST_REDIS = os.getenv("TOKEN_DENYLIST_REDIS", "true").lower() == "true"
+
+    PASSWORD_HASHER_EXECUTOR = os.getenv("PASSWORD_HASHER_EXECUTOR", "thread")
+    PASSWORD_HASHER_WORKERS = int(os.getenv("PASSWORD_HASHER_WORKERS", 4))
+    PASSWORD_HASHER_MAX_QUEUE = int(os.getenv("PASSWORD_HASHER_MAX_QUEUE", 64))
+
+    ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", 10000))
+    ENTITY_CACHE_TTL = int(os.getenv("ENTITY_CACHE_TTL", 300))
+    ENTITY_CACHE_LOCAL_TTL = int(os.getenv("ENTITY_CACHE_LOCAL_TTL", 5))
+    ENTITY_CACHE_NEGATIVE_TTL = int(os.getenv("ENTITY_CACHE_NEGATIVE_TTL", 30))
+    ENTITY_CACHE_REDIS = os.getenv("ENTITY_CACHE_REDIS", "true").lower() == "true"
+
+    COMMENT_STATS_RECONCILE_DAYS = int(os.getenv("COMMENT_STATS_RECONCILE_DAYS", 7))
+    COMMENT_STATS_RECONCILE_HOUR = int(os.getenv("COMMENT_STATS_RECONCILE_HOUR", 0))
+
+    MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 100))
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+    BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 100))
+
+    POST_PURGE_ASYNC_THRESHOLD = int(os.getenv("POST_PURGE_ASYNC_THRESHOLD", 5000))
+    POST_PURGE_BATCH_SIZE = int(os.getenv("POST_PURGE_BATCH_SIZE", 1000))
+    POST_PURGE_INTERVAL = int(os.getenv("POST_PURGE_INTERVAL", 60))  # seconds
+
+    PROFANITY_OFFLOAD_THRESHOLD = int(os.getenv("PROFANITY_OFFLOAD_THRESHOLD", 2000))
 
     SERVER_HOST = os.getenv("SERVER_HOST")
     SERVER_PORT = int(os.getenv("SERVER_PORT"))
 
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+    GROQ_BASE_URL = os.getenv("GROQ_BASE_URL")  # None means the SDK default
+    AI_MAX_CONNECTIONS = int(os.getenv("AI_MAX_CONNECTIONS", 10))
+    AI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("AI_MAX_KEEPALIVE_CONNECTIONS", 10))
+    AI_KEEPALIVE_EXPIRY = float(os.getenv("AI_KEEPALIVE_EXPIRY", 30))
+    AI_TIMEOUT = float(os.getenv("AI_TIMEOUT", 60))
+    AI_CONNECT_TIMEOUT = float(os.getenv("AI_CONNECT_TIMEOUT", 5))
+    AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", 3))
+    AI_RETRY_BACKOFF = float(os.getenv("AI_RETRY_BACKOFF", 0.5))
+    AI_RETRY_BACKOFF_MAX = float(os.getenv("AI_RETRY_BACKOFF_MAX", 8))
+    AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", 4))
+    AI_RATE_LIMIT = float(os.getenv("AI_RATE_LIMIT", 0.5))  # requests/sec, 0 = off
+    AI_RATE_BURST = int(os.getenv("AI_RATE_BURST", 5))
+    AI_CACHE_ENABLED = os.getenv("AI_CACHE_ENABLED", "true").lower() == "true"
+    AI_CACHE_SIZE = int(os.getenv("AI_CACHE_SIZE", 1000))
+    AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", 3600))
+    AI_CACHE_REDIS = os.getenv("AI_CACHE_REDIS", "false").lower() == "true"
+    AI_HISTORY_MAX_DEPTH = int(os.getenv("AI_HISTORY_MAX_DEPTH", 30))
+    AI_HISTORY_MAX_TOKENS = int(os.getenv("AI_HISTORY_MAX_TOKENS", 4000))
     AI_MODEL = "llama3-8b-8192"  # Another models - https://console.groq.com/docs/models
     AI_PROMPT = "You're author of the post with this content: {post}. Consider the following messages from the user as comments to your post."
 
@@ -1,6 +1,6 @@
 import asyncio
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import AsyncIterator, Awaitable, Callable
 
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
@@ -11,6 +11,10 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
+from app.core.db_pool import InstrumentedPool, PoolTelemetry
+from app.core.metrics import metrics
+
+AFTER_COMMIT = "after_commit"
 
 
 class Base(DeclarativeBase):
@@ -19,7 +23,21 @@ class Base(DeclarativeBase):
 
 class DatabaseSessionManager:
     def __init__(self, db_url: str) -> None:
-        self._engine = create_async_engine(url=db_url, future=True, echo=False)
+        self._engine = create_async_engine(
+            url=db_url,
+            future=True,
+            echo=False,
+            poolclass=InstrumentedPool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            connect_args={
+                "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE
+            },
+        )
+        self.telemetry = PoolTelemetry(self._engine)
         self._sessionmaker = async_sessionmaker(
             bind=self._engine, autocommit=False, expire_on_commit=False
         )
@@ -38,6 +56,13 @@ class DatabaseSessionManager:
                 await connection.rollback()
                 raise
 
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncSession]:
+        """Session committed once when the block exits without an error."""
+        async with self.session() as session:
+            yield session
+            await commit(session)
+
     @asynccontextmanager
     async def session(self) -> AsyncIterator[AsyncSession]:
         session = self._sessionmaker()
@@ -50,4 +75,17 @@ class DatabaseSessionManager:
             await session.close()
 
 
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable]) -> None:
+    """Runs ``callback`` once ``commit`` has committed the session's work,
+    e.g. to drop cache entries or schedule jobs that must see the rows."""
+    session.info.setdefault(AFTER_COMMIT, []).append(callback)
+
+
+async def commit(session: AsyncSession) -> None:
+    await session.commit()
+    for callback in session.info.pop(AFTER_COMMIT, []):
+        await callback()
+
+
 sessionmanager = DatabaseSessionManager(settings.DB_URI)
+metrics.register("db_pool", sessionmanager.telemetry.stats)
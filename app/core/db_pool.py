@@ -0,0 +1,130 @@
+import time
+from bisect import bisect_left
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolTelemetry:
+    """Checkout wait times and connection events of one engine's pool.
+
+    ``wait_ms`` is a cumulative histogram: each bucket counts the checkouts
+    that waited at most that many milliseconds, including the time spent
+    opening a new connection.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self._buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._wait_sum = 0.0
+        self._wait_max = 0.0
+        self._checkouts = 0
+        self._max_checked_out = 0
+        self._overflow_checkouts = 0
+        self._timeouts = 0
+        self._connects = 0
+        self._connect_errors = 0
+        self._disconnects = 0
+        self._invalidations = 0
+
+        sync_engine = engine.sync_engine
+        if isinstance(sync_engine.pool, InstrumentedPool):
+            sync_engine.pool.telemetry = self
+        event.listen(sync_engine, "connect", self._on_connect)
+        event.listen(sync_engine, "invalidate", self._on_invalidate)
+        event.listen(sync_engine, "handle_error", self._on_error)
+
+    def record_checkout(
+        self, waited: float, checked_out: int, overflowed: bool
+    ) -> None:
+        waited_ms = waited * 1000
+        self._buckets[bisect_left(WAIT_BUCKETS_MS, waited_ms)] += 1
+        self._wait_sum += waited_ms
+        self._wait_max = max(self._wait_max, waited_ms)
+        self._checkouts += 1
+        self._max_checked_out = max(self._max_checked_out, checked_out)
+        if overflowed:
+            self._overflow_checkouts += 1
+
+    def record_failure(self, error: Exception) -> None:
+        if isinstance(error, exc.TimeoutError):
+            self._timeouts += 1
+        else:
+            self._connect_errors += 1
+
+    def stats(self) -> dict[str, Any]:
+        pool = self.engine.sync_engine.pool
+        histogram, total = {}, 0
+        for bound, count in zip(WAIT_BUCKETS_MS + ("+Inf",), self._buckets):
+            total += count
+            histogram[str(bound)] = total
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_checked_out": self._max_checked_out,
+            "checkouts": self._checkouts,
+            "overflow_checkouts": self._overflow_checkouts,
+            "timeouts": self._timeouts,
+            "connects": self._connects,
+            "connect_errors": self._connect_errors,
+            "disconnects": self._disconnects,
+            "invalidations": self._invalidations,
+            "wait_ms": histogram,
+            "wait_avg_ms": self._wait_sum / self._checkouts if self._checkouts else 0.0,
+            "wait_max_ms": self._wait_max,
+        }
+
+    def _on_connect(self, dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        self._connects += 1
+
+    def _on_invalidate(
+        self,
+        dbapi_connection: Any,
+        record: ConnectionPoolEntry,
+        exception: BaseException | None,
+    ) -> None:
+        self._invalidations += 1
+
+    def _on_error(self, context: ExceptionContext) -> None:
+        if context.is_disconnect:
+            self._disconnects += 1
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that reports how long each checkout waited.
+
+    Pool events fire only once a connection is handed out, so the wait is
+    measured around ``_do_get``, which blocks on a full pool and opens new
+    connections.
+    """
+
+    telemetry: PoolTelemetry | None = None
+
+    def recreate(self) -> "InstrumentedPool":
+        pool = super().recreate()
+        pool.telemetry = self.telemetry
+        return pool
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        if self.telemetry is None:
+            return super()._do_get()
+        started = time.perf_counter()
+        overflow = self.overflow()
+        try:
+            record = super()._do_get()
+        except Exception as error:
+            self.telemetry.record_failure(error)
+            raise
+        self.telemetry.record_checkout(
+            time.perf_counter() - started,
+            self.checkedout(),
+            overflowed=self.overflow() > max(overflow, 0),
+        )
+        return record
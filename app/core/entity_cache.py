@@ -0,0 +1,135 @@
+import asyncio
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from redis.asyncio import Redis
+from sqlalchemy import DateTime
+from sqlalchemy import Enum as SAEnum
+
+from app.core.cache import TieredCache
+from app.core.db import Base
+
+M = TypeVar("M", bound=Base)
+
+MISSING = "null"
+
+
+class EntityCache(Generic[M]):
+    """Read-through cache of single rows keyed by primary key.
+
+    Rows are stored as JSON of their column values and handed back as new
+    transient instances, so they are only fit for reading. Missing ids are
+    cached too, for ``negative_ttl`` seconds, and concurrent misses for the
+    same id share one loader call. A load that an ``invalidate`` overtakes
+    is returned to its callers but not cached.
+    """
+
+    def __init__(
+        self,
+        model: type[M],
+        maxsize: int,
+        ttl: int,
+        negative_ttl: int,
+        redis: Redis | None = None,
+        local_ttl: int | None = None,
+        exclude: tuple[str, ...] = (),
+    ) -> None:
+        self.model = model
+        self.negative_ttl = negative_ttl
+        self.cache = TieredCache(
+            f"entity:{model.__tablename__}:", maxsize, ttl, redis, local_ttl
+        )
+        self._columns = [
+            column for column in model.__table__.columns if column.key not in exclude
+        ]
+        self._inflight: dict[Any, asyncio.Future[str]] = {}
+        self._coalesced = 0
+        self._negative_hits = 0
+
+    async def get(
+        self, id_: Any, loader: Callable[[], Awaitable[M | None]]
+    ) -> M | None:
+        key = str(id_)
+        raw = await self.cache.get(key)
+        if raw is None:
+            raw = await self._load(key, loader)
+        elif raw == MISSING:
+            self._negative_hits += 1
+        return self._deserialize(raw)
+
+    async def invalidate(self, id_: Any) -> None:
+        key = str(id_)
+        # Later misses must not share a load that may have read the old row.
+        self._inflight.pop(key, None)
+        await self.cache.delete(key)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.cache.stats(),
+            "negative_hits": self._negative_hits,
+            "coalesced": self._coalesced,
+        }
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[M | None]]) -> str:
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._coalesced += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            generation = await self.cache.generation(key)
+            entity = await loader()
+            raw = self._serialize(entity)
+            if self._inflight.get(key) is future:
+                await self.cache.set(
+                    key,
+                    raw,
+                    ttl=self.negative_ttl if entity is None else None,
+                    generation=generation,
+                )
+            future.set_result(raw)
+            return raw
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _serialize(self, entity: M | None) -> str:
+        if entity is None:
+            return MISSING
+        data = {}
+        for column in self._columns:
+            value = getattr(entity, column.key)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, Enum):
+                value = value.name
+            data[column.key] = value
+        return json.dumps(data)
+
+    def _deserialize(self, raw: str) -> M | None:
+        data = json.loads(raw)
+        if data is None:
+            return None
+        for column in self._columns:
+            value = data.get(column.key)
+            if value is None:
+                continue
+            if isinstance(column.type, DateTime):
+                data[column.key] = datetime.fromisoformat(value)
+            elif isinstance(column.type, SAEnum):
+                data[column.key] = column.type.enum_class[value]
+        return self.model(**data)
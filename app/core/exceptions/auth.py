@@ -20,3 +20,8 @@ class TokenExpired(AuthenticationError):
 class InvalidTokenType(AuthenticationError):
     def __init__(self) -> None:
         self.detail = "Invalid token type"
+
+
+class TokenRevoked(AuthenticationError):
+    def __init__(self) -> None:
+        self.detail = "Token has been revoked"
@@ -6,3 +6,9 @@ class AccessDenied(Exception):
 class ProfanityContent(Exception):
     def __init__(self):
         self.detail = "Content contains profanity"
+
+
+class ServiceOverloaded(Exception):
+    def __init__(self, retry_after: int = 1):
+        self.detail = "Service is overloaded, try again later"
+        self.retry_after = retry_after
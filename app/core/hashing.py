@@ -0,0 +1,73 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.exceptions.common import ServiceOverloaded
+
+T = TypeVar("T")
+
+
+class HashingPool:
+    """Runs CPU-bound password hashing off the event loop.
+
+    At most ``max_workers`` calls run at once and ``max_queue`` more may wait
+    for a worker; anything beyond that is rejected straight away.
+    """
+
+    def __init__(self, executor: str, max_workers: int, max_queue: int) -> None:
+        self.executor_type = executor
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._busy_seconds = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="hashing"
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._pending >= self.max_workers + self.max_queue:
+            self._rejected += 1
+            raise ServiceOverloaded()
+
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self._pending -= 1
+            self._completed += 1
+            self._busy_seconds += time.perf_counter() - started
+
+    def stats(self) -> dict[str, Any]:
+        in_flight = min(self._pending, self.max_workers)
+        return {
+            "executor": self.executor_type,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": in_flight,
+            "queued": self._pending - in_flight,
+            "utilization": in_flight / self.max_workers,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_latency_ms": (
+                self._busy_seconds / self._completed * 1000 if self._completed else 0.0
+            ),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
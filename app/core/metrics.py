@@ -0,0 +1,15 @@
+from typing import Any, Callable
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._providers: dict[str, Callable[[], dict[str, Any]]] = {}
+
+    def register(self, name: str, provider: Callable[[], dict[str, Any]]) -> None:
+        self._providers[name] = provider
+
+    def collect(self) -> dict[str, dict[str, Any]]:
+        return {name: provider() for name, provider in self._providers.items()}
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,5 @@
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+redis_client = Redis(host=settings.REDIS_HOST, port=int(settings.REDIS_PORT or 6379))
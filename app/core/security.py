@@ -1,14 +1,34 @@
+import hashlib
 from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import uuid4
 
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.hashing import HashingPool
+from app.core.metrics import metrics
 from app.models.common.enums.token_type import TokenType
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+hashing_pool = HashingPool(
+    executor=settings.PASSWORD_HASHER_EXECUTOR,
+    max_workers=settings.PASSWORD_HASHER_WORKERS,
+    max_queue=settings.PASSWORD_HASHER_MAX_QUEUE,
+)
+metrics.register("password_hashing", hashing_pool.stats)
+
+token_cache: TTLCache[dict] = TTLCache(
+    maxsize=settings.JWT_CACHE_SIZE, ttl=settings.JWT_CACHE_TTL
+)
+metrics.register("jwt_cache", token_cache.stats)
+
 TOKEN_TYPE_FIELD = "type"
+TOKEN_ID_FIELD = "jti"
+USER_CLAIMS = ("username", "email", "created_at")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -19,19 +39,34 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def create_token(token_type: str, secret_key: str, expire: datetime, sub: str) -> str:
-    to_encode = {"type": token_type, "exp": expire, "sub": sub}
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await hashing_pool.run(get_password_hash, password)
+
+
+def create_token(
+    token_type: str,
+    secret_key: str,
+    expire: datetime,
+    sub: str,
+    claims: dict[str, Any] | None = None,
+) -> str:
+    to_encode = {"type": token_type, "exp": expire, "sub": sub, **(claims or {})}
     encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=settings.HASH_ALGORITHM)
     return encoded_jwt
 
 
-def create_access_token(user_id: int) -> str:
+def create_access_token(user_id: int, claims: dict[str, Any] | None = None) -> str:
     expire = datetime.now() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return create_token(
         token_type=TokenType.ACCESS.value,
         secret_key=settings.SECRET_KEY,
         expire=expire,
         sub=str(user_id),
+        claims={TOKEN_ID_FIELD: uuid4().hex, **(claims or {})},
     )
 
 
@@ -46,8 +81,16 @@ def create_refresh_token(user_id: int) -> str:
 
 
 def decode_token(token: str) -> dict[str, str]:
+    key = hashlib.sha256(token.encode()).digest()
+    cached = token_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
     decoded_token = jwt.decode(
         token=token, key=settings.SECRET_KEY, algorithms=[settings.HASH_ALGORITHM]
     )
     exp_datetime = datetime.fromtimestamp(decoded_token["exp"], timezone.utc)
-    return decoded_token if exp_datetime >= datetime.now(timezone.utc) else None
+    if exp_datetime < datetime.now(timezone.utc):
+        return None
+    token_cache.set(key, decoded_token, expires_at=decoded_token["exp"])
+    return dict(decoded_token)
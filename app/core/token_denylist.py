@@ -0,0 +1,59 @@
+import time
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+KEY_PREFIX = "denylist:"
+PURGE_THRESHOLD = 10_000
+
+
+class TokenDenylist:
+    def __init__(self, redis: Redis | None = None) -> None:
+        self.redis = redis
+        self._revoked: dict[str, float] = {}
+
+    async def revoke(self, token_id: str, expires_at: float) -> None:
+        ttl = int(expires_at - time.time()) + 1
+        if ttl <= 0:
+            return
+        if len(self._revoked) >= PURGE_THRESHOLD:
+            self._purge()
+        self._revoked[token_id] = expires_at
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(KEY_PREFIX + token_id, 1, ex=ttl)
+        except RedisError as error:
+            # Like contains(), a Redis outage does not fail the request; the
+            # token stays revoked in this process.
+            print(f"Token {token_id} revoked locally only, Redis failed: {error}")
+
+    async def contains(self, token_id: str) -> bool:
+        expires_at = self._revoked.get(token_id)
+        if expires_at is not None:
+            if expires_at > time.time():
+                return True
+            del self._revoked[token_id]
+        if self.redis is None:
+            return False
+        try:
+            return bool(await self.redis.exists(KEY_PREFIX + token_id))
+        except RedisError:
+            return False
+
+    def clear(self) -> None:
+        self._revoked.clear()
+
+    def _purge(self) -> None:
+        now = time.time()
+        self._revoked = {
+            token_id: expires_at
+            for token_id, expires_at in self._revoked.items()
+            if expires_at > now
+        }
+
+
+token_denylist = TokenDenylist(redis_client if settings.TOKEN_DENYLIST_REDIS else None)
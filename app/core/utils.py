@@ -1,16 +1,58 @@
-from better_profanity import profanity
-from groq import AsyncGroq
+import hashlib
+import json
 
+from app.core.ai_client import AIClient
+from app.core.cache import TieredCache
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.profanity import ProfanityFilter
+from app.core.redis import redis_client
 from app.models.common.enums.ai_roles import AIRoles
 
+ai_client = AIClient(
+    api_key=settings.GROQ_API_KEY,
+    base_url=settings.GROQ_BASE_URL,
+    max_connections=settings.AI_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.AI_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=settings.AI_KEEPALIVE_EXPIRY,
+    timeout=settings.AI_TIMEOUT,
+    connect_timeout=settings.AI_CONNECT_TIMEOUT,
+    max_retries=settings.AI_MAX_RETRIES,
+    backoff=settings.AI_RETRY_BACKOFF,
+    backoff_max=settings.AI_RETRY_BACKOFF_MAX,
+)
+metrics.register("ai_client", ai_client.stats)
+
+ai_response_cache = TieredCache(
+    prefix="ai:response:",
+    maxsize=settings.AI_CACHE_SIZE,
+    ttl=settings.AI_CACHE_TTL,
+    redis=redis_client if settings.AI_CACHE_REDIS else None,
+)
+metrics.register("ai_response_cache", ai_response_cache.stats)
+
+profanity_filter = ProfanityFilter(
+    offload_threshold=settings.PROFANITY_OFFLOAD_THRESHOLD
+)
+
 
 def contains_profanity(content: str) -> bool:
-    return profanity.contains_profanity(content)
+    return profanity_filter.contains_profanity(content)
+
+
+async def contains_profanity_async(content: str) -> bool:
+    return await profanity_filter.contains_profanity_async(content)
+
+
+async def contains_profanity_batch_async(contents: list[str]) -> list[bool]:
+    return await profanity_filter.contains_profanity_batch_async(contents)
+
+
+def estimate_tokens(content: str) -> int:
+    return len(content) // 4 + 1
 
 
 async def generate_ai_response(post_content: str, history: list):
-    client = AsyncGroq(api_key=settings.GROQ_API_KEY)
     messages = [
         {
             "role": AIRoles.SYSTEM.value,  # More about the roles - https://console.groq.com/docs/text-chat
@@ -18,8 +60,21 @@ async def generate_ai_response(post_content: str, history: list):
         }
     ]
     messages.extend(history)
-    response = await client.chat.completions.create(
-        messages=messages,
-        model=settings.AI_MODEL,
-    )
-    return response.choices[0].message.content
+    if not settings.AI_CACHE_ENABLED:
+        return await ai_client.complete(messages, settings.AI_MODEL)
+
+    key = ai_response_cache_key(settings.AI_MODEL, messages)
+    response = await ai_response_cache.get(key)
+    if response is None:
+        response = await ai_client.complete(messages, settings.AI_MODEL)
+        await ai_response_cache.set(key, response)
+    return response
+
+
+def ai_response_cache_key(model: str, messages: list[dict[str, str]]) -> str:
+    normalized = [
+        [message["role"], " ".join(message["content"].split()).casefold()]
+        for message in messages
+    ]
+    raw = json.dumps([model, normalized], ensure_ascii=False).encode()
+    return hashlib.sha256(raw).hexdigest()
@@ -6,11 +6,12 @@ from app.api.exception_handler import (
     authentication_error_handler,
     entity_not_found_error_handler,
     profanity_content_error_handler,
+    service_overloaded_handler,
     user_already_exists_handler,
     validation_error_handler,
 )
 from app.core.exceptions.auth import AuthenticationError
-from app.core.exceptions.common import AccessDenied, ProfanityContent
+from app.core.exceptions.common import AccessDenied, ProfanityContent, ServiceOverloaded
 from app.core.exceptions.entity import EntityNotFoundError, UserAlreadyExists
 
 
@@ -21,3 +22,4 @@ def init_exception_handlers(app: FastAPI):
     app.add_exception_handler(ProfanityContent, profanity_content_error_handler)
     app.add_exception_handler(EntityNotFoundError, entity_not_found_error_handler)
     app.add_exception_handler(UserAlreadyExists, user_already_exists_handler)
+    app.add_exception_handler(ServiceOverloaded, service_overloaded_handler)
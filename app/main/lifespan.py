@@ -1,12 +1,35 @@
 from contextlib import asynccontextmanager
+from datetime import datetime
 
 from fastapi import FastAPI
 
-from app.services.common.scheduler import scheduler
+from app.core.redis import redis_client
+from app.core.security import hashing_pool
+from app.core.utils import ai_client, profanity_filter
+from app.services.ai_comment_response_task import ai_reply_dispatcher
+from app.services.common.scheduler import (
+    schedule_ai_comment_response_tasks,
+    schedule_comment_stats_reconcile,
+    schedule_post_purge,
+    scheduler,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    profanity_filter.load()
+    ai_client.start()
     scheduler.start()
+    schedule_comment_stats_reconcile()
+    schedule_post_purge()
     yield
+    # Paused, not stopped, so the job store still accepts the AI replies
+    # that were waiting in the dispatcher.
+    scheduler.pause()
+    undrained = await ai_reply_dispatcher.close()
+    if undrained:
+        await schedule_ai_comment_response_tasks(undrained, datetime.now())
     scheduler.shutdown()
+    hashing_pool.shutdown()
+    await ai_client.close()
+    await redis_client.aclose()
@@ -0,0 +1,40 @@
+"""add keyset pagination indexes
+
+Revision ID: 3f6c2a9d1b47
+Revises: d7b2921b57e7
+Create Date: 2026-10-18 10:12:31.418295
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f6c2a9d1b47"
+down_revision: Union[str, None] = "d7b2921b57e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_posts_active_created_at_id",
+        "posts",
+        ["created_at", "id"],
+        postgresql_where=sa.text("status = 'ACTIVE'"),
+    )
+    op.create_index("ix_users_created_at_id", "users", ["created_at", "id"])
+    op.create_index(
+        "ix_comments_active_post_id_created_at_id",
+        "comments",
+        ["post_id", "created_at", "id"],
+        postgresql_where=sa.text("status = 'ACTIVE'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_comments_active_post_id_created_at_id", table_name="comments")
+    op.drop_index("ix_users_created_at_id", table_name="users")
+    op.drop_index("ix_posts_active_created_at_id", table_name="posts")
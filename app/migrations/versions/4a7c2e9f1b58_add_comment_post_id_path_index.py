@@ -0,0 +1,31 @@
+"""add comment post_id path index
+
+Revision ID: 4a7c2e9f1b58
+Revises: 9d4f1b7a3e62
+Create Date: 2026-10-18 21:03:51.217684
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4a7c2e9f1b58"
+down_revision: Union[str, None] = "9d4f1b7a3e62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_comments_post_id_path",
+            "comments",
+            ["post_id", "path"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_comments_post_id_path", table_name="comments")
@@ -0,0 +1,43 @@
+"""add comment daily stats
+
+Revision ID: 5c0d8e2b6a41
+Revises: e3a91c5d7f20
+Create Date: 2026-10-18 18:05:41.903512
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c0d8e2b6a41"
+down_revision: Union[str, None] = "e3a91c5d7f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "comment_daily_stats",
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("banned", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["post_id"], ["posts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("post_id", "day"),
+    )
+    op.execute(
+        """
+        INSERT INTO comment_daily_stats (post_id, day, total, banned)
+        SELECT post_id, date(created_at), count(*),
+               count(*) FILTER (WHERE status = 'BANNED')
+        FROM comments
+        GROUP BY post_id, date(created_at)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("comment_daily_stats")
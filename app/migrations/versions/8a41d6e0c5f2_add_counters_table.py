@@ -0,0 +1,44 @@
+"""add counters table
+
+Revision ID: 8a41d6e0c5f2
+Revises: 3f6c2a9d1b47
+Create Date: 2026-10-18 11:03:54.207113
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a41d6e0c5f2"
+down_revision: Union[str, None] = "3f6c2a9d1b47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "counters",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.execute(
+        """
+        INSERT INTO counters (name, value)
+        SELECT 'users', count(*) FROM users
+        UNION ALL
+        SELECT 'posts:active', count(*) FROM posts WHERE status = 'ACTIVE'
+        UNION ALL
+        SELECT 'posts:' || post_id || ':comments:active', count(*)
+        FROM comments
+        WHERE status = 'ACTIVE'
+        GROUP BY post_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("counters")
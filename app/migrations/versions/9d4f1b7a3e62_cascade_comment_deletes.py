@@ -0,0 +1,41 @@
+"""cascade comment deletes
+
+Revision ID: 9d4f1b7a3e62
+Revises: 5c0d8e2b6a41
+Create Date: 2026-10-18 19:12:47.306158
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4f1b7a3e62"
+down_revision: Union[str, None] = "5c0d8e2b6a41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE status ADD VALUE IF NOT EXISTS 'DELETED'")
+    for column, table in (("post_id", "posts"), ("parent_id", "comments")):
+        op.drop_constraint(f"comments_{column}_fkey", "comments", type_="foreignkey")
+        op.create_foreign_key(
+            f"comments_{column}_fkey",
+            "comments",
+            table,
+            [column],
+            ["id"],
+            ondelete="CASCADE",
+        )
+
+
+def downgrade() -> None:
+    for column, table in (("post_id", "posts"), ("parent_id", "comments")):
+        op.drop_constraint(f"comments_{column}_fkey", "comments", type_="foreignkey")
+        op.create_foreign_key(
+            f"comments_{column}_fkey", "comments", table, [column], ["id"]
+        )
+    # Postgres cannot drop an enum value; DELETED stays but is unused.
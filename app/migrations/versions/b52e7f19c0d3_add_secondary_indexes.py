@@ -0,0 +1,69 @@
+"""add secondary indexes
+
+Revision ID: b52e7f19c0d3
+Revises: 8a41d6e0c5f2
+Create Date: 2026-10-18 11:48:20.631904
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b52e7f19c0d3"
+down_revision: Union[str, None] = "8a41d6e0c5f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so live tables are not locked against writes.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_comments_post_id_created_at",
+            "comments",
+            ["post_id", "created_at"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_comments_parent_id",
+            "comments",
+            ["parent_id"],
+            postgresql_where=sa.text("parent_id IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_posts_owner_id", "posts", ["owner_id"], postgresql_concurrently=True
+        )
+        op.create_index(
+            "uq_users_email",
+            "users",
+            ["email"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "uq_users_username",
+            "users",
+            ["username"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+    op.execute(
+        "ALTER TABLE users "
+        "ADD CONSTRAINT uq_users_email UNIQUE USING INDEX uq_users_email"
+    )
+    op.execute(
+        "ALTER TABLE users "
+        "ADD CONSTRAINT uq_users_username UNIQUE USING INDEX uq_users_username"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_users_username", "users", type_="unique")
+    op.drop_constraint("uq_users_email", "users", type_="unique")
+    op.drop_index("ix_posts_owner_id", table_name="posts")
+    op.drop_index("ix_comments_parent_id", table_name="comments")
+    op.drop_index("ix_comments_post_id_created_at", table_name="comments")
@@ -0,0 +1,53 @@
+"""add comment path
+
+Revision ID: e3a91c5d7f20
+Revises: b52e7f19c0d3
+Create Date: 2026-10-18 17:32:04.518226
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a91c5d7f20"
+down_revision: Union[str, None] = "b52e7f19c0d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "comments",
+        sa.Column("path", sa.String(collation="C"), server_default="", nullable=False),
+    )
+    # Top-level comments keep the empty default, replies get the path of
+    # their parent followed by its zero-padded id.
+    op.execute(
+        """
+        WITH RECURSIVE tree (id, path) AS (
+            SELECT id, ''::text FROM comments WHERE parent_id IS NULL
+            UNION ALL
+            SELECT comments.id, tree.path || lpad(tree.id::text, 10, '0') || '.'
+            FROM comments JOIN tree ON comments.parent_id = tree.id
+        )
+        UPDATE comments SET path = tree.path
+        FROM tree
+        WHERE comments.id = tree.id AND tree.path <> ''
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_comments_path",
+            "comments",
+            ["path"],
+            postgresql_include=["status"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_comments_path", table_name="comments")
+    op.drop_column("comments", "path")
@@ -1,3 +1,5 @@
 from app.models.comment import Comment
+from app.models.comment_stats import CommentDailyStats
+from app.models.counter import Counter
 from app.models.post import Post
 from app.models.user import User
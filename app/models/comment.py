@@ -1,32 +1,77 @@
 from typing import List
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
 from app.models.common.enums.status import Status
 from app.models.common.timestamped import TimestampedModel
 
+PATH_WIDTH = 10
+
 
 class Comment(Base, TimestampedModel):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index(
+            "ix_comments_active_post_id_created_at_id",
+            "post_id",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'ACTIVE'"),
+        ),
+        Index("ix_comments_post_id_created_at", "post_id", "created_at"),
+        Index(
+            "ix_comments_parent_id",
+            "parent_id",
+            postgresql_where=text("parent_id IS NOT NULL"),
+        ),
+        Index("ix_comments_path", "path", postgresql_include=["status"]),
+        Index("ix_comments_post_id_path", "post_id", "path"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
-    post_id: Mapped[int] = mapped_column(ForeignKey("posts.id"), nullable=False)
-    parent_id: Mapped[int | None] = mapped_column(ForeignKey("comments.id"), nullable=True)
+    post_id: Mapped[int] = mapped_column(
+        ForeignKey("posts.id", ondelete="CASCADE"), nullable=False
+    )
+    parent_id: Mapped[int | None] = mapped_column(
+        ForeignKey("comments.id", ondelete="CASCADE"), nullable=True
+    )
     content: Mapped[str] = mapped_column(nullable=False)
     status: Mapped[Status] = mapped_column(default=Status.ACTIVE)
     is_ai: Mapped[bool] = mapped_column(default=False)
+    # Ids of all ancestors, root first, each zero-padded to PATH_WIDTH and
+    # followed by ".", e.g. "0000000001.0000000005." for a reply to comment
+    # 5 under comment 1; empty for top-level comments. The "C" collation
+    # makes a subtree one contiguous range of the index.
+    path: Mapped[str] = mapped_column(
+        String(collation="C"), server_default="", nullable=False
+    )
 
     children: Mapped[List["Comment"]] = relationship(
         "Comment",
         back_populates="parent",
         cascade="all, delete-orphan",
         single_parent=True,
+        passive_deletes=True,
     )
     parent: Mapped["Comment"] = relationship(
         "Comment", back_populates="children", remote_side=[id]
     )
     owner: Mapped["User"] = relationship("User", back_populates="comments")
     post: Mapped["Post"] = relationship("Post", back_populates="comments")
+
+    @property
+    def subtree_path(self) -> str:
+        """Prefix shared by the paths of all descendants."""
+        return f"{self.path}{self.id:0{PATH_WIDTH}d}."
+
+    @property
+    def ancestor_ids(self) -> List[int]:
+        return [int(segment) for segment in self.path.split(".") if segment]
+
+    @property
+    def root_id(self) -> int:
+        """Id of the top-level comment of the thread."""
+        return self.ancestor_ids[0] if self.path else self.id
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class Granularity(Enum):
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
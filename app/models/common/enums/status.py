@@ -4,3 +4,4 @@ from enum import Enum
 class Status(Enum):
     ACTIVE = "active"
     BANNED = "banned"
+    DELETED = "deleted"  # hidden, waiting for the purge job
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class TotalMode(Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
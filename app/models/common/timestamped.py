@@ -5,5 +5,11 @@ from sqlalchemy.orm import Mapped, mapped_column
 
 
 class TimestampedModel:
+    # Server defaults come back in the RETURNING clause of the flush
+    # instead of needing a refresh.
+    __mapper_args__ = {"eager_defaults": True}
+
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), onupdate=func.now()
+    )
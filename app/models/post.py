@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
@@ -10,6 +10,15 @@ from app.models.common.timestamped import TimestampedModel
 
 class Post(Base, TimestampedModel):
     __tablename__ = "posts"
+    __table_args__ = (
+        Index(
+            "ix_posts_active_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'ACTIVE'"),
+        ),
+        Index("ix_posts_owner_id", "owner_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -20,5 +29,8 @@ class Post(Base, TimestampedModel):
 
     owner: Mapped["User"] = relationship("User", back_populates="posts")
     comments: Mapped[List["Comment"]] = relationship(
-        "Comment", back_populates="post", cascade="all, delete-orphan"
+        "Comment",
+        back_populates="post",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
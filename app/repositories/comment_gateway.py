@@ -1,11 +1,44 @@
-from datetime import datetime
-from typing import List, Tuple
+from datetime import date, timedelta
+from typing import AsyncIterator, Awaitable, Callable, List, Sequence
 
-from sqlalchemy import Row, case, func, select
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Integer,
+    Row,
+    Select,
+    String,
+    and_,
+    case,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.models.comment import Comment
+from app.core.db import after_commit
+from app.core.exceptions.entity import (
+    CommentNotFound,
+    EntityNotFoundError,
+    PostNotFound,
+)
+from app.models.comment import PATH_WIDTH, Comment
 from app.models.common.enums.status import Status
+from app.models.post import Post
+from app.schemas.comment import CommentDTO
+from app.schemas.pagination import Cursor, ReplyCursor
+
+LIST_COLUMNS = [getattr(Comment, name) for name in CommentDTO.model_fields]
 
 
 class CommentDbGateway:
@@ -13,9 +46,27 @@ class CommentDbGateway:
         self.db = session
 
     async def create(self, comment: Comment) -> None:
+        if comment.parent_id is not None:
+            # Resolved inside the INSERT, so it costs no extra round trip.
+            comment.path = (
+                select(subtree_path(Comment))
+                .where(Comment.id == comment.parent_id)
+                .scalar_subquery()
+            )
         self.db.add(comment)
-        await self.db.commit()
-        await self.db.refresh(comment)
+        try:
+            await self.db.flush()
+        except IntegrityError as error:
+            raise _missing_reference(error) or error
+
+    async def create_many(self, rows: List[dict]) -> List[Comment]:
+        """Inserts all rows in one statement; the comments come back in the
+        order of ``rows``. Rows must carry their ``path``."""
+        stmt = insert(Comment).returning(Comment, sort_by_parameter_order=True)
+        try:
+            return (await self.db.scalars(stmt, rows)).all()
+        except IntegrityError as error:
+            raise _missing_reference(error) or error
 
     async def get_by_id(self, post_id: int, comment_id: int) -> Comment | None:
         stmt = select(Comment).where(
@@ -26,43 +77,330 @@ class CommentDbGateway:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def get_list_by_post_id(
-        self, post_id: int, skip: int, limit: int
-    ) -> Tuple[List[Comment], int]:
+    async def get_with_post(self, post_id: int, comment_id: int) -> Row | None:
+        """One query for both checks: ``None`` when the post is missing or
+        banned, otherwise a row whose ``Comment`` is ``None`` when the comment
+        is missing or banned."""
+        result = await self.db.execute(self._with_post(post_id, comment_id, Comment))
+        return result.one_or_none()
+
+    async def get_updated_at(self, post_id: int, comment_id: int) -> Row | None:
+        """Same checks as ``get_with_post`` but only reads ``comment_id`` and
+        ``updated_at``, enough to revalidate a cached copy."""
+        stmt = self._with_post(
+            post_id,
+            comment_id,
+            Comment.id.label("comment_id"),
+            Comment.updated_at,
+        )
+        result = await self.db.execute(stmt)
+        return result.one_or_none()
+
+    async def update_owned(
+        self, post_id: int, comment_id: int, user_id: int, content: str
+    ) -> Comment | None:
+        stmt = (
+            update(Comment)
+            .where(*self._owned(post_id, comment_id, user_id))
+            .values(content=content)
+            .returning(Comment)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def delete_owned(
+        self, post_id: int, comment_id: int, user_id: int
+    ) -> List[Comment]:
+        """Deletes the comment with all its replies.
+
+        Returns the deleted rows, the comment itself first, or an empty list
+        when nothing matched.
+        """
+        target = (
+            select(
+                Comment.id,
+                subtree_path(Comment).label("lower"),
+                subtree_path(Comment, end=True).label("upper"),
+            )
+            .where(*self._owned(post_id, comment_id, user_id))
+            .subquery("target")
+        )
+        stmt = (
+            delete(Comment)
+            .where(
+                or_(
+                    Comment.id == target.c.id,
+                    and_(Comment.path >= target.c.lower, Comment.path < target.c.upper),
+                )
+            )
+            .returning(Comment)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        return sorted(result.scalars().all(), key=lambda c: c.id != comment_id)
+
+    def after_commit(self, callback: Callable[[], Awaitable]) -> None:
+        after_commit(self.db, callback)
+
+    @staticmethod
+    def _with_post(post_id: int, comment_id: int, *columns) -> Select:
+        return (
+            select(Post.id, *columns)
+            .outerjoin(
+                Comment,
+                (Comment.post_id == Post.id)
+                & (Comment.id == comment_id)
+                & (Comment.status == Status.ACTIVE),
+            )
+            .where(Post.id == post_id, Post.status == Status.ACTIVE)
+        )
+
+    @staticmethod
+    def _owned(post_id: int, comment_id: int, user_id: int) -> list:
+        return [
+            Comment.id == comment_id,
+            Comment.post_id == post_id,
+            Comment.owner_id == user_id,
+            Comment.status == Status.ACTIVE,
+            exists().where(Post.id == post_id, Post.status == Status.ACTIVE),
+        ]
+
+    async def get_by_ids(self, post_id: int, comment_ids: list[int]) -> List[Comment]:
+        if not comment_ids:
+            return []
         stmt = (
             select(Comment)
+            .where(
+                Comment.post_id == post_id,
+                Comment.id.in_(comment_ids),
+                Comment.status == Status.ACTIVE,
+            )
+            .order_by(Comment.created_at, Comment.id)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    async def get_list_by_post_id(
+        self, post_id: int, skip: int, limit: int, after: Cursor | None = None
+    ) -> List[Row]:
+        """A page of active comments as plain rows with the columns of
+        ``CommentDTO``."""
+        stmt = (
+            select(*LIST_COLUMNS)
             .where(Comment.post_id == post_id, Comment.status == Status.ACTIVE)
-            .offset(skip)
+            .order_by(Comment.created_at, Comment.id)
             .limit(limit)
         )
+        if after:
+            stmt = stmt.where(
+                tuple_(Comment.created_at, Comment.id) > (after.created_at, after.id)
+            )
+        else:
+            stmt = stmt.offset(skip)
         result = await self.db.execute(stmt)
-        comments = result.scalars().all()
-        total = await self.get_total(stmt)
-        return comments, total
+        return result.all()
+
+    async def stream_by_post_id(
+        self, post_id: int, batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Active comments of a post in batches, read through a server-side
+        cursor.
+
+        Runs on a session of its own: a streamed response is still sending
+        after FastAPI has closed the request's session.
+        """
+        stmt = (
+            select(*LIST_COLUMNS)
+            .where(Comment.post_id == post_id, Comment.status == Status.ACTIVE)
+            .order_by(Comment.created_at, Comment.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async with AsyncSession(self.db.bind) as db:
+            result = await db.stream(stmt)
+            async for batch in result.partitions():
+                yield batch
+
+    async def get_tree(
+        self,
+        post_id: int,
+        max_depth: int,
+        max_children: int,
+        max_nodes: int,
+        root_id: int | None = None,
+        replies: ReplyCursor | None = None,
+    ) -> List[Row]:
+        """Active comments of a post, level by level, in a single query.
+
+        Starts at ``root_id``, or at the replies ``replies`` points to (the
+        top-level comments by default). Every node gets at most
+        ``max_children + 1`` replies, the extra one (``rn > max_children``)
+        only marks that more exist and is not expanded. At most
+        ``max_nodes + 1`` rows are returned; ``has_children`` tells whether a
+        node has active replies at all.
+        """
+        columns = [column for column in Comment.__table__.columns]
+
+        def replies_of(parent_id, after: Cursor | None = None):
+            stmt = (
+                select(
+                    *columns,
+                    func.row_number()
+                    .over(order_by=(Comment.created_at, Comment.id))
+                    .label("rn"),
+                )
+                .where(Comment.post_id == post_id, Comment.status == Status.ACTIVE)
+                .order_by(Comment.created_at, Comment.id)
+                .limit(max_children + 1)
+            )
+            if parent_id is None:
+                stmt = stmt.where(Comment.parent_id.is_(None))
+            else:
+                stmt = stmt.where(Comment.parent_id == parent_id)
+            if after:
+                stmt = stmt.where(
+                    tuple_(Comment.created_at, Comment.id)
+                    > (after.created_at, after.id)
+                )
+            return stmt
+
+        depth = literal(1).label("depth")
+        if root_id is not None:
+            anchor = select(*columns, literal(1, BigInteger).label("rn"), depth).where(
+                Comment.id == root_id,
+                Comment.post_id == post_id,
+                Comment.status == Status.ACTIVE,
+            )
+        else:
+            replies = replies or ReplyCursor(parent_id=None)
+            first = replies_of(replies.parent_id, replies.after).subquery()
+            anchor = select(first, depth)
+        tree = anchor.cte("tree", recursive=True)
+
+        children = replies_of(tree.c.id).lateral("children")
+        tree = tree.union_all(
+            select(*children.c, tree.c.depth + 1)
+            .select_from(tree.join(children, true()))
+            .where(tree.c.depth < max_depth, tree.c.rn <= max_children)
+        )
+
+        reply = aliased(Comment)
+        has_children = (
+            exists()
+            .where(reply.parent_id == tree.c.id, reply.status == Status.ACTIVE)
+            .label("has_children")
+        )
+        # The budget keeps the upper levels, and within a level the replies of
+        # each parent together, so only the parent of the extra row is cut off.
+        stmt = (
+            select(tree, has_children)
+            .order_by(tree.c.depth, tree.c.parent_id, tree.c.rn)
+            .limit(max_nodes + 1)
+        )
+        result = await self.db.execute(stmt)
+        return result.all()
 
     async def update(self, comment: Comment, data: dict) -> None:
         allowed_fields = ["content"]
         for field, value in data.items():
             if field in allowed_fields and value is not None:
                 setattr(comment, field, value)
-        await self.db.commit()
-        await self.db.refresh(comment)
+        await self.db.flush()
 
     async def delete(self, comment: Comment) -> None:
-        await self.db.delete(comment)
-        await self.db.commit()
+        """Replies are removed by ON DELETE CASCADE."""
+        await self.db.execute(delete(Comment).where(Comment.id == comment.id))
 
-    async def get_total(self, stmt) -> int:
-        count_stmt = stmt.with_only_columns(func.count()).order_by(None)
-        result = await self.db.execute(count_stmt)
+    async def get_total(self, post_id: int) -> int:
+        stmt = select(func.count()).where(
+            Comment.post_id == post_id, Comment.status == Status.ACTIVE
+        )
+        result = await self.db.execute(stmt)
         return result.scalar_one()
 
-    async def get_statistics_by_date(
-        self, date_from: datetime, date_to: datetime, post_id: int
+    async def get_subtree(self, comment: Comment) -> List[Comment]:
+        """Active descendants of a loaded comment, parents before replies."""
+        stmt = (
+            select(Comment)
+            .where(*in_subtree(comment), Comment.status == Status.ACTIVE)
+            .order_by(Comment.path, Comment.id)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    async def count_active_descendants(self, comment: Comment) -> int:
+        stmt = select(func.count()).where(
+            *in_subtree(comment), Comment.status == Status.ACTIVE
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one()
+
+    async def get_ancestors(self, comment: Comment) -> List[Comment]:
+        """All ancestors of a loaded comment, banned ones too, root first."""
+        if not comment.ancestor_ids:
+            return []
+        stmt = (
+            select(Comment)
+            .where(Comment.id.in_(comment.ancestor_ids))
+            .order_by(Comment.path)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    async def get_reply_chain(
+        self, post_id: int, comment_id: int, max_depth: int
+    ) -> List[Comment]:
+        """Active ancestors of a comment, nearest first, starting with itself.
+
+        The walk stops at a banned comment, at ``max_depth`` and at the first
+        comment written by a user other than the author of ``comment_id``
+        (AI replies are followed through).
+        """
+        ancestor_ids = select(
+            cast(
+                func.unnest(func.string_to_array(func.rtrim(Comment.path, "."), ".")),
+                Integer,
+            )
+        ).where(
+            Comment.id == comment_id,
+            Comment.post_id == post_id,
+            Comment.status == Status.ACTIVE,
+        )
+        # Ancestor paths are prefixes of the comment's own path, so sorting by
+        # path backwards puts the nearest ones first.
+        stmt = (
+            select(Comment)
+            .where(
+                Comment.post_id == post_id,
+                or_(Comment.id == comment_id, Comment.id.in_(ancestor_ids)),
+            )
+            .order_by(Comment.path.desc())
+            .limit(max_depth)
+        )
+        result = await self.db.execute(stmt)
+        comments = result.scalars().all()
+        if not comments or comments[0].id != comment_id:
+            return []
+
+        chain = []
+        author_id = comments[0].owner_id
+        for comment in comments:
+            if comment.status != Status.ACTIVE:
+                break
+            if not comment.is_ai and comment.owner_id != author_id:
+                break
+            chain.append(comment)
+        return chain
+
+    async def get_statistics(
+        self, post_id: int, date_from: date, date_to: date, unit: str
     ) -> List[Row]:
+        """Comment counts between both dates, inclusive, per ``unit``
+        ("hour", "day", ...) of ``created_at``, counted from the raw rows."""
+        period = func.date_trunc(unit, Comment.created_at)
         stmt = (
             select(
-                func.date(Comment.created_at).label("date"),
+                period.label("date"),
                 func.count(Comment.id).label("total_comments"),
                 func.sum(case((Comment.status == Status.BANNED, 1), else_=0)).label(
                     "banned_comments"
@@ -71,9 +409,37 @@ class CommentDbGateway:
             .where(
                 Comment.post_id == post_id,
                 Comment.created_at >= date_from,
-                Comment.created_at <= date_to,
+                Comment.created_at < date_to + timedelta(days=1),
             )
-            .group_by(func.date(Comment.created_at))
+            .group_by(period)
+            .order_by(period)
         )
         result = await self.db.execute(stmt)
         return result.all()
+
+
+def subtree_path(comment: type[Comment], end: bool = False) -> ColumnElement[str]:
+    """SQL for ``Comment.subtree_path``; with ``end`` the first path past the
+    subtree instead ("/" sorts right after ".")."""
+    segment = func.lpad(cast(comment.id, String), PATH_WIDTH, "0")
+    return comment.path + segment + ("/" if end else ".")
+
+
+def in_subtree(comment: Comment) -> list:
+    prefix = comment.subtree_path
+    return [Comment.path >= prefix, Comment.path < prefix[:-1] + "/"]
+
+
+def _missing_reference(error: IntegrityError) -> EntityNotFoundError | None:
+    # The post or the parent was deleted after the service looked it up, e.g.
+    # while another worker still had the post cached. A deleted parent shows
+    # up as a NULL path, which is checked before its foreign key.
+    cause = error.orig.__cause__
+    constraint = getattr(cause, "constraint_name", None)
+    if constraint == "comments_post_id_fkey":
+        return PostNotFound()
+    if constraint == "comments_parent_id_fkey" or (
+        getattr(cause, "column_name", None) == "path"
+    ):
+        return CommentNotFound()
+    return None
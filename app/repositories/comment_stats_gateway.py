@@ -0,0 +1,126 @@
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, List
+
+from sqlalchemy import Row, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.comment import Comment
+from app.models.comment_stats import CommentDailyStats
+from app.models.common.enums.status import Status
+
+
+class CommentStatsDbGateway:
+    """Per-post daily comment counts kept next to the ``comments`` table.
+
+    Writes are not committed, they go out with the comment change that
+    caused them. Days are those of ``created_at`` as the database sees them.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def record_created(
+        self, post_id: int, total: int = 1, banned: int = 0
+    ) -> None:
+        """Counts comments created in the current transaction."""
+        await self._add(
+            [
+                {
+                    "post_id": post_id,
+                    "day": func.current_date(),
+                    "total": total,
+                    "banned": banned,
+                }
+            ]
+        )
+
+    async def record_deleted(self, comments: Iterable[Comment]) -> None:
+        rows: dict[tuple[int, date], dict] = defaultdict(
+            lambda: {"total": 0, "banned": 0}
+        )
+        for comment in comments:
+            row = rows[comment.post_id, comment.created_at.date()]
+            row["total"] -= 1
+            row["banned"] -= comment.status == Status.BANNED
+        await self._add(
+            [
+                {"post_id": post_id, "day": day, **row}
+                for (post_id, day), row in rows.items()
+            ]
+        )
+
+    async def get_daily(
+        self, post_id: int, date_from: date, date_to: date
+    ) -> List[Row]:
+        """Days with comments between both dates, inclusive.
+
+        Closed days come from the rollup, today is counted from ``comments``.
+        """
+        today = func.current_date()
+        closed = select(
+            CommentDailyStats.day.label("date"),
+            CommentDailyStats.total.label("total_comments"),
+            CommentDailyStats.banned.label("banned_comments"),
+        ).where(
+            CommentDailyStats.post_id == post_id,
+            CommentDailyStats.day.between(date_from, date_to),
+            CommentDailyStats.day < today,
+            CommentDailyStats.total > 0,
+        )
+        live = (
+            select(
+                today.label("date"),
+                func.count().label("total_comments"),
+                _banned_count().label("banned_comments"),
+            )
+            .where(
+                Comment.post_id == post_id,
+                Comment.created_at >= today,
+                today.between(date_from, date_to),
+            )
+            .having(func.count() > 0)
+        )
+        stmt = closed.union_all(live).order_by("date")
+        result = await self.db.execute(stmt)
+        return result.all()
+
+    async def rebuild(self, since: date | None = None) -> None:
+        """Recomputes closed days from ``since`` on (all of them when None)
+        from the ``comments`` table, fixing any drift of the rollup."""
+        day = func.date(Comment.created_at)
+        stale = [CommentDailyStats.day < func.current_date()]
+        source = [Comment.created_at < func.current_date()]
+        if since is not None:
+            stale.append(CommentDailyStats.day >= since)
+            source.append(Comment.created_at >= since)
+
+        await self.db.execute(delete(CommentDailyStats).where(*stale))
+        counts = (
+            select(Comment.post_id, day, func.count(), _banned_count())
+            .where(*source)
+            .group_by(Comment.post_id, day)
+        )
+        await self.db.execute(
+            insert(CommentDailyStats).from_select(
+                ["post_id", "day", "total", "banned"], counts
+            )
+        )
+
+    async def _add(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        stmt = insert(CommentDailyStats).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CommentDailyStats.post_id, CommentDailyStats.day],
+            set_={
+                "total": CommentDailyStats.total + stmt.excluded.total,
+                "banned": CommentDailyStats.banned + stmt.excluded.banned,
+            },
+        )
+        await self.db.execute(stmt)
+
+
+def _banned_count():
+    return func.count().filter(Comment.status == Status.BANNED)
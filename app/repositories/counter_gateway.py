@@ -0,0 +1,55 @@
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.counter import Counter
+
+USERS_TOTAL = "users"
+ACTIVE_POSTS = "posts:active"
+# Versions are bumped by every write that can change a list, so an unchanged
+# version means an unchanged page; see app.api.conditional.
+USERS_VERSION = "users:version"
+POSTS_VERSION = "posts:version"
+
+
+def post_comments_key(post_id: int) -> str:
+    return f"posts:{post_id}:comments:active"
+
+
+def post_comments_version_key(post_id: int) -> str:
+    return f"posts:{post_id}:comments:version"
+
+
+class CounterDbGateway:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get(self, name: str) -> int | None:
+        stmt = select(Counter.value).where(Counter.name == name)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def increment(self, name: str, delta: int = 1) -> None:
+        await self.increment_many({name: delta})
+
+    async def increment_many(self, deltas: dict[str, int]) -> None:
+        """Applies all deltas in one statement, rows locked in name order."""
+        stmt = insert(Counter).values(
+            [{"name": name, "value": deltas[name]} for name in sorted(deltas)]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Counter.name],
+            set_={"value": Counter.value + stmt.excluded.value},
+        )
+        await self.db.execute(stmt)
+
+    async def delete(self, *names: str) -> None:
+        await self.db.execute(delete(Counter).where(Counter.name.in_(names)))
+
+    async def estimate(self, table: str) -> int | None:
+        stmt = text(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"
+        )
+        result = await self.db.execute(stmt, {"table": table})
+        estimate = result.scalar_one_or_none()
+        return estimate if estimate is not None and estimate >= 0 else None
@@ -0,0 +1,25 @@
+from app.core.config import settings
+from app.core.entity_cache import EntityCache
+from app.core.metrics import metrics
+from app.core.redis import redis_client
+from app.models.post import Post
+from app.models.user import User
+
+
+def _entity_cache(model, **kwargs) -> EntityCache:
+    return EntityCache(
+        model,
+        maxsize=settings.ENTITY_CACHE_SIZE,
+        ttl=settings.ENTITY_CACHE_TTL,
+        negative_ttl=settings.ENTITY_CACHE_NEGATIVE_TTL,
+        redis=redis_client if settings.ENTITY_CACHE_REDIS else None,
+        local_ttl=settings.ENTITY_CACHE_LOCAL_TTL,
+        **kwargs,
+    )
+
+
+post_cache: EntityCache[Post] = _entity_cache(Post)
+user_cache: EntityCache[User] = _entity_cache(User, exclude=("hashed_password",))
+
+metrics.register("post_cache", post_cache.stats)
+metrics.register("user_cache", user_cache.stats)
@@ -1,10 +1,18 @@
-from typing import List, Tuple
+from functools import partial
+from typing import List
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, delete, func, insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.db import after_commit
+from app.models.comment import Comment
 from app.models.common.enums.status import Status
 from app.models.post import Post
+from app.repositories.entity_caches import post_cache
+from app.schemas.pagination import Cursor
+from app.schemas.post import PostDTO
+
+LIST_COLUMNS = [getattr(Post, name) for name in PostDTO.model_fields]
 
 
 class PostDbGateway:
@@ -13,39 +21,114 @@ class PostDbGateway:
 
     async def create(self, post: Post) -> None:
         self.db.add(post)
-        await self.db.commit()
-        await self.db.refresh(post)
+        await self.db.flush()
+        self._invalidate(post.id)
+
+    async def create_many(self, rows: List[dict]) -> List[Post]:
+        """Inserts all rows in one statement; the posts come back in the
+        order of ``rows``."""
+        stmt = insert(Post).returning(Post, sort_by_parameter_order=True)
+        posts = (await self.db.scalars(stmt, rows)).all()
+        for post in posts:
+            self._invalidate(post.id)
+        return posts
 
     async def get_by_id(self, post_id: int) -> Post | None:
         stmt = select(Post).where(Post.id == post_id, Post.status == Status.ACTIVE)
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_by_id_cached(self, post_id: int) -> Post | None:
+        """Read-only copy of an active post, see ``EntityCache``."""
+        return await post_cache.get(post_id, partial(self.get_by_id, post_id))
+
     async def get_user_posts(self, user_id: int) -> List[Post]:
-        stmt = select(Post).where(Post.owner_id == user_id)
+        stmt = select(Post).where(
+            Post.owner_id == user_id, Post.status != Status.DELETED
+        )
         result = await self.db.execute(stmt)
         return result.scalars().all()
 
-    async def get_list(self, skip: int, limit: int) -> Tuple[List[Post], int]:
+    async def get_list(
+        self, skip: int, limit: int, after: Cursor | None = None
+    ) -> List[Row]:
+        """A page of active posts as plain rows with the columns of
+        ``PostDTO``, without loading entities into the session."""
         stmt = (
-            select(Post).where(Post.status == Status.ACTIVE).offset(skip).limit(limit)
+            select(*LIST_COLUMNS)
+            .where(Post.status == Status.ACTIVE)
+            .order_by(Post.created_at, Post.id)
+            .limit(limit)
         )
+        if after:
+            stmt = stmt.where(
+                tuple_(Post.created_at, Post.id) > (after.created_at, after.id)
+            )
+        else:
+            stmt = stmt.offset(skip)
         result = await self.db.execute(stmt)
-        posts = result.scalars().all()
-        total = await self.get_total()
-        return posts, total
+        return result.all()
 
     async def update(self, post: Post, data: dict) -> None:
         allowed_fields = {"content", "ai_enabled", "ai_delay_minutes"}
         for field, value in data.items():
             if field in allowed_fields and value is not None:
                 setattr(post, field, value)
-        await self.db.commit()
-        await self.db.refresh(post)
+        await self.db.flush()
+        self._invalidate(post.id)
 
     async def delete(self, post: Post) -> None:
-        await self.db.delete(post)
-        await self.db.commit()
+        """One DELETE; comments and their stats go with the post through
+        ON DELETE CASCADE instead of being loaded into the session."""
+        await self.db.execute(delete(Post).where(Post.id == post.id))
+        self._invalidate(post.id)
+
+    async def mark_deleted(self, post: Post) -> None:
+        post.status = Status.DELETED
+        await self.db.flush()
+        self._invalidate(post.id)
+
+    async def count_comments(self, post_id: int, limit: int) -> int:
+        """Number of comments of any status, counted up to ``limit``."""
+        found = (
+            select(Comment.id).where(Comment.post_id == post_id).limit(limit).subquery()
+        )
+        result = await self.db.execute(select(func.count()).select_from(found))
+        return result.scalar_one()
+
+    async def get_deleted_ids(self) -> List[int]:
+        stmt = select(Post.id).where(Post.status == Status.DELETED).order_by(Post.id)
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+
+    async def purge(self, post_id: int, batch_size: int) -> bool:
+        """Deletes up to ``batch_size`` comments of a post marked deleted;
+        once none are left, deletes the post too and returns True.
+
+        Paths go in descending order, which puts the replies of a comment
+        before it, so every reply of a deleted comment is in the same batch
+        and the cascade never reaches past it. ix_comments_post_id_path
+        serves the order, so a batch reads only the rows it deletes.
+        """
+        batch = (
+            select(Comment.id)
+            .where(Comment.post_id == post_id)
+            .order_by(Comment.path.desc())
+            .limit(batch_size)
+        )
+        result = await self.db.execute(
+            delete(Comment)
+            .where(Comment.id.in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        done = result.rowcount < batch_size
+        if done:
+            await self.db.execute(
+                delete(Post)
+                .where(Post.id == post_id, Post.status == Status.DELETED)
+                .execution_options(synchronize_session=False)
+            )
+        return done
 
     async def get_total(self) -> int:
         stmt = (
@@ -53,3 +136,6 @@ class PostDbGateway:
         )
         result = await self.db.execute(stmt)
         return result.scalar_one()
+
+    def _invalidate(self, post_id: int) -> None:
+        after_commit(self.db, partial(post_cache.invalidate, post_id))
@@ -1,7 +1,17 @@
-from sqlalchemy import func, select
+from functools import partial
+
+from sqlalchemy import Row, func, select, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.db import after_commit
+from app.core.exceptions.entity import UserAlreadyExists
 from app.models.user import User
+from app.repositories.entity_caches import user_cache
+from app.schemas.pagination import Cursor
+from app.schemas.user import UserDTO
+
+LIST_COLUMNS = [getattr(User, name) for name in UserDTO.model_fields]
 
 
 class UserDbGateway:
@@ -10,14 +20,21 @@ class UserDbGateway:
 
     async def create(self, user: User) -> None:
         self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        try:
+            await self.db.flush()
+        except IntegrityError:
+            raise UserAlreadyExists()
+        after_commit(self.db, partial(user_cache.invalidate, user.id))
 
     async def get_by_id(self, user_id: int) -> User | None:
         stmt = select(User).where(User.id == user_id)
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_by_id_cached(self, user_id: int) -> User | None:
+        """Read-only copy of a user without the password hash."""
+        return await user_cache.get(user_id, partial(self.get_by_id, user_id))
+
     async def get_by_email(self, email: str) -> User | None:
         stmt = select(User).where(User.email == email)
         result = await self.db.execute(stmt)
@@ -28,12 +45,19 @@ class UserDbGateway:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def get_list(self, skip: int, limit: int) -> tuple[list[User], int]:
-        stmt = select(User).offset(skip).limit(limit)
+    async def get_list(
+        self, skip: int, limit: int, after: Cursor | None = None
+    ) -> list[Row]:
+        """A page of users as plain rows with the columns of ``UserDTO``."""
+        stmt = select(*LIST_COLUMNS).order_by(User.created_at, User.id).limit(limit)
+        if after:
+            stmt = stmt.where(
+                tuple_(User.created_at, User.id) > (after.created_at, after.id)
+            )
+        else:
+            stmt = stmt.offset(skip)
         result = await self.db.execute(stmt)
-        users = result.scalars().all()
-        total = await self.get_total()
-        return users, total
+        return result.all()
 
     async def get_total(self) -> int:
         stmt = select(func.count()).select_from(User)
@@ -0,0 +1,30 @@
+from typing import List, Tuple, TypeVar
+
+from pydantic import BaseModel, Field, ValidationError
+
+from app.core.config import settings
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class BulkCreateRequest(BaseModel):
+    # Items are validated one by one, so a bad item fails only itself.
+    items: List[dict] = Field(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
+class BulkItemError(BaseModel):
+    index: int
+    detail: str
+
+
+def parse_items(
+    model: type[M], items: List[dict], **extra
+) -> Tuple[dict[int, M], List[BulkItemError]]:
+    parsed, errors = {}, []
+    for index, item in enumerate(items):
+        try:
+            parsed[index] = model.model_validate({**item, **extra})
+        except ValidationError as exc:
+            detail = "; ".join(error["msg"] for error in exc.errors())
+            errors.append(BulkItemError(index=index, detail=detail))
+    return parsed, errors
@@ -1,10 +1,13 @@
 from datetime import date, datetime
 from typing import List
 
-from pydantic import BaseModel, Field, model_validator
+from fastapi import Query
+from pydantic import BaseModel, Field, field_validator, model_validator
 
+from app.models.common.enums.granularity import Granularity
 from app.models.common.enums.status import Status
-from app.schemas.pagination import Pagination
+from app.schemas.bulk import BulkCreateRequest, BulkItemError
+from app.schemas.pagination import Pagination, ReplyCursor
 from app.schemas.post import PostId
 
 
@@ -31,9 +34,22 @@ class CreateCommentDTO(PostId, CreateCommentRequest):
     user_id: int
 
 
+class BulkCreateCommentsDTO(PostId, BulkCreateRequest):
+    user_id: int
+
+
+class BulkCreateCommentsResultDTO(BaseModel):
+    # Aligned with the request items, None where the item failed.
+    comments: List[CommentDTO | None]
+    errors: List[BulkItemError]
+
+
 class CreateAICommentDTO(BaseModel):
     post_id: int
     parent_id: int
+    user_id: int | None = None
+    # Top-level comment of the thread, pending replies are merged within it.
+    thread_id: int | None = None
 
 
 class ReadCommentRequest(PostId):
@@ -47,6 +63,43 @@ class ReadCommentsListDTO(PostId):
 class CommentsListResultDTO(BaseModel):
     comments: List[CommentDTO]
     total: int
+    next_cursor: str | None = None
+
+
+class ReadCommentTreeRequest(PostId):
+    root_id: int | None = Query(None)
+    max_depth: int = Query(5, ge=1, le=50)
+    max_children: int = Query(20, ge=1, le=100)
+    max_nodes: int = Query(500, ge=1, le=5000)
+    cursor: str | None = Query(None)
+
+    @field_validator("cursor")
+    @classmethod
+    def validate_cursor(cls, value: str | None) -> str | None:
+        if value is not None:
+            ReplyCursor.decode(value)
+        return value
+
+    @model_validator(mode="after")
+    def validate_start(self) -> "ReadCommentTreeRequest":
+        if self.root_id is not None and self.cursor is not None:
+            raise ValueError("root_id and cursor are mutually exclusive")
+        return self
+
+    @property
+    def replies(self) -> ReplyCursor | None:
+        return ReplyCursor.decode(self.cursor) if self.cursor else None
+
+
+class CommentTreeNodeDTO(CommentDTO):
+    replies: List["CommentTreeNodeDTO"] = []
+    more_replies: str | None = None
+
+
+class CommentTreeDTO(BaseModel):
+    comments: List[CommentTreeNodeDTO]
+    next_cursor: str | None = None
+    truncated: bool = False
 
 
 class UpdateCommentDTO(ReadCommentRequest, UserCommentData):
@@ -60,6 +113,7 @@ class DeleteCommentDTO(ReadCommentRequest):
 class ReadCommentsStatRequest(PostId):
     date_from: date
     date_to: date
+    granularity: Granularity = Granularity.DAY
 
     @model_validator(mode="before")
     @classmethod
@@ -74,6 +128,6 @@ class ReadCommentsStatDTO(ReadCommentsStatRequest):
 
 
 class CommentsStatResultDTO(BaseModel):
-    date: date
+    date: date | datetime
     total_comments: int
     banned_comments: int
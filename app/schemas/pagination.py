@@ -1,7 +1,104 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timezone
+from typing import Sequence
+
 from fastapi import Query
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+from app.core.config import settings
+from app.models.common.enums.total_mode import TotalMode
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(value: str) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+# Ids are int4 columns.
+MAX_ID = 2**31 - 1
+
+
+class Cursor(BaseModel):
+    created_at: datetime
+    id: int = Field(ge=1, le=MAX_ID)
+
+    @field_validator("created_at")
+    @classmethod
+    def to_naive_utc(cls, value: datetime) -> datetime:
+        # Timestamps are stored without a time zone, in UTC.
+        if value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def encode(self) -> str:
+        return encode_cursor([self.created_at.isoformat(), self.id])
+
+    @classmethod
+    def decode(cls, value: str) -> "Cursor":
+        try:
+            created_at, id_ = decode_cursor(value)
+            return cls(created_at=created_at, id=id_)
+        except (ValueError, TypeError, ValidationError):
+            raise ValueError("Invalid cursor")
+
+
+class ReplyCursor(BaseModel):
+    """Position in the replies of ``parent_id`` (top-level comments if None);
+    ``after`` is None to start from the first reply."""
+
+    parent_id: int | None = Field(ge=1, le=MAX_ID)
+    after: Cursor | None = None
+
+    def encode(self) -> str:
+        after = (
+            [self.after.created_at.isoformat(), self.after.id] if self.after else None
+        )
+        return encode_cursor([self.parent_id, after])
+
+    @classmethod
+    def decode(cls, value: str) -> "ReplyCursor":
+        try:
+            parent_id, after = decode_cursor(value)
+            if after is not None:
+                after = Cursor(created_at=after[0], id=after[1])
+            return cls(parent_id=parent_id, after=after)
+        except (ValueError, TypeError, IndexError, ValidationError):
+            raise ValueError("Invalid cursor")
 
 
 class Pagination(BaseModel):
     skip: int = Query(0, ge=0)
-    limit: int = Query(10, ge=10)
+    limit: int = Query(10, ge=10, le=settings.MAX_PAGE_SIZE)
+    cursor: str | None = Query(None)
+    total_mode: TotalMode = Query(TotalMode.EXACT)
+
+    @field_validator("cursor")
+    @classmethod
+    def validate_cursor(cls, value: str | None) -> str | None:
+        if value is not None:
+            Cursor.decode(value)
+        return value
+
+    @property
+    def after(self) -> Cursor | None:
+        return Cursor.decode(self.cursor) if self.cursor else None
+
+
+def next_cursor(items: Sequence, limit: int) -> str | None:
+    if len(items) < limit:
+        return None
+    last = items[-1]
+    return Cursor(created_at=last.created_at, id=last.id).encode()
@@ -1,9 +1,10 @@
 from datetime import datetime
 from typing import List
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, field_validator
 
 from app.models.common.enums.status import Status
+from app.schemas.bulk import BulkCreateRequest, BulkItemError
 
 
 class PostDTO(BaseModel):
@@ -24,21 +25,32 @@ class CreatePostRequest(BaseModel):
     ai_enabled: bool = Field(examples=[False])
     ai_delay_minutes: int = Field(examples=[5])
     
-    @model_validator(mode="before")
+    @field_validator("ai_delay_minutes")
     @classmethod
-    def validate(cls, data: dict) -> dict:
-        if data["ai_delay_minutes"] < 0:
+    def validate_delay(cls, value: int) -> int:
+        if value < 0:
             raise ValueError("Delay can't be less than zero. Minimum allowed value: 0")
-        return data
+        return value
         
 
 class CreatePostDTO(CreatePostRequest):
     user_id: int
 
 
+class BulkCreatePostsDTO(BulkCreateRequest):
+    user_id: int
+
+
+class BulkCreatePostsResultDTO(BaseModel):
+    # Aligned with the request items, None where the item failed.
+    posts: List[PostDTO | None]
+    errors: List[BulkItemError]
+
+
 class PostsListResultDTO(BaseModel):
     posts: List[PostDTO]
     total: int
+    next_cursor: str | None = None
 
 
 class UpdatePostBase(BaseModel):
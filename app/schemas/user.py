@@ -9,6 +9,7 @@ class UserDTO(BaseModel):
     username: str
     email: str
     created_at: datetime
+    updated_at: datetime | None = None
 
 
 class UserId(BaseModel):
@@ -18,3 +19,4 @@ class UserId(BaseModel):
 class UsersListResultDTO(BaseModel):
     users: List[UserDTO]
     total: int
+    next_cursor: str | None = None
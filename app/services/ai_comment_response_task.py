@@ -1,51 +1,127 @@
+from sqlalchemy import Row
+
+from app.core.config import settings
 from app.core.db import sessionmanager
-from app.core.utils import generate_ai_response
+from app.core.metrics import metrics
+from app.core.utils import estimate_tokens, generate_ai_response
 from app.models.comment import Comment
 from app.models.common.enums.ai_roles import AIRoles
+from app.models.post import Post
 from app.repositories.comment_gateway import CommentDbGateway
+from app.repositories.comment_stats_gateway import CommentStatsDbGateway
+from app.repositories.counter_gateway import (
+    CounterDbGateway,
+    post_comments_key,
+    post_comments_version_key,
+)
 from app.repositories.post_gateway import PostDbGateway
 from app.schemas.comment import CreateAICommentDTO
+from app.services.common.ai_reply_dispatcher import AIReplyDispatcher
 
 
 async def create_comment_response_by_ai(dto: CreateAICommentDTO) -> None:
+    await ai_reply_dispatcher.submit(dto)
+
+
+async def create_comment_responses_by_ai(dtos: list[CreateAICommentDTO]) -> None:
+    for dto in dtos:
+        await ai_reply_dispatcher.submit(dto)
+
+
+async def generate_ai_replies(dtos: list[CreateAICommentDTO]) -> None:
+    # Replies pending for one commenter in one thread come in together. Those
+    # on the same reply chain, i.e. the comments already in the chain of the
+    # latest one or replying to a comment in it, are answered once under the
+    # latest comment, with the earlier ones folded into the history. Comments
+    # on other branches of the thread get replies of their own.
     async with sessionmanager.session() as db:
-        post_gateway = PostDbGateway(db)
+        post = await PostDbGateway(db).get_by_id(dtos[0].post_id)
+        if not post:
+            return
         comment_gateway = CommentDbGateway(db)
-    post = await post_gateway.get_by_id(dto.post_id)
-    if not post:
-        return
-    parent = await comment_gateway.get_by_id(dto.post_id, dto.parent_id)
-    if not parent:
-        return
-
-    history = await parse_comments_history(comment_gateway, parent, post.id)
+        comments = {
+            comment.id: comment
+            for comment in await comment_gateway.get_by_ids(
+                post.id, [dto.parent_id for dto in dtos]
+            )
+        }
+        pending = [dto for dto in dtos if dto.parent_id in comments]
+        replies = []
+        while pending:
+            dto = pending.pop()
+            chain = await comment_gateway.get_reply_chain(
+                post.id, dto.parent_id, settings.AI_HISTORY_MAX_DEPTH
+            )
+            chain_ids = {comment.id for comment in chain}
+            earlier, rest = [], []
+            for other in pending:
+                comment = comments[other.parent_id]
+                if comment.id in chain_ids:
+                    continue
+                if comment.parent_id in chain_ids:
+                    earlier.append(comment)
+                else:
+                    rest.append(other)
+            pending = rest
+            if chain:
+                replies.append((dto, chain, earlier))
+
+    for index, (dto, chain, earlier) in enumerate(replies):
+        if index:
+            # The dispatcher paid for the first LLM call of the batch only.
+            await ai_reply_dispatcher.bucket.acquire()
+        await create_ai_reply(post, dto, chain, earlier)
+
+
+async def create_ai_reply(
+    post: Post, dto: CreateAICommentDTO, chain: list[Comment], earlier: list[Comment]
+) -> None:
+    # The LLM call can take seconds, so no connection is held while it runs.
+    history = parse_comments_history(chain, settings.AI_HISTORY_MAX_TOKENS)
+    history[-1:-1] = [
+        {"role": AIRoles.USER.value, "content": comment.content} for comment in earlier
+    ]
     ai_response = await generate_ai_response(post.content, history)
 
     comment = Comment(
         owner_id=post.owner_id,
         post_id=post.id,
-        parent_id=parent.id,
+        parent_id=dto.parent_id,
         content=ai_response,
         is_ai=True,
     )
-    await comment_gateway.create(comment)
-    await db.close()
+    async with sessionmanager.transaction() as db:
+        await CounterDbGateway(db).increment_many(
+            {post_comments_key(post.id): 1, post_comments_version_key(post.id): 1}
+        )
+        await CommentDbGateway(db).create(comment)
+        await CommentStatsDbGateway(db).record_created(post.id)
     print(
         f'Task "create_comment_response_by_ai" successfully completed.\n'
-        f'Comment created with comment_id: {comment.id}, post_id: {post.id}'
+        f"Comment created with comment_id: {comment.id}, post_id: {post.id}"
     )
 
-async def parse_comments_history(
-    gateway: CommentDbGateway, parent: Comment, post_id: int
-) -> list:
-    prev = parent
+
+def parse_comments_history(chain: list[Row], max_tokens: int) -> list:
+    author_id = chain[0].owner_id
     history = []
-    while prev:
+    for comment in chain:
         role = AIRoles.USER.value
-        if prev.is_ai:
+        if comment.is_ai:
             role = AIRoles.ASSISTANT.value
-        elif prev.owner_id != parent.owner_id:
+        elif comment.owner_id != author_id:
             break
-        history.append({"role": role, "content": prev.content})
-        prev = await gateway.get_by_id(post_id, prev.parent_id)
+        max_tokens -= estimate_tokens(comment.content)
+        if max_tokens < 0 and history:
+            break
+        history.append({"role": role, "content": comment.content})
     return list(reversed(history))
+
+
+ai_reply_dispatcher = AIReplyDispatcher(
+    generate_ai_replies,
+    max_concurrency=settings.AI_MAX_CONCURRENCY,
+    rate=settings.AI_RATE_LIMIT,
+    burst=settings.AI_RATE_BURST,
+)
+metrics.register("ai_replies", ai_reply_dispatcher.stats)
@@ -1,3 +1,5 @@
+from typing import Any
+
 from jose import JWTError
 
 from app.core.exceptions.auth import (
@@ -5,15 +7,19 @@ from app.core.exceptions.auth import (
     InvalidTokenType,
     NotAuthorized,
     TokenExpired,
+    TokenRevoked,
 )
 from app.core.exceptions.entity import UserNotFound
 from app.core.security import (
+    TOKEN_ID_FIELD,
     TOKEN_TYPE_FIELD,
+    USER_CLAIMS,
     create_access_token,
     create_refresh_token,
     decode_token,
-    verify_password,
+    verify_password_async,
 )
+from app.core.token_denylist import token_denylist
 from app.models.common.enums.token_type import TokenType
 from app.repositories.user_gateway import UserDbGateway
 from app.schemas.auth import SignInDTO, TokenInfo
@@ -26,11 +32,13 @@ class AuthenticationService:
 
     async def authenticate(self, credentials: SignInDTO) -> TokenInfo:
         user = await self.user_gateway.get_by_email(credentials.email)
-        if not user or not verify_password(credentials.password, user.hashed_password):
+        if not user or not await verify_password_async(
+            credentials.password, user.hashed_password
+        ):
             raise InvalidCredentials()
-        return self.generate_tokens(user.id)
+        return self.generate_tokens(UserDTO.model_validate(user, from_attributes=True))
 
-    def validate_token(self, token: str | None, token_type: TokenType) -> int:
+    def validate_token(self, token: str | None, token_type: TokenType) -> dict:
         if not token:
             raise NotAuthorized()
         try:
@@ -41,18 +49,52 @@ class AuthenticationService:
             raise InvalidCredentials()
         if not payload.get(TOKEN_TYPE_FIELD) == token_type:
             raise InvalidTokenType()
-        return int(payload.get("sub"))
+        return payload
 
     async def get_auth_user(self, token: str | None, token_type: TokenType) -> UserDTO:
-        user_id = self.validate_token(token, token_type)
+        payload = self.validate_token(token, token_type)
+        await self.ensure_not_revoked(payload)
+        return await self._get_user(int(payload["sub"]))
+
+    async def get_token_user(self, token: str | None) -> UserDTO:
+        payload = self.validate_token(token, TokenType.ACCESS)
+        await self.ensure_not_revoked(payload)
+        if not all(claim in payload for claim in USER_CLAIMS):
+            return await self._get_user(int(payload["sub"]))
+        return UserDTO(
+            id=int(payload["sub"]),
+            username=payload["username"],
+            email=payload["email"],
+            created_at=payload["created_at"],
+        )
+
+    async def revoke_token(self, token: str | None) -> None:
+        payload = self.validate_token(token, TokenType.ACCESS)
+        if TOKEN_ID_FIELD in payload:
+            await token_denylist.revoke(payload[TOKEN_ID_FIELD], payload["exp"])
+
+    async def ensure_not_revoked(self, payload: dict) -> None:
+        token_id = payload.get(TOKEN_ID_FIELD)
+        if token_id and await token_denylist.contains(token_id):
+            raise TokenRevoked()
+
+    def generate_tokens(self, user: UserDTO, access_only: bool = False) -> TokenInfo:
+        return TokenInfo(
+            access_token=create_access_token(user.id, self._user_claims(user)),
+            refresh_token=None if access_only else create_refresh_token(user.id),
+            token_type="Bearer",
+        )
+
+    async def _get_user(self, user_id: int) -> UserDTO:
         user = await self.user_gateway.get_by_id(user_id)
         if not user:
             raise UserNotFound()
         return UserDTO.model_validate(user, from_attributes=True)
 
-    def generate_tokens(self, user_id: int, access_only: bool = False) -> TokenInfo:
-        return TokenInfo(
-            access_token=create_access_token(user_id),
-            refresh_token=None if access_only else create_refresh_token(user_id),
-            token_type="Bearer",
-        )
+    @staticmethod
+    def _user_claims(user: UserDTO) -> dict[str, Any]:
+        return {
+            "username": user.username,
+            "email": user.email,
+            "created_at": user.created_at.isoformat(),
+        }
@@ -1,38 +1,65 @@
-from datetime import datetime, timedelta
-from typing import List
+from datetime import date, datetime, timedelta
+from functools import partial
+from typing import AsyncIterator, List
 
+from app.core.config import settings
 from app.core.exceptions.common import ProfanityContent
 from app.core.exceptions.entity import CommentNotFound, PostNotFound
-from app.core.utils import contains_profanity
+from app.core.utils import contains_profanity_async, contains_profanity_batch_async
 from app.models.comment import Comment
+from app.models.common.enums.granularity import Granularity
 from app.models.common.enums.status import Status
 from app.repositories.comment_gateway import CommentDbGateway
+from app.repositories.comment_stats_gateway import CommentStatsDbGateway
+from app.repositories.counter_gateway import (
+    CounterDbGateway,
+    post_comments_key,
+    post_comments_version_key,
+)
 from app.repositories.post_gateway import PostDbGateway
+from app.schemas.bulk import BulkItemError, parse_items
 from app.schemas.comment import (
+    BulkCreateCommentsDTO,
+    BulkCreateCommentsResultDTO,
     CommentDTO,
     CommentsListResultDTO,
     CommentsStatResultDTO,
+    CommentTreeDTO,
+    CommentTreeNodeDTO,
     CreateAICommentDTO,
     CreateCommentDTO,
+    CreateCommentRequest,
     DeleteCommentDTO,
     ReadCommentRequest,
     ReadCommentsListDTO,
     ReadCommentsStatDTO,
+    ReadCommentTreeRequest,
     UpdateCommentDTO,
 )
-from app.services.common.base_service import BaseService
-from app.services.common.scheduler import schedule_ai_comment_response_task
+from app.schemas.pagination import Cursor, ReplyCursor, next_cursor
+from app.schemas.post import PostId
+from app.services.common.base_service import BaseService, to_dtos
+from app.services.common.scheduler import (
+    schedule_ai_comment_response_task,
+    schedule_ai_comment_response_tasks,
+)
 
 
 class CommentService(BaseService):
     def __init__(
-        self, comment_gateway: CommentDbGateway, post_gateway: PostDbGateway
+        self,
+        comment_gateway: CommentDbGateway,
+        post_gateway: PostDbGateway,
+        counter_gateway: CounterDbGateway,
+        stats_gateway: CommentStatsDbGateway,
     ) -> None:
         self.comment_gateway = comment_gateway
         self.post_gateway = post_gateway
+        self.counter_gateway = counter_gateway
+        self.stats_gateway = stats_gateway
 
     async def create_comment(self, dto: CreateCommentDTO) -> CommentDTO:
-        post = await self.post_gateway.get_by_id(dto.post_id)
+        post = await self.post_gateway.get_by_id_cached(dto.post_id)
         if not post:
             raise PostNotFound()
         if dto.parent_id:
@@ -46,83 +73,310 @@ class CommentService(BaseService):
             parent_id=dto.parent_id,
             content=dto.content,
         )
-        if contains_profanity(dto.content):
+        if await contains_profanity_async(dto.content):
             comment.status = Status.BANNED
+        else:
+            await self.counter_gateway.increment_many(
+                {post_comments_key(post.id): 1, post_comments_version_key(post.id): 1}
+            )
+        # The insert goes first, so a post deleted behind the cache fails on
+        # the comment's foreign key with a 404.
         await self.comment_gateway.create(comment)
+        await self.stats_gateway.record_created(
+            post.id, banned=comment.status == Status.BANNED
+        )
 
         if post.ai_enabled and not comment.is_ai:
             if not dto.parent_id or parent.is_ai:
                 ai_dto = CreateAICommentDTO(
                     post_id=post.id,
                     parent_id=comment.id,
+                    user_id=dto.user_id,
+                    thread_id=parent.root_id if dto.parent_id else comment.id,
                 )
                 run_date = datetime.now() + timedelta(minutes=post.ai_delay_minutes)
-                await schedule_ai_comment_response_task(ai_dto, run_date)
+                self.comment_gateway.after_commit(
+                    partial(schedule_ai_comment_response_task, ai_dto, run_date)
+                )
 
         return CommentDTO.model_validate(comment, from_attributes=True)
 
+    async def create_comments(
+        self, dto: BulkCreateCommentsDTO
+    ) -> BulkCreateCommentsResultDTO:
+        post = await self.post_gateway.get_by_id_cached(dto.post_id)
+        if not post:
+            raise PostNotFound()
+
+        items, errors = parse_items(CreateCommentRequest, dto.items)
+        parent_ids = {item.parent_id for item in items.values() if item.parent_id}
+        parents = {
+            parent.id: parent
+            for parent in await self.comment_gateway.get_by_ids(
+                post.id, list(parent_ids)
+            )
+        }
+        for index, item in list(items.items()):
+            if item.parent_id and item.parent_id not in parents:
+                errors.append(
+                    BulkItemError(index=index, detail=CommentNotFound().detail)
+                )
+                del items[index]
+
+        results: List[CommentDTO | None] = [None] * len(dto.items)
+        if items:
+            profane = await contains_profanity_batch_async(
+                [item.content for item in items.values()]
+            )
+            rows = [
+                {
+                    "owner_id": dto.user_id,
+                    "post_id": post.id,
+                    "parent_id": item.parent_id,
+                    "content": item.content,
+                    "status": Status.BANNED if banned else Status.ACTIVE,
+                    "path": (
+                        parents[item.parent_id].subtree_path if item.parent_id else ""
+                    ),
+                }
+                for item, banned in zip(items.values(), profane)
+            ]
+            banned = sum(profane)
+            if len(rows) > banned:
+                await self.counter_gateway.increment_many(
+                    {
+                        post_comments_key(post.id): len(rows) - banned,
+                        post_comments_version_key(post.id): 1,
+                    }
+                )
+            comments = await self.comment_gateway.create_many(rows)
+            await self.stats_gateway.record_created(post.id, len(rows), banned)
+
+            ai_dtos = []
+            for index, item, comment in zip(items, items.values(), comments):
+                results[index] = CommentDTO.model_validate(
+                    comment, from_attributes=True
+                )
+                if not item.parent_id or parents[item.parent_id].is_ai:
+                    ai_dtos.append(
+                        CreateAICommentDTO(
+                            post_id=post.id,
+                            parent_id=comment.id,
+                            user_id=dto.user_id,
+                            thread_id=comment.root_id,
+                        )
+                    )
+            if post.ai_enabled and ai_dtos:
+                run_date = datetime.now() + timedelta(minutes=post.ai_delay_minutes)
+                self.comment_gateway.after_commit(
+                    partial(schedule_ai_comment_response_tasks, ai_dtos, run_date)
+                )
+
+        errors.sort(key=lambda error: error.index)
+        return BulkCreateCommentsResultDTO(comments=results, errors=errors)
+
     async def get_comment(self, dto: ReadCommentRequest) -> CommentDTO:
-        if not await self.post_gateway.get_by_id(dto.post_id):
+        row = await self.comment_gateway.get_with_post(dto.post_id, dto.comment_id)
+        if not row:
             raise PostNotFound()
-        comment = await self.comment_gateway.get_by_id(dto.post_id, dto.comment_id)
-        if not comment:
+        if not row.Comment:
             raise CommentNotFound()
-        return CommentDTO.model_validate(comment, from_attributes=True)
+        return CommentDTO.model_validate(row.Comment, from_attributes=True)
+
+    async def get_comment_updated_at(self, dto: ReadCommentRequest) -> datetime:
+        row = await self.comment_gateway.get_updated_at(dto.post_id, dto.comment_id)
+        if not row:
+            raise PostNotFound()
+        if not row.comment_id:
+            raise CommentNotFound()
+        return row.updated_at
+
+    async def get_comments_version(self, dto: PostId) -> int:
+        """Version of the post's comments, the list and the tree change only
+        when it does."""
+        if not await self.post_gateway.get_by_id_cached(dto.post_id):
+            raise PostNotFound()
+        return await self.get_version(post_comments_version_key(dto.post_id))
 
     async def get_post_comments(
         self, dto: ReadCommentsListDTO
     ) -> CommentsListResultDTO:
-        if not await self.post_gateway.get_by_id(dto.post_id):
+        if not await self.post_gateway.get_by_id_cached(dto.post_id):
             raise PostNotFound()
 
-        comments, total = await self.comment_gateway.get_list_by_post_id(
-            dto.post_id, dto.pagination.skip, dto.pagination.limit
+        pagination = dto.pagination
+        comments = await self.comment_gateway.get_list_by_post_id(
+            dto.post_id, pagination.skip, pagination.limit, pagination.after
+        )
+        total = await self.get_total(
+            pagination.total_mode,
+            post_comments_key(dto.post_id),
+            partial(self.comment_gateway.get_total, dto.post_id),
+        )
+        return CommentsListResultDTO(
+            comments=to_dtos(CommentDTO, comments),
+            total=total,
+            next_cursor=next_cursor(comments, pagination.limit),
         )
-        comments_dto_list = [
-            CommentDTO.model_validate(comment, from_attributes=True)
-            for comment in comments
-        ]
-        return CommentsListResultDTO(comments=comments_dto_list, total=total)
 
-    async def update_comment(self, dto: UpdateCommentDTO) -> CommentDTO:
-        if not await self.post_gateway.get_by_id(dto.post_id):
+    async def get_comment_tree(self, dto: ReadCommentTreeRequest) -> CommentTreeDTO:
+        if not await self.post_gateway.get_by_id_cached(dto.post_id):
             raise PostNotFound()
 
-        comment = await self.comment_gateway.get_by_id(dto.post_id, dto.comment_id)
-        if not comment:
+        replies = dto.replies
+        rows = await self.comment_gateway.get_tree(
+            dto.post_id,
+            dto.max_depth,
+            dto.max_children,
+            dto.max_nodes,
+            root_id=dto.root_id,
+            replies=replies,
+        )
+        if dto.root_id is not None and not rows:
             raise CommentNotFound()
-        self.ensure_can_edit(comment.owner_id, dto.user_id)
 
-        if contains_profanity(dto.content):
-            raise ProfanityContent()
+        truncated = len(rows) > dto.max_nodes
+        # Parents (None for the top level) with replies left out of the
+        # response, either past max_children or past the node budget.
+        incomplete = set()
+        if truncated:
+            extra = rows.pop()
+            incomplete.add(extra.parent_id if extra.depth > 1 else None)
 
-        await self.comment_gateway.update(comment, dto.model_dump())
-        return CommentDTO.model_validate(comment, from_attributes=True)
+        roots: List[CommentTreeNodeDTO] = []
+        nodes: dict[int, CommentTreeNodeDTO] = {}
+        has_children: dict[int, bool] = {}
+        for row in rows:
+            if row.rn > dto.max_children:
+                incomplete.add(row.parent_id if row.depth > 1 else None)
+                continue
+            node = CommentTreeNodeDTO.model_validate(row, from_attributes=True)
+            nodes[node.id] = node
+            has_children[node.id] = row.has_children
+            if row.depth == 1:
+                roots.append(node)
+            else:
+                nodes[row.parent_id].replies.append(node)
 
-    async def delete_comment(self, dto: DeleteCommentDTO) -> CommentDTO:
-        if not await self.post_gateway.get_by_id(dto.post_id):
+        for node in nodes.values():
+            node.replies.sort(key=_thread_order)
+            if node.id in incomplete or (has_children[node.id] and not node.replies):
+                node.more_replies = _replies_cursor(node.id, node.replies)
+        roots.sort(key=_thread_order)
+
+        next_cursor = None
+        if None in incomplete:
+            parent_id = replies.parent_id if replies else None
+            next_cursor = _replies_cursor(parent_id, roots)
+        return CommentTreeDTO(
+            comments=roots, next_cursor=next_cursor, truncated=truncated
+        )
+
+    async def export_comments(self, dto: PostId) -> AsyncIterator[str]:
+        """NDJSON lines of all active comments of a post, one chunk per
+        fetched batch; the post is checked before anything is streamed."""
+        if not await self.post_gateway.get_by_id_cached(dto.post_id):
             raise PostNotFound()
+        return self._export_lines(dto.post_id)
+
+    async def _export_lines(self, post_id: int) -> AsyncIterator[str]:
+        batches = self.comment_gateway.stream_by_post_id(
+            post_id, settings.EXPORT_BATCH_SIZE
+        )
+        async for batch in batches:
+            yield "".join(
+                comment.model_dump_json() + "\n"
+                for comment in to_dtos(CommentDTO, batch)
+            )
 
-        comment = await self.comment_gateway.get_by_id(dto.post_id, dto.comment_id)
+    async def update_comment(self, dto: UpdateCommentDTO) -> CommentDTO:
+        if await contains_profanity_async(dto.content):
+            await self.ensure_editable(dto.post_id, dto.comment_id, dto.user_id)
+            raise ProfanityContent()
+
+        comment = await self.comment_gateway.update_owned(
+            dto.post_id, dto.comment_id, dto.user_id, dto.content
+        )
         if not comment:
+            await self.ensure_editable(dto.post_id, dto.comment_id, dto.user_id)
             raise CommentNotFound()
-        self.ensure_can_edit(comment.owner_id, dto.user_id)
-
-        await self.comment_gateway.delete(comment)
+        await self.counter_gateway.increment(post_comments_version_key(dto.post_id))
         return CommentDTO.model_validate(comment, from_attributes=True)
 
+    async def delete_comment(self, dto: DeleteCommentDTO) -> CommentDTO:
+        deleted = await self.comment_gateway.delete_owned(
+            dto.post_id, dto.comment_id, dto.user_id
+        )
+        if not deleted:
+            await self.ensure_editable(dto.post_id, dto.comment_id, dto.user_id)
+            raise CommentNotFound()
+
+        removed = sum(comment.status == Status.ACTIVE for comment in deleted)
+        await self.counter_gateway.increment_many(
+            {
+                post_comments_key(dto.post_id): -removed,
+                post_comments_version_key(dto.post_id): 1,
+            }
+        )
+        await self.stats_gateway.record_deleted(deleted)
+        return CommentDTO.model_validate(deleted[0], from_attributes=True)
+
+    async def ensure_editable(
+        self, post_id: int, comment_id: int, user_id: int
+    ) -> None:
+        # The owner-scoped statements only tell that nothing matched, this
+        # extra lookup on the failure path reports which check failed.
+        row = await self.comment_gateway.get_with_post(post_id, comment_id)
+        if not row:
+            raise PostNotFound()
+        if not row.Comment:
+            raise CommentNotFound()
+        self.ensure_can_edit(row.Comment.owner_id, user_id)
+
     async def get_comment_statisctics(
         self, dto: ReadCommentsStatDTO
     ) -> List[CommentsStatResultDTO]:
-        post = await self.post_gateway.get_by_id(dto.post_id)
+        post = await self.post_gateway.get_by_id_cached(dto.post_id)
         if not post:
             raise PostNotFound()
         self.ensure_can_edit(post.owner_id, dto.user_id)
 
-        statistics = await self.comment_gateway.get_statistics_by_date(
-            date_from=dto.date_from, date_to=dto.date_to, post_id=dto.post_id
-        )
-        return [
+        if dto.granularity == Granularity.HOUR:
+            statistics = await self.comment_gateway.get_statistics(
+                dto.post_id, dto.date_from, dto.date_to, "hour"
+            )
+        else:
+            statistics = await self.stats_gateway.get_daily(
+                dto.post_id, dto.date_from, dto.date_to
+            )
+        result = [
             CommentsStatResultDTO.model_validate(row, from_attributes=True)
             for row in statistics
         ]
+        if dto.granularity == Granularity.WEEK:
+            result = _weekly(result)
+        return result
+
+
+def _thread_order(node: CommentTreeNodeDTO) -> tuple:
+    return node.created_at, node.id
+
+
+def _replies_cursor(parent_id: int | None, shown: List[CommentTreeNodeDTO]) -> str:
+    after = None
+    if shown:
+        after = Cursor(created_at=shown[-1].created_at, id=shown[-1].id)
+    return ReplyCursor(parent_id=parent_id, after=after).encode()
+
+
+def _weekly(days: List[CommentsStatResultDTO]) -> List[CommentsStatResultDTO]:
+    weeks: dict[date, CommentsStatResultDTO] = {}
+    for day in days:
+        start = day.date - timedelta(days=day.date.weekday())
+        week = weeks.setdefault(
+            start,
+            CommentsStatResultDTO(date=start, total_comments=0, banned_comments=0),
+        )
+        week.total_comments += day.total_comments
+        week.banned_comments += day.banned_comments
+    return list(weeks.values())
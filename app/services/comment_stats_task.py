@@ -0,0 +1,15 @@
+from datetime import date, timedelta
+
+from app.core.config import settings
+from app.core.db import sessionmanager
+from app.repositories.comment_stats_gateway import CommentStatsDbGateway
+
+
+async def reconcile_comment_stats() -> None:
+    since = None
+    if settings.COMMENT_STATS_RECONCILE_DAYS:
+        since = date.today() - timedelta(days=settings.COMMENT_STATS_RECONCILE_DAYS)
+    async with sessionmanager.session() as db:
+        await CommentStatsDbGateway(db).rebuild(since)
+        await db.commit()
+    print(f'Task "reconcile_comment_stats" successfully completed since {since}')
@@ -0,0 +1,135 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.core.rate_limit import TokenBucket
+from app.schemas.comment import CreateAICommentDTO
+
+Handler = Callable[[list[CreateAICommentDTO]], Awaitable[None]]
+
+
+class AIReplyDispatcher:
+    """Runs due AI reply jobs under a concurrency and rate limit.
+
+    Jobs of one commenter in one thread that are still waiting when a slot
+    frees up are handed to ``handler`` together, so replies on the same chain
+    cost one LLM call.
+
+    Waiting jobs only live in this process: ``close`` returns the ones not
+    started yet, for the caller to put back into the scheduler's job store.
+    """
+
+    def __init__(
+        self,
+        handler: Handler,
+        max_concurrency: int,
+        rate: float,
+        burst: int,
+        latency_window: int = 1000,
+    ) -> None:
+        self.handler = handler
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate, burst)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pending: dict[Hashable, list[tuple[CreateAICommentDTO, float]]] = {}
+        self._queue: asyncio.Queue[Hashable] = asyncio.Queue()
+        self._runner: asyncio.Task | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self._completed = 0
+        self._coalesced = 0
+        self._failed = 0
+
+    async def submit(self, dto: CreateAICommentDTO) -> None:
+        key = self._coalesce_key(dto)
+        if key in self._pending:
+            self._pending[key].append((dto, time.perf_counter()))
+            self._coalesced += 1
+        else:
+            self._pending[key] = [(dto, time.perf_counter())]
+            self._queue.put_nowait(key)
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+    async def close(self) -> list[CreateAICommentDTO]:
+        """Stops taking jobs off the queue, waits for the running ones and
+        returns those that never started."""
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        undrained = [dto for jobs in self._pending.values() for dto, _ in jobs]
+        self._pending.clear()
+        self._queue = asyncio.Queue()
+        return undrained
+
+    def stats(self) -> dict[str, Any]:
+        latencies = sorted(self._latencies)
+        return {
+            "queue_depth": sum(len(jobs) for jobs in self._pending.values()),
+            "in_flight": len(self._tasks),
+            "max_concurrency": self.max_concurrency,
+            "completed": self._completed,
+            "coalesced": self._coalesced,
+            "failed": self._failed,
+            "latency_p50_ms": percentile(latencies, 0.5) * 1000,
+            "latency_p95_ms": percentile(latencies, 0.95) * 1000,
+            "latency_p99_ms": percentile(latencies, 0.99) * 1000,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            key = await self._queue.get()
+            try:
+                await self._acquire_slot()
+            except asyncio.CancelledError:
+                # The jobs stay pending for close() or a later runner.
+                self._queue.put_nowait(key)
+                raise
+            # Taken only now, so jobs submitted while waiting join the batch.
+            jobs = self._pending.pop(key)
+            task = asyncio.create_task(self._process(jobs))
+            self._tasks.add(task)
+            task.add_done_callback(self._task_done)
+
+    async def _acquire_slot(self) -> None:
+        await self._semaphore.acquire()
+        try:
+            await self.bucket.acquire()
+        except asyncio.CancelledError:
+            self._semaphore.release()
+            raise
+
+    async def _process(self, jobs: list[tuple[CreateAICommentDTO, float]]) -> None:
+        try:
+            await self.handler([dto for dto, _ in jobs])
+            self._completed += len(jobs)
+        except Exception as exc:
+            self._failed += len(jobs)
+            print(f"AI reply generation failed: {exc!r}")
+        finished = time.perf_counter()
+        self._latencies.extend(finished - submitted for _, submitted in jobs)
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        self._semaphore.release()
+
+    @staticmethod
+    def _coalesce_key(dto: CreateAICommentDTO) -> Hashable:
+        # Jobs stored before these fields existed do not have them at all and
+        # are never merged.
+        user_id = getattr(dto, "user_id", None)
+        thread_id = getattr(dto, "thread_id", None)
+        if user_id is None or thread_id is None:
+            return dto.post_id, "comment", dto.parent_id
+        return dto.post_id, "thread", thread_id, user_id
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    return values[max(math.ceil(fraction * len(values)) - 1, 0)]
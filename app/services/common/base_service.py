@@ -1,7 +1,45 @@
+from typing import Awaitable, Callable, Iterable, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import Row
+
 from app.core.exceptions.common import AccessDenied
+from app.models.common.enums.total_mode import TotalMode
+from app.repositories.counter_gateway import CounterDbGateway
+
+DTO = TypeVar("DTO", bound=BaseModel)
 
 
 class BaseService:
+    counter_gateway: CounterDbGateway
+
     def ensure_can_edit(self, owner_id: int, user_id: int) -> None:
         if not owner_id == user_id:
             raise AccessDenied()
+
+    async def get_total(
+        self,
+        mode: TotalMode,
+        counter: str,
+        exact: Callable[[], Awaitable[int]],
+        table: str | None = None,
+    ) -> int:
+        if mode == TotalMode.ESTIMATED and table:
+            estimate = await self.counter_gateway.estimate(table)
+            if estimate is not None:
+                return estimate
+        if mode != TotalMode.EXACT:
+            value = await self.counter_gateway.get(counter)
+            if value is not None:
+                return value
+        return await exact()
+
+    async def get_version(self, counter: str) -> int:
+        return await self.counter_gateway.get(counter) or 0
+
+
+def to_dtos(dto: type[DTO], rows: Iterable[Row]) -> list[DTO]:
+    """DTOs built straight from rows of the list queries, which select
+    exactly the DTO's columns. Validating the row mapping is cheaper than
+    both ``from_attributes`` and ``model_construct``."""
+    return [dto.model_validate(row._mapping) for row in rows]
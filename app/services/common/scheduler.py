@@ -5,7 +5,12 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from app.core.config import settings
 from app.schemas.comment import CreateAICommentDTO
-from app.services.ai_comment_response_task import create_comment_response_by_ai
+from app.services.ai_comment_response_task import (
+    create_comment_response_by_ai,
+    create_comment_responses_by_ai,
+)
+from app.services.comment_stats_task import reconcile_comment_stats
+from app.services.post_purge_task import purge_deleted_posts
 
 jobstores = {
     "default": RedisJobStore(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
@@ -17,6 +22,51 @@ async def schedule_ai_comment_response_task(
     dto: CreateAICommentDTO, run_date: datetime
 ) -> None:
     scheduler.add_job(
-        create_comment_response_by_ai, trigger="date", run_date=run_date, args=[dto]
+        create_comment_response_by_ai,
+        trigger="date",
+        run_date=run_date,
+        args=[dto],
+        # Run however late, e.g. after a restart; by default a job overdue by
+        # more than a second is dropped.
+        misfire_grace_time=None,
     )
     print(f'Task "create_comment_response_by_ai" will be started at {run_date}')
+
+
+async def schedule_ai_comment_response_tasks(
+    dtos: list[CreateAICommentDTO], run_date: datetime
+) -> None:
+    # One job for the whole batch; the dispatcher still answers each reply.
+    scheduler.add_job(
+        create_comment_responses_by_ai,
+        trigger="date",
+        run_date=run_date,
+        args=[dtos],
+        misfire_grace_time=None,
+    )
+    print(
+        f'Task "create_comment_responses_by_ai" for {len(dtos)} comments '
+        f"will be started at {run_date}"
+    )
+
+
+def schedule_comment_stats_reconcile() -> None:
+    scheduler.add_job(
+        reconcile_comment_stats,
+        trigger="cron",
+        hour=settings.COMMENT_STATS_RECONCILE_HOUR,
+        minute=15,
+        id="reconcile_comment_stats",
+        replace_existing=True,
+    )
+
+
+def schedule_post_purge() -> None:
+    scheduler.add_job(
+        purge_deleted_posts,
+        trigger="interval",
+        seconds=settings.POST_PURGE_INTERVAL,
+        id="purge_deleted_posts",
+        replace_existing=True,
+        coalesce=True,
+    )
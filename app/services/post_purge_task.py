@@ -0,0 +1,17 @@
+from app.core.config import settings
+from app.core.db import sessionmanager
+from app.repositories.post_gateway import PostDbGateway
+
+
+async def purge_deleted_posts() -> None:
+    async with sessionmanager.session() as db:
+        gateway = PostDbGateway(db)
+        post_ids = await gateway.get_deleted_ids()
+        for post_id in post_ids:
+            # One short transaction per batch.
+            done = False
+            while not done:
+                done = await gateway.purge(post_id, settings.POST_PURGE_BATCH_SIZE)
+                await db.commit()
+    if post_ids:
+        print(f'Task "purge_deleted_posts" successfully purged posts {post_ids}')
@@ -1,22 +1,41 @@
+from typing import List
+
+from app.core.config import settings
 from app.core.exceptions.common import ProfanityContent
 from app.core.exceptions.entity import PostNotFound
-from app.core.utils import contains_profanity
+from app.core.utils import contains_profanity_async, contains_profanity_batch_async
 from app.models import Post
 from app.models.common.enums.status import Status
+from app.repositories.counter_gateway import (
+    ACTIVE_POSTS,
+    POSTS_VERSION,
+    CounterDbGateway,
+    post_comments_key,
+    post_comments_version_key,
+)
 from app.repositories.post_gateway import PostDbGateway
+from app.schemas.bulk import parse_items
+from app.schemas.pagination import Pagination, next_cursor
 from app.schemas.post import (
+    BulkCreatePostsDTO,
+    BulkCreatePostsResultDTO,
     CreatePostDTO,
+    CreatePostRequest,
     DeletePostDTO,
     PostDTO,
     PostId,
+    PostsListResultDTO,
     UpdatePostDTO,
 )
-from app.services.common.base_service import BaseService
+from app.services.common.base_service import BaseService, to_dtos
 
 
 class PostService(BaseService):
-    def __init__(self, post_gateway: PostDbGateway) -> None:
+    def __init__(
+        self, post_gateway: PostDbGateway, counter_gateway: CounterDbGateway
+    ) -> None:
         self.post_gateway = post_gateway
+        self.counter_gateway = counter_gateway
 
     async def create_post(self, dto: CreatePostDTO) -> PostDTO:
         post = Post(
@@ -25,14 +44,64 @@ class PostService(BaseService):
             ai_enabled=dto.ai_enabled,
             ai_delay_minutes=dto.ai_delay_minutes,
         )
-        if contains_profanity(dto.content):
+        if await contains_profanity_async(dto.content):
             post.status = Status.BANNED
+        else:
+            await self.counter_gateway.increment_many(
+                {ACTIVE_POSTS: 1, POSTS_VERSION: 1}
+            )
 
         await self.post_gateway.create(post)
         return PostDTO.model_validate(post, from_attributes=True)
 
+    async def create_posts(self, dto: BulkCreatePostsDTO) -> BulkCreatePostsResultDTO:
+        items, errors = parse_items(CreatePostRequest, dto.items)
+        results: List[PostDTO | None] = [None] * len(dto.items)
+        if items:
+            profane = await contains_profanity_batch_async(
+                [item.content for item in items.values()]
+            )
+            rows = [
+                {
+                    "owner_id": dto.user_id,
+                    "content": item.content,
+                    "ai_enabled": item.ai_enabled,
+                    "ai_delay_minutes": item.ai_delay_minutes,
+                    "status": Status.BANNED if banned else Status.ACTIVE,
+                }
+                for item, banned in zip(items.values(), profane)
+            ]
+            active = len(rows) - sum(profane)
+            if active:
+                await self.counter_gateway.increment_many(
+                    {ACTIVE_POSTS: active, POSTS_VERSION: 1}
+                )
+            posts = await self.post_gateway.create_many(rows)
+            for index, post in zip(items, posts):
+                results[index] = PostDTO.model_validate(post, from_attributes=True)
+        return BulkCreatePostsResultDTO(posts=results, errors=errors)
+
+    async def get_posts(self, pagination: Pagination) -> PostsListResultDTO:
+        posts = await self.post_gateway.get_list(
+            pagination.skip, pagination.limit, pagination.after
+        )
+        total = await self.get_total(
+            pagination.total_mode,
+            ACTIVE_POSTS,
+            self.post_gateway.get_total,
+            table=Post.__tablename__,
+        )
+        return PostsListResultDTO(
+            posts=to_dtos(PostDTO, posts),
+            total=total,
+            next_cursor=next_cursor(posts, pagination.limit),
+        )
+
+    async def get_posts_version(self) -> int:
+        return await self.get_version(POSTS_VERSION)
+
     async def get_post(self, dto: PostId) -> PostDTO:
-        post = await self.post_gateway.get_by_id(dto.post_id)
+        post = await self.post_gateway.get_by_id_cached(dto.post_id)
         if not post:
             raise PostNotFound()
         return PostDTO.model_validate(post, from_attributes=True)
@@ -43,9 +112,10 @@ class PostService(BaseService):
             raise PostNotFound()
         self.ensure_can_edit(post.owner_id, dto.user_id)
 
-        if contains_profanity(dto.content):
+        if await contains_profanity_async(dto.content):
             raise ProfanityContent()
 
+        await self.counter_gateway.increment(POSTS_VERSION)
         await self.post_gateway.update(post, dto.model_dump())
         return PostDTO.model_validate(post, from_attributes=True)
 
@@ -55,5 +125,16 @@ class PostService(BaseService):
             raise PostNotFound()
         self.ensure_can_edit(post.owner_id, dto.user_id)
 
-        await self.post_gateway.delete(post)
+        await self.counter_gateway.increment_many({ACTIVE_POSTS: -1, POSTS_VERSION: 1})
+        await self.counter_gateway.delete(
+            post_comments_key(post.id), post_comments_version_key(post.id)
+        )
+        threshold = settings.POST_PURGE_ASYNC_THRESHOLD
+        if threshold and (
+            await self.post_gateway.count_comments(post.id, threshold + 1) > threshold
+        ):
+            # Too big to delete within the request, see purge_deleted_posts.
+            await self.post_gateway.mark_deleted(post)
+        else:
+            await self.post_gateway.delete(post)
         return PostDTO.model_validate(post, from_attributes=True)
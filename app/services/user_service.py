@@ -1,14 +1,24 @@
 from app.core.exceptions.entity import UserAlreadyExists, UserNotFound
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 from app.models.user import User
+from app.repositories.counter_gateway import (
+    USERS_TOTAL,
+    USERS_VERSION,
+    CounterDbGateway,
+)
 from app.repositories.user_gateway import UserDbGateway
 from app.schemas.auth import SignUpDTO
-from app.schemas.user import UserDTO, UserId
+from app.schemas.pagination import Pagination, next_cursor
+from app.schemas.user import UserDTO, UserId, UsersListResultDTO
+from app.services.common.base_service import BaseService, to_dtos
 
 
-class UserService:
-    def __init__(self, user_gateway: UserDbGateway) -> None:
+class UserService(BaseService):
+    def __init__(
+        self, user_gateway: UserDbGateway, counter_gateway: CounterDbGateway
+    ) -> None:
         self.user_gateway = user_gateway
+        self.counter_gateway = counter_gateway
 
     async def create_user(self, dto: SignUpDTO) -> UserDTO:
         if await self.user_gateway.get_by_email(dto.email):
@@ -19,13 +29,33 @@ class UserService:
         user = User(
             username=dto.username,
             email=dto.email,
-            hashed_password=get_password_hash(dto.password),
+            hashed_password=await get_password_hash_async(dto.password),
         )
+        await self.counter_gateway.increment_many({USERS_TOTAL: 1, USERS_VERSION: 1})
         await self.user_gateway.create(user)
         return UserDTO.model_validate(user, from_attributes=True)
 
+    async def get_users(self, pagination: Pagination) -> UsersListResultDTO:
+        users = await self.user_gateway.get_list(
+            pagination.skip, pagination.limit, pagination.after
+        )
+        total = await self.get_total(
+            pagination.total_mode,
+            USERS_TOTAL,
+            self.user_gateway.get_total,
+            table=User.__tablename__,
+        )
+        return UsersListResultDTO(
+            users=to_dtos(UserDTO, users),
+            total=total,
+            next_cursor=next_cursor(users, pagination.limit),
+        )
+
+    async def get_users_version(self) -> int:
+        return await self.get_version(USERS_VERSION)
+
     async def get_user(self, dto: UserId) -> UserDTO:
-        user = await self.user_gateway.get_by_id(dto.user_id)
+        user = await self.user_gateway.get_by_id_cached(dto.user_id)
         if not user:
             raise UserNotFound()
 
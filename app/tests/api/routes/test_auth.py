@@ -1,4 +1,8 @@
-from app.core.security import create_access_token, create_refresh_token
+from jose import jwt
+
+from app.core.config import settings
+from app.core.security import create_access_token, create_refresh_token, hashing_pool
+from app.repositories.user_gateway import UserDbGateway
 from app.tests.conftest import test_users
 from app.tests.error_validator import validate_error
 
@@ -72,6 +76,21 @@ async def test_me(client, test_db_user):
     assert data["username"] == test_users[0]["username"]
 
 
+async def test_me_cached_token(client, test_db_user):
+    token = create_access_token(1)
+    headers = {"Authorization": f"Bearer {token}"}
+    before = (await client.get("/api/metrics/")).json()["jwt_cache"]
+
+    for _ in range(3):
+        response = await client.get(f"{API_PREFIX}/me/", headers=headers)
+        assert response.status_code == 200
+
+    after = (await client.get("/api/metrics/")).json()["jwt_cache"]
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 2
+    assert after["size"] == 1
+
+
 async def test_me_invalid_token(client):
     token = create_refresh_token(1)
     headers = {"Authorization": f"Bearer {token}"}
@@ -128,3 +147,62 @@ async def test_refresh_token_not_found(client):
         f"{API_PREFIX}/refresh/", json={"refresh_token": token}
     )
     validate_error(response, 404, "User not found")
+
+
+async def test_sign_up_hashing_pool_overloaded(client, mock_user_data, monkeypatch):
+    monkeypatch.setattr(hashing_pool, "max_workers", 1)
+    monkeypatch.setattr(hashing_pool, "max_queue", 0)
+    monkeypatch.setattr(hashing_pool, "_pending", 1)
+
+    response = await client.post(f"{API_PREFIX}/sign_up/", json=mock_user_data)
+    validate_error(response, 503, "Service is overloaded, try again later")
+    assert response.headers["Retry-After"] == "1"
+
+
+async def test_access_token_user_claims(client, mock_user_data):
+    response = await client.post(f"{API_PREFIX}/sign_up/", json=mock_user_data)
+    token = response.json()["tokens"]["access_token"]
+
+    payload = jwt.decode(token, settings.SECRET_KEY, settings.HASH_ALGORITHM)
+    assert payload["username"] == mock_user_data["username"]
+    assert payload["email"] == mock_user_data["email"]
+    assert "created_at" in payload
+    assert "jti" in payload
+
+
+async def test_write_skips_user_lookup(
+    client, mock_user_data, mock_post_data, monkeypatch
+):
+    response = await client.post(f"{API_PREFIX}/sign_up/", json=mock_user_data)
+    user = response.json()["user"]
+    headers = {"Authorization": f"Bearer {response.json()['tokens']['access_token']}"}
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("user lookup is not expected")
+
+    monkeypatch.setattr(UserDbGateway, "get_by_id", fail)
+    response = await client.post(
+        "/api/posts/create/", json=mock_post_data, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["owner_id"] == user["id"]
+
+
+async def test_logout(client, mock_user_data, mock_post_data):
+    response = await client.post(f"{API_PREFIX}/sign_up/", json=mock_user_data)
+    headers = {"Authorization": f"Bearer {response.json()['tokens']['access_token']}"}
+
+    response = await client.post(f"{API_PREFIX}/logout/", headers=headers)
+    assert response.status_code == 204
+
+    response = await client.post(
+        "/api/posts/create/", json=mock_post_data, headers=headers
+    )
+    validate_error(response, 401, "Token has been revoked")
+    response = await client.get(f"{API_PREFIX}/me/", headers=headers)
+    validate_error(response, 401, "Token has been revoked")
+
+
+async def test_logout_not_authorized(client):
+    response = await client.post(f"{API_PREFIX}/logout/", headers={})
+    validate_error(response, 401, "Not authorized")
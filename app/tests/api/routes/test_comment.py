@@ -1,7 +1,15 @@
-from datetime import UTC, datetime, timedelta
+import json
+from datetime import UTC, date, datetime, timedelta, timezone
 
+from sqlalchemy import delete
+
+from app.core.config import settings
+from app.models import Comment, CommentDailyStats, Post
 from app.models.common.enums.status import Status
-from app.tests.conftest import test_comments
+from app.repositories.comment_stats_gateway import CommentStatsDbGateway
+from app.schemas.pagination import ReplyCursor, encode_cursor
+from app.services import comment_service
+from app.tests.conftest import add_comment, add_model, async_session, test_comments
 from app.tests.error_validator import validate_error
 
 API_PREFIX = "/api/posts"
@@ -32,6 +40,30 @@ async def test_create_comment_post_not_found(
     validate_error(response, 404, "Post not found")
 
 
+async def test_create_comment_post_deleted_behind_cache(
+    client, test_db_comment, mock_comment_data, user_token_1
+):
+    # Cached by this worker, then deleted through another one.
+    assert (await client.get(f"{API_PREFIX}/1/")).status_code == 200
+    async with async_session() as db:
+        await db.execute(delete(Post).where(Post.id == 1))
+        await db.commit()
+
+    for parent_id, detail in ((None, "Post not found"), (1, "Comment not found")):
+        response = await client.post(
+            f"{API_PREFIX}/1/comments/",
+            json={**mock_comment_data, "parent_id": parent_id},
+            headers={"Authorization": f"Bearer {user_token_1}"},
+        )
+        validate_error(response, 404, detail)
+    response = await client.post(
+        f"{API_PREFIX}/1/comments/bulk/",
+        json={"items": [mock_comment_data]},
+        headers={"Authorization": f"Bearer {user_token_1}"},
+    )
+    validate_error(response, 404, "Post not found")
+
+
 async def test_create_comment_banned(
     client, test_db_post, mock_comment_data, user_token_1
 ):
@@ -46,6 +78,61 @@ async def test_create_comment_banned(
     assert response.json()["status"] == Status.BANNED.value
 
 
+async def test_create_comments_bulk(client, test_db_post, user_token_1, monkeypatch):
+    scheduled = []
+
+    async def schedule(dtos, run_date):
+        scheduled.extend(dtos)
+
+    monkeypatch.setattr(comment_service, "schedule_ai_comment_response_tasks", schedule)
+    await add_model(Post(id=10, owner_id=1, content="AI post", ai_enabled=True))
+    parent = await add_comment(Comment(owner_id=1, post_id=10, content="Parent"))
+    items = [
+        {"content": "First"},
+        {"content": "Fuck"},
+        {"content": "Reply", "parent_id": parent.id},
+        {"content": "Orphan", "parent_id": 999},
+        {"parent_id": parent.id},
+    ]
+    response = await client.post(
+        f"{API_PREFIX}/10/comments/bulk/",
+        json={"items": items},
+        headers={"Authorization": f"Bearer {user_token_1}"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    comments = data["comments"]
+    assert comments[0]["content"] == "First"
+    assert comments[1]["status"] == Status.BANNED.value
+    assert comments[2]["parent_id"] == parent.id
+    assert comments[3] is None and comments[4] is None
+    assert data["errors"][0] == {"index": 3, "detail": "Comment not found"}
+    assert data["errors"][1]["index"] == 4
+    # Replies to human comments get no AI answer.
+    assert [dto.parent_id for dto in scheduled] == [
+        comments[0]["id"],
+        comments[1]["id"],
+    ]
+
+    response = await client.get(
+        f"{API_PREFIX}/10/comments/tree/", params={"root_id": parent.id}
+    )
+    assert contents(response.json()["comments"][0]["replies"]) == ["Reply"]
+    response = await client.get(
+        f"{API_PREFIX}/10/comments/", params={"total_mode": "cached"}
+    )
+    assert response.json()["total"] == 2
+
+
+async def test_create_comments_bulk_post_not_found(client, test_db_user, user_token_1):
+    response = await client.post(
+        f"{API_PREFIX}/999/comments/bulk/",
+        json={"items": [{"content": "First"}]},
+        headers={"Authorization": f"Bearer {user_token_1}"},
+    )
+    validate_error(response, 404, "Post not found")
+
+
 async def test_read_all_comments(client, test_db_comments):
     response = await client.get(f"{API_PREFIX}/1/comments/")
     assert response.status_code == 200
@@ -64,6 +151,60 @@ async def test_read_comment(client, test_db_comment):
     assert data["post_id"] == test_comments[0]["post_id"]
 
 
+async def test_read_all_comments_not_modified(
+    client, test_db_comments, mock_comment_data, user_token_1
+):
+    urls = [f"{API_PREFIX}/1/comments/", f"{API_PREFIX}/1/comments/tree/"]
+    etags = [(await client.get(url)).headers["etag"] for url in urls]
+    for url, etag in zip(urls, etags):
+        response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    await client.patch(
+        f"{API_PREFIX}/1/comments/1/",
+        json=mock_comment_data,
+        headers={"Authorization": f"Bearer {user_token_1}"},
+    )
+    for url, etag in zip(urls, etags):
+        response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+    response = await client.get(
+        f"{API_PREFIX}/999/comments/", headers={"If-None-Match": etags[0]}
+    )
+    validate_error(response, 404, "Post not found")
+
+
+async def test_read_comment_not_modified(
+    client, test_db_comment, mock_comment_data, user_token_1
+):
+    response = await client.get(f"{API_PREFIX}/1/comments/1/")
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    for headers in ({"If-None-Match": etag}, {"If-Modified-Since": last_modified}):
+        response = await client.get(f"{API_PREFIX}/1/comments/1/", headers=headers)
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+
+    await client.patch(
+        f"{API_PREFIX}/1/comments/1/",
+        json={"content": "Updated comment content"},
+        headers={"Authorization": f"Bearer {user_token_1}"},
+    )
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/1/", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["content"] == "Updated comment content"
+    assert response.headers["etag"] != etag
+
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/999/", headers={"If-None-Match": etag}
+    )
+    validate_error(response, 404, "Comment not found")
+
+
 async def test_read_comment_not_found(client, test_db_post):
     response = await client.get(f"{API_PREFIX}/1/comments/999/")
     validate_error(response, 404, "Comment not found")
@@ -122,6 +263,20 @@ async def test_update_comment_access_denied(
     validate_error(response, 403, "Access denied")
 
 
+async def test_update_comment_profanity_access_denied(
+    client, test_db_comments, user_token_2
+):
+    response = await client.patch(
+        f"{API_PREFIX}/1/comments/1/",
+        json={"content": "Fuck"},
+        headers={"Authorization": f"Bearer {user_token_2}"},
+    )
+    validate_error(response, 403, "Access denied")
+
+    response = await client.get(f"{API_PREFIX}/1/comments/1/")
+    assert response.json()["content"] == test_comments[0]["content"]
+
+
 async def test_update_comment_post_not_found(
     client, test_db_user, mock_comment_data, user_token_1
 ):
@@ -184,6 +339,71 @@ async def test_get_comments_statistics(client, test_db_comments, user_token_1):
     assert data[0]["banned_comments"] == 2
 
 
+async def test_get_comments_statistics_rollup(client, test_db_post, user_token_1):
+    # Monday and Wednesday of one week, Monday of the next one.
+    days = [datetime(2024, 1, 1, 10), datetime(2024, 1, 3, 12), datetime(2024, 1, 8, 9)]
+    for created_at in days + [days[0].replace(hour=11)]:
+        await add_model(
+            Comment(owner_id=1, post_id=1, content="c", created_at=created_at)
+        )
+    await add_model(
+        Comment(
+            owner_id=1,
+            post_id=1,
+            content="c",
+            status=Status.BANNED,
+            created_at=days[1],
+        )
+    )
+    async with async_session() as db:
+        await CommentStatsDbGateway(db).rebuild()
+        await db.commit()
+
+    url = f"{API_PREFIX}/1/comments-daily-breakdown?date_from=2024-01-01&date_to=2024-01-08"
+    headers = {"Authorization": f"Bearer {user_token_1}"}
+    response = await client.get(url, headers=headers)
+    assert response.json() == [
+        {"date": "2024-01-01", "total_comments": 2, "banned_comments": 0},
+        {"date": "2024-01-03", "total_comments": 2, "banned_comments": 1},
+        {"date": "2024-01-08", "total_comments": 1, "banned_comments": 0},
+    ]
+
+    response = await client.get(url + "&granularity=week", headers=headers)
+    assert response.json() == [
+        {"date": "2024-01-01", "total_comments": 4, "banned_comments": 1},
+        {"date": "2024-01-08", "total_comments": 1, "banned_comments": 0},
+    ]
+
+    response = await client.get(
+        url.replace("2024-01-08", "2024-01-01") + "&granularity=hour", headers=headers
+    )
+    assert response.json() == [
+        {"date": "2024-01-01T10:00:00", "total_comments": 1, "banned_comments": 0},
+        {"date": "2024-01-01T11:00:00", "total_comments": 1, "banned_comments": 0},
+    ]
+
+
+async def test_comments_statistics_updated_incrementally(
+    client, test_db_post, mock_comment_data, user_token_1
+):
+    headers = {"Authorization": f"Bearer {user_token_1}"}
+    response = await client.post(
+        f"{API_PREFIX}/1/comments/", json=mock_comment_data, headers=headers
+    )
+    comment_id = response.json()["id"]
+    await client.post(
+        f"{API_PREFIX}/1/comments/", json={"content": "Fuck"}, headers=headers
+    )
+
+    async with async_session() as db:
+        stats = await db.get(CommentDailyStats, (1, date.today()))
+        assert (stats.total, stats.banned) == (2, 1)
+
+        await client.delete(f"{API_PREFIX}/1/comments/{comment_id}/", headers=headers)
+        await db.refresh(stats)
+        assert (stats.total, stats.banned) == (1, 1)
+
+
 async def test_get_comment_statistics_wrong_date(
     client, test_db_comments, user_token_1
 ):
@@ -192,3 +412,274 @@ async def test_get_comment_statistics_wrong_date(
         headers={"Authorization": f"Bearer {user_token_1}"},
     )
     assert response.status_code == 422
+
+
+async def test_read_all_comments_cursor(client, test_db_post):
+    for i in range(15):
+        await add_model(
+            Comment(owner_id=1, post_id=test_db_post.id, content=f"Comment {i}")
+        )
+
+    response = await client.get(f"{API_PREFIX}/1/comments/", params={"skip": 3})
+    first_page = response.json()
+    assert first_page["total"] == 15
+    assert first_page["comments"][0]["content"] == "Comment 3"
+
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/", params={"cursor": first_page["next_cursor"]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 15
+    assert [c["content"] for c in data["comments"]] == ["Comment 13", "Comment 14"]
+    assert data["next_cursor"] is None
+
+
+async def test_read_all_comments_cached_total(
+    client, test_db_post, mock_comment_data, user_token_1
+):
+    headers = {"Authorization": f"Bearer {user_token_1}"}
+    response = await client.post(
+        f"{API_PREFIX}/1/comments/", json=mock_comment_data, headers=headers
+    )
+    parent_id = response.json()["id"]
+    await client.post(
+        f"{API_PREFIX}/1/comments/",
+        json={**mock_comment_data, "parent_id": parent_id},
+        headers=headers,
+    )
+
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/", params={"total_mode": "cached"}
+    )
+    assert response.json()["total"] == 2
+
+    await client.delete(f"{API_PREFIX}/1/comments/{parent_id}/", headers=headers)
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/", params={"total_mode": "cached"}
+    )
+    assert response.json()["total"] == 0
+
+
+async def add_thread(post_id: int, replies: dict[str, list[str]]) -> dict[str, int]:
+    """Adds comments named by ``replies`` (parent name -> reply names, None
+    for top-level) in breadth-first order and returns their ids by name."""
+    ids: dict[str | None, int | None] = {None: None}
+    pending = [None]
+    while pending:
+        parent = pending.pop(0)
+        for name in replies.get(parent, []):
+            comment = await add_comment(
+                Comment(
+                    owner_id=1,
+                    post_id=post_id,
+                    parent_id=ids[parent],
+                    content=name,
+                )
+            )
+            ids[name] = comment.id
+            pending.append(name)
+    return ids
+
+
+def contents(nodes: list[dict]) -> list[str]:
+    return [node["content"] for node in nodes]
+
+
+async def test_read_comment_tree(client, test_db_post):
+    await add_thread(
+        test_db_post.id,
+        {None: ["a", "b"], "a": ["a1", "a2"], "a1": ["a1x"]},
+    )
+    await add_model(
+        Comment(owner_id=1, post_id=1, content="banned", status=Status.BANNED)
+    )
+
+    response = await client.get(f"{API_PREFIX}/1/comments/tree/")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["next_cursor"] is None
+    assert data["truncated"] is False
+    a, b = data["comments"]
+    assert contents(data["comments"]) == ["a", "b"]
+    assert contents(a["replies"]) == ["a1", "a2"]
+    assert contents(a["replies"][0]["replies"]) == ["a1x"]
+    assert b["replies"] == []
+    assert a["more_replies"] is None and b["more_replies"] is None
+
+
+async def test_read_comment_tree_subtree(client, test_db_post):
+    ids = await add_thread(test_db_post.id, {None: ["a", "b"], "a": ["a1"]})
+
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/", params={"root_id": ids["a"]}
+    )
+    data = response.json()
+    assert contents(data["comments"]) == ["a"]
+    assert contents(data["comments"][0]["replies"]) == ["a1"]
+
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/", params={"root_id": 999}
+    )
+    validate_error(response, 404, "Comment not found")
+
+
+async def test_read_comment_tree_max_children(client, test_db_post):
+    await add_thread(
+        test_db_post.id,
+        {None: ["a", "b", "c"], "a": ["a1", "a2", "a3"]},
+    )
+
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/", params={"max_children": 2}
+    )
+    data = response.json()
+    assert contents(data["comments"]) == ["a", "b"]
+    a = data["comments"][0]
+    assert contents(a["replies"]) == ["a1", "a2"]
+
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/", params={"cursor": a["more_replies"]}
+    )
+    assert contents(response.json()["comments"]) == ["a3"]
+
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/",
+        params={"max_children": 2, "cursor": data["next_cursor"]},
+    )
+    data = response.json()
+    assert contents(data["comments"]) == ["c"]
+    assert data["next_cursor"] is None
+
+
+async def test_read_comment_tree_max_depth(client, test_db_post):
+    await add_thread(test_db_post.id, {None: ["a"], "a": ["a1"], "a1": ["a1x"]})
+
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/", params={"max_depth": 2}
+    )
+    a1 = response.json()["comments"][0]["replies"][0]
+    assert a1["replies"] == []
+    assert a1["more_replies"] is not None
+
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/", params={"cursor": a1["more_replies"]}
+    )
+    assert contents(response.json()["comments"]) == ["a1x"]
+
+
+async def test_read_comment_tree_max_nodes(client, test_db_post):
+    await add_thread(
+        test_db_post.id,
+        {None: ["a", "b"], "a": ["a1", "a2"], "b": ["b1"]},
+    )
+
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/", params={"max_nodes": 3}
+    )
+    data = response.json()
+    assert data["truncated"] is True
+    a, b = data["comments"]
+    assert contents(a["replies"]) == ["a1"]
+    assert b["replies"] == []
+
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/", params={"cursor": a["more_replies"]}
+    )
+    assert contents(response.json()["comments"]) == ["a2"]
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/", params={"cursor": b["more_replies"]}
+    )
+    assert contents(response.json()["comments"]) == ["b1"]
+
+
+async def test_read_comment_tree_max_nodes_interleaved(client, test_db_post):
+    ids = await add_thread(test_db_post.id, {None: ["a", "b"]})
+    for name in ["a1", "b1", "a2", "b2"]:
+        parent_id = ids[name[0]]
+        await add_comment(
+            Comment(owner_id=1, post_id=1, parent_id=parent_id, content=name)
+        )
+
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/", params={"max_nodes": 4}
+    )
+    a, b = response.json()["comments"]
+    assert contents(a["replies"]) == ["a1", "a2"]
+    assert a["more_replies"] is None
+    assert b["replies"] == []
+
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/", params={"cursor": b["more_replies"]}
+    )
+    assert contents(response.json()["comments"]) == ["b1", "b2"]
+
+
+async def test_read_comment_tree_invalid_cursor(client, test_db_post):
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/", params={"cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 422
+
+
+async def test_read_comment_tree_cursor_with_offset(client, test_db_post):
+    await add_thread(test_db_post.id, {None: ["a"], "a": ["a1", "a2", "a3"]})
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/", params={"max_children": 2}
+    )
+    cursor = ReplyCursor.decode(response.json()["comments"][0]["more_replies"])
+    offset = timezone(timedelta(hours=-5))
+    created_at = cursor.after.created_at.replace(tzinfo=UTC).astimezone(offset)
+
+    value = encode_cursor([cursor.parent_id, [created_at.isoformat(), cursor.after.id]])
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/tree/", params={"cursor": value}
+    )
+    assert response.status_code == 200
+    assert contents(response.json()["comments"]) == ["a3"]
+
+
+async def test_read_comment_tree_cursor_id_out_of_range(client, test_db_post):
+    for value in (
+        [2**31, None],
+        [1, ["2024-01-01T00:00:00", 2**31]],
+        [-1, ["2024-01-01T00:00:00", 1]],
+    ):
+        response = await client.get(
+            f"{API_PREFIX}/1/comments/tree/",
+            params={"cursor": encode_cursor(value)},
+        )
+        assert response.status_code == 422
+
+
+async def test_read_comment_tree_post_not_found(client):
+    response = await client.get(f"{API_PREFIX}/999/comments/tree/")
+    validate_error(response, 404, "Post not found")
+
+
+async def test_export_comments(client, test_db_post, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    for i in range(5):
+        await add_model(Comment(owner_id=1, post_id=1, content=f"Comment {i}"))
+    await add_model(
+        Comment(owner_id=1, post_id=1, content="Banned", status=Status.BANNED)
+    )
+
+    response = await client.get(f"{API_PREFIX}/1/comments/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["content"] for line in lines] == [f"Comment {i}" for i in range(5)]
+    assert lines[0]["owner_id"] == 1
+
+
+async def test_export_comments_post_not_found(client):
+    response = await client.get(f"{API_PREFIX}/999/comments/export")
+    validate_error(response, 404, "Post not found")
+
+
+async def test_read_all_comments_page_size_limit(client, test_db_post):
+    response = await client.get(
+        f"{API_PREFIX}/1/comments/", params={"limit": settings.MAX_PAGE_SIZE + 1}
+    )
+    assert response.status_code == 422
@@ -0,0 +1,13 @@
+API_PREFIX = "/api/metrics"
+
+
+async def test_read_metrics(client, mock_user_data):
+    await client.post("/api/auth/sign_up/", json=mock_user_data)
+
+    response = await client.get(f"{API_PREFIX}/")
+    assert response.status_code == 200
+
+    data = response.json()["password_hashing"]
+    assert data["completed"] >= 1
+    assert data["in_flight"] == 0
+    assert data["utilization"] == 0
@@ -1,6 +1,15 @@
+from datetime import timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
 from app.core.security import create_access_token
+from app.models import Post
 from app.models.common.enums.status import Status
-from app.tests.conftest import test_posts, test_users
+from app.repositories.post_gateway import PostDbGateway
+from app.schemas.pagination import Cursor, encode_cursor
+from app.schemas.post import PostDTO
+from app.tests.conftest import add_model, async_session, test_posts, test_users
 from app.tests.error_validator import validate_error
 
 API_PREFIX = "/api/posts"
@@ -52,6 +61,74 @@ async def test_read_post(client, test_db_post):
     assert data["content"] == test_posts[0]["content"]
 
 
+async def test_read_post_encoding(client, test_db_post):
+    response = await client.get(f"{API_PREFIX}/{test_db_post.id}/")
+    assert response.headers["content-type"] == "application/json"
+    expected = PostDTO.model_validate(test_db_post, from_attributes=True)
+    assert response.json() == jsonable_encoder(expected)
+
+    schema = (await client.get("/openapi.json")).json()
+    content = schema["paths"][f"{API_PREFIX}/"]["get"]["responses"]["200"]["content"]
+    assert content["application/json"]["schema"]["$ref"].endswith("/PostsListResultDTO")
+
+
+async def test_read_posts_not_modified(client, test_db_post, mock_post_data):
+    response = await client.get(f"{API_PREFIX}/?limit=10")
+    etag = response.headers["etag"]
+    assert etag != (await client.get(f"{API_PREFIX}/?limit=20")).headers["etag"]
+
+    response = await client.get(
+        f"{API_PREFIX}/?limit=10", headers={"If-None-Match": f"W/{etag}"}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    await client.patch(
+        f"{API_PREFIX}/{test_db_post.id}/",
+        json={**mock_post_data, "content": "Updated"},
+        headers={"Authorization": f"Bearer {create_access_token(1)}"},
+    )
+    response = await client.get(
+        f"{API_PREFIX}/?limit=10", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["posts"][0]["content"] == "Updated"
+    assert response.headers["etag"] != etag
+
+
+async def test_read_post_not_modified(client, test_db_post, mock_post_data):
+    response = await client.get(f"{API_PREFIX}/{test_db_post.id}/")
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    response = await client.get(
+        f"{API_PREFIX}/{test_db_post.id}/", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    response = await client.get(
+        f"{API_PREFIX}/{test_db_post.id}/",
+        headers={"If-Modified-Since": last_modified},
+    )
+    assert response.status_code == 304
+    response = await client.get(
+        f"{API_PREFIX}/{test_db_post.id}/",
+        headers={"If-None-Match": '"other"', "If-Modified-Since": last_modified},
+    )
+    assert response.status_code == 200
+
+    await client.patch(
+        f"{API_PREFIX}/{test_db_post.id}/",
+        json={**mock_post_data, "content": "Updated"},
+        headers={"Authorization": f"Bearer {create_access_token(1)}"},
+    )
+    response = await client.get(
+        f"{API_PREFIX}/{test_db_post.id}/", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["content"] == "Updated"
+
+
 async def test_read_post_not_found(client):
     response = await client.get(f"{API_PREFIX}/999/")
     validate_error(response, 404, "Post not found")
@@ -120,6 +197,30 @@ async def test_delete_post(client, test_db_posts):
     assert data["id"] == 1
 
 
+async def test_delete_post_with_comments(client, test_db_comments):
+    headers = {"Authorization": f"Bearer {create_access_token(1)}"}
+    response = await client.delete(f"{API_PREFIX}/1/", headers=headers)
+    assert response.status_code == 200
+
+    response = await client.get(f"{API_PREFIX}/1/comments/")
+    validate_error(response, 404, "Post not found")
+
+
+async def test_delete_post_purged_later(client, test_db_comments, monkeypatch):
+    monkeypatch.setattr(settings, "POST_PURGE_ASYNC_THRESHOLD", 1)
+    headers = {"Authorization": f"Bearer {create_access_token(1)}"}
+    response = await client.delete(f"{API_PREFIX}/1/", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == Status.DELETED.value
+
+    response = await client.get(f"{API_PREFIX}/1/")
+    validate_error(response, 404, "Post not found")
+    async with async_session() as db:
+        gateway = PostDbGateway(db)
+        assert await gateway.get_deleted_ids() == [1]
+        assert await gateway.get_user_posts(1) == []
+
+
 async def test_delete_post_not_found(client, test_db_user):
     token = create_access_token(1)
     response = await client.delete(
@@ -134,3 +235,136 @@ async def test_delete_post_access_denied(client, test_db_posts):
         f"{API_PREFIX}/1/", headers={"Authorization": f"Bearer {token}"}
     )
     validate_error(response, 403, "Access denied")
+
+
+async def test_read_posts_cursor(client, test_db_user):
+    for i in range(12):
+        await add_model(Post(owner_id=test_db_user.id, content=f"Post {i}"))
+
+    response = await client.get(f"{API_PREFIX}/")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["posts"]) == 10
+    assert data["next_cursor"]
+
+    response = await client.get(
+        f"{API_PREFIX}/", params={"cursor": data["next_cursor"]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [post["content"] for post in data["posts"]] == ["Post 10", "Post 11"]
+    assert data["next_cursor"] is None
+
+
+async def test_read_posts_invalid_cursor(client):
+    response = await client.get(f"{API_PREFIX}/", params={"cursor": "invalid"})
+    validate_error(response, 422)
+
+
+async def test_read_posts_cursor_with_offset(client, test_db_user):
+    for i in range(12):
+        await add_model(Post(owner_id=test_db_user.id, content=f"Post {i}"))
+    response = await client.get(f"{API_PREFIX}/")
+    cursor = Cursor.decode(response.json()["next_cursor"])
+    offset = timezone(timedelta(hours=2))
+    created_at = cursor.created_at.replace(tzinfo=timezone.utc).astimezone(offset)
+
+    response = await client.get(
+        f"{API_PREFIX}/",
+        params={"cursor": encode_cursor([created_at.isoformat(), cursor.id])},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [post["content"] for post in data["posts"]] == ["Post 10", "Post 11"]
+
+
+async def test_read_posts_cursor_id_out_of_range(client):
+    cursor = encode_cursor(["2024-01-01T00:00:00", 2**31])
+    response = await client.get(f"{API_PREFIX}/", params={"cursor": cursor})
+    validate_error(response, 422)
+
+
+async def test_read_posts_cached_total(client, test_db_user, mock_post_data):
+    headers = {"Authorization": f"Bearer {create_access_token(1)}"}
+    await client.post(f"{API_PREFIX}/create/", json=mock_post_data, headers=headers)
+    banned_data = {**mock_post_data, "content": "Fuck"}
+    await client.post(f"{API_PREFIX}/create/", json=banned_data, headers=headers)
+
+    response = await client.get(f"{API_PREFIX}/", params={"total_mode": "cached"})
+    assert response.json()["total"] == 1
+
+    await client.delete(f"{API_PREFIX}/1/", headers=headers)
+    response = await client.get(f"{API_PREFIX}/", params={"total_mode": "cached"})
+    assert response.json()["total"] == 0
+
+
+async def test_read_posts_estimated_total(client, test_db_posts):
+    response = await client.get(f"{API_PREFIX}/", params={"total_mode": "estimated"})
+    assert response.status_code == 200
+    assert isinstance(response.json()["total"], int)
+
+
+async def test_read_post_cached(client, test_db_post, mock_post_data, monkeypatch):
+    response = await client.get(f"{API_PREFIX}/1/")
+    assert response.status_code == 200
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("post lookup is not expected")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(PostDbGateway, "get_by_id", fail)
+        response = await client.get(f"{API_PREFIX}/1/")
+        assert response.json()["content"] == test_posts[0]["content"]
+
+    validate_error(await client.get(f"{API_PREFIX}/999/"), 404, "Post not found")
+    with monkeypatch.context() as patch:
+        patch.setattr(PostDbGateway, "get_by_id", fail)
+        validate_error(await client.get(f"{API_PREFIX}/999/"), 404, "Post not found")
+
+    token = create_access_token(1)
+    mock_post_data["content"] = "Updated content"
+    await client.patch(
+        f"{API_PREFIX}/1/",
+        json=mock_post_data,
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    response = await client.get(f"{API_PREFIX}/1/")
+    assert response.json()["content"] == "Updated content"
+
+
+async def test_create_posts_bulk(client, test_db_user, mock_post_data):
+    token = create_access_token(1)
+    items = [
+        mock_post_data,
+        {**mock_post_data, "content": "Fuck"},
+        {**mock_post_data, "ai_delay_minutes": -1},
+        {"ai_enabled": False},
+        {**mock_post_data, "content": "Last post"},
+    ]
+    response = await client.post(
+        f"{API_PREFIX}/bulk/",
+        json={"items": items},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    posts = data["posts"]
+    assert posts[0]["content"] == mock_post_data["content"]
+    assert posts[1]["status"] == Status.BANNED.value
+    assert posts[2] is None and posts[3] is None
+    assert posts[4]["content"] == "Last post"
+    assert [error["index"] for error in data["errors"]] == [2, 3]
+
+    response = await client.get(f"{API_PREFIX}/", params={"total_mode": "cached"})
+    assert response.json()["total"] == 2
+
+
+async def test_create_posts_bulk_limits(client, test_db_user, mock_post_data):
+    token = create_access_token(1)
+    for items in ([], [mock_post_data] * (settings.BULK_MAX_ITEMS + 1)):
+        response = await client.post(
+            f"{API_PREFIX}/bulk/",
+            json={"items": items},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 422
@@ -1,4 +1,5 @@
-from app.tests.conftest import test_users
+from app.models import User
+from app.tests.conftest import add_model, test_users
 
 API_PREFIX = "/api/users"
 
@@ -22,8 +23,57 @@ async def test_read_user(client, test_db_user):
     assert data["email"] == test_db_user.email
 
 
+async def test_read_users_not_modified(client, mock_user_data):
+    etag = (await client.get(f"{API_PREFIX}/")).headers["etag"]
+    response = await client.get(f"{API_PREFIX}/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    await client.post("/api/auth/sign_up/", json=mock_user_data)
+    response = await client.get(f"{API_PREFIX}/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+
+
+async def test_read_user_not_modified(client, test_db_user):
+    response = await client.get(f"{API_PREFIX}/{test_db_user.id}/")
+    assert response.json()["updated_at"] is not None
+    response = await client.get(
+        f"{API_PREFIX}/{test_db_user.id}/",
+        headers={"If-Modified-Since": response.headers["last-modified"]},
+    )
+    assert response.status_code == 304
+
+
 async def test_read_user_not_found(client):
     response = await client.get(f"{API_PREFIX}/9999/")
     assert response.status_code == 404
     data = response.json()
     assert data["detail"] == "User not found"
+
+
+async def test_read_users_cursor(client):
+    for i in range(11):
+        await add_model(
+            User(username=f"user{i}", email=f"user{i}@example.com", hashed_password="")
+        )
+
+    response = await client.get(f"{API_PREFIX}/")
+    data = response.json()
+    assert len(data["users"]) == 10
+    assert data["total"] == 11
+
+    response = await client.get(
+        f"{API_PREFIX}/", params={"cursor": data["next_cursor"]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [user["username"] for user in data["users"]] == ["user10"]
+    assert data["next_cursor"] is None
+
+
+async def test_read_users_cached_total(client, mock_user_data):
+    await client.post("/api/auth/sign_up/", json=mock_user_data)
+
+    response = await client.get(f"{API_PREFIX}/", params={"total_mode": "cached"})
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
@@ -7,10 +7,13 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from app.api.dependencies import get_db
 from app.core.config import settings
-from app.core.db import Base
-from app.core.security import create_access_token
+from app.core.db import Base, commit
+from app.core.security import create_access_token, token_cache
+from app.core.token_denylist import token_denylist
 from app.main.web import create_app
 from app.models import Comment, Post, User
+from app.repositories.comment_gateway import CommentDbGateway
+from app.repositories.entity_caches import post_cache, user_cache
 from app.tests.api.models import test_comments, test_posts, test_users
 
 async_engine = create_async_engine(settings.TEST_DB_URI, echo=True)
@@ -36,6 +39,10 @@ async def prepare_db():
         await conn.execute(text("DROP TYPE IF EXISTS status CASCADE;"))
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
+    token_denylist.clear()
+    token_cache.clear()
+    post_cache.clear()
+    user_cache.clear()
 
 
 async def override_get_db():
@@ -47,6 +54,7 @@ async def override_get_db():
     )
     async with async_session() as db:
         yield db
+        await commit(db)
 
 
 @pytest.fixture(scope="session")
@@ -96,6 +104,13 @@ async def add_model(model):
     return model
 
 
+async def add_comment(comment: Comment) -> Comment:
+    async with async_session() as db:
+        await CommentDbGateway(db).create(comment)
+        await db.commit()
+    return comment
+
+
 @pytest.fixture
 async def test_db_user():
     return await add_model(User(**test_users[0]))
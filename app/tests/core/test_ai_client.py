@@ -0,0 +1,132 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.ai_client import AIClient
+from app.models.common.enums.ai_roles import AIRoles
+
+COMPLETION = {
+    "id": "chatcmpl-test",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "test-model",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "Thanks for the comment!"},
+            "finish_reason": "stop",
+        }
+    ],
+}
+
+
+class StubServer:
+    """Minimal HTTP/1.1 keep-alive server answering chat completion calls."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.connections = 0
+        self.requests = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def __aenter__(self) -> "StubServer":
+        self._server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def handle(self, reader, writer) -> None:
+        self.connections += 1
+        try:
+            while head := await reader.readuntil(b"\r\n\r\n"):
+                headers = dict(
+                    line.split(": ", 1)
+                    for line in head.decode().split("\r\n")[1:]
+                    if ": " in line
+                )
+                length = int(
+                    headers.get("Content-Length") or headers.get("content-length", 0)
+                )
+                await reader.readexactly(length)
+                self.requests += 1
+
+                status, payload = "200 OK", COMPLETION
+                if self.failures:
+                    self.failures -= 1
+                    status, payload = "503 Service Unavailable", {"error": {}}
+                body = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+def make_client(base_url: str, **kwargs) -> AIClient:
+    options = dict(
+        api_key="test",
+        base_url=base_url,
+        max_connections=2,
+        max_keepalive_connections=2,
+        keepalive_expiry=30,
+        timeout=5,
+        connect_timeout=1,
+        max_retries=0,
+        backoff=0.01,
+        backoff_max=0.01,
+    )
+    options.update(kwargs)
+    return AIClient(**options)
+
+
+MESSAGES = [{"role": AIRoles.USER.value, "content": "First!"}]
+
+
+async def test_connections_reused():
+    async with StubServer() as server:
+        client = make_client(server.url)
+        for _ in range(20):
+            assert await client.complete(MESSAGES, "test-model") == (
+                "Thanks for the comment!"
+            )
+        await asyncio.gather(
+            *(client.complete(MESSAGES, "test-model") for _ in range(20))
+        )
+        await client.close()
+
+    assert server.requests == 40
+    assert server.connections <= 2
+
+
+async def test_retries_with_backoff():
+    async with StubServer(failures=2) as server:
+        client = make_client(server.url, max_retries=2)
+        assert await client.complete(MESSAGES, "test-model")
+        await client.close()
+
+    assert server.requests == 3
+    assert client.stats()["retries"] == 2
+
+
+async def test_gives_up_after_max_retries():
+    async with StubServer(failures=5) as server:
+        client = make_client(server.url, max_retries=1)
+        with pytest.raises(Exception):
+            await client.complete(MESSAGES, "test-model")
+        await client.close()
+
+    assert server.requests == 2
+    assert client.stats()["failures"] == 1
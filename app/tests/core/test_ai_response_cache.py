@@ -0,0 +1,83 @@
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.core import utils
+from app.core.cache import TieredCache
+from app.core.utils import ai_client, ai_response_cache, generate_ai_response
+
+
+class FakeRedis:
+    def __init__(self, fail: bool = False) -> None:
+        self.data = {}
+        self.fail = fail
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError()
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        if self.fail:
+            raise ConnectionError()
+        self.data[key] = value.encode()
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    async def complete(messages, model):
+        calls.append(messages)
+        return f"reply {len(calls)}"
+
+    monkeypatch.setattr(ai_client, "complete", complete)
+    ai_response_cache.clear()
+    yield calls
+    ai_response_cache.clear()
+
+
+async def test_duplicate_history_served_from_cache(llm_calls):
+    first = await generate_ai_response("post", [{"role": "user", "content": "First!"}])
+    second = await generate_ai_response(
+        "post", [{"role": "user", "content": "  first!\n"}]
+    )
+    assert first == second == "reply 1"
+    assert len(llm_calls) == 1
+
+    other = await generate_ai_response(
+        "other post", [{"role": "user", "content": "First!"}]
+    )
+    assert other == "reply 2"
+    assert ai_response_cache.stats()["hit_rate"] == pytest.approx(1 / 3)
+
+
+async def test_cache_disabled(llm_calls, monkeypatch):
+    monkeypatch.setattr(utils.settings, "AI_CACHE_ENABLED", False)
+    history = [{"role": "user", "content": "First!"}]
+    await generate_ai_response("post", history)
+    await generate_ai_response("post", history)
+    assert len(llm_calls) == 2
+
+
+async def test_tiered_cache_redis_tier():
+    redis = FakeRedis()
+    cache = TieredCache("test:", maxsize=10, ttl=60, redis=redis)
+    await cache.set("key", "value")
+    cache.clear()
+
+    assert await cache.get("key") == "value"
+    assert await cache.get("key") == "value"
+    stats = cache.stats()
+    assert stats["redis_hits"] == 1
+    assert stats["hits"] == 1
+
+
+async def test_tiered_cache_redis_down():
+    cache = TieredCache("test:", maxsize=10, ttl=60, redis=FakeRedis(fail=True))
+    await cache.set("key", "value")
+    assert await cache.get("key") == "value"
+    assert await cache.get("missing") is None
+    assert cache.stats()["redis_errors"] == 2
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.db_pool import InstrumentedPool, PoolTelemetry
+
+
+async def test_pool_telemetry():
+    engine = create_async_engine(
+        settings.TEST_DB_URI,
+        poolclass=InstrumentedPool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    telemetry = PoolTelemetry(engine)
+    try:
+        async with engine.connect() as first, engine.connect() as second:
+            await first.execute(text("select 1"))
+            await second.execute(text("select 1"))
+            assert telemetry.stats()["checked_out"] == 2
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+        async with engine.connect() as conn:
+            await conn.execute(text("select 1"))
+
+        stats = telemetry.stats()
+        assert stats["checked_out"] == 0
+        assert stats["max_checked_out"] == 2
+        assert stats["checkouts"] == 3
+        assert stats["overflow_checkouts"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["connects"] == 2
+        assert stats["wait_ms"]["+Inf"] == 3
+
+        await engine.dispose()
+        async with engine.connect() as conn:
+            await conn.execute(text("select 1"))
+        assert telemetry.stats()["checkouts"] == 4
+    finally:
+        await engine.dispose()
+
+
+async def test_pool_telemetry_counts_connect_errors():
+    engine = create_async_engine(
+        "postgresql+asyncpg://postgres@/testdb?host=/nonexistent",
+        poolclass=InstrumentedPool,
+    )
+    telemetry = PoolTelemetry(engine)
+    with pytest.raises(Exception):
+        async with engine.connect():
+            pass
+    assert telemetry.stats()["connect_errors"] == 1
+    assert telemetry.stats()["checkouts"] == 0
+    await engine.dispose()
@@ -0,0 +1,131 @@
+import asyncio
+
+from app.core.entity_cache import EntityCache
+from app.models import Post
+from app.models.common.enums.status import Status
+
+
+async def test_single_flight_and_negative_caching():
+    cache = EntityCache(Post, maxsize=10, ttl=60, negative_ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return Post(id=1, owner_id=2, content="x", status=Status.ACTIVE)
+
+    posts = await asyncio.gather(*(cache.get(1, loader) for _ in range(10)))
+    assert len(calls) == 1
+    assert {post.content for post in posts} == {"x"}
+    assert posts[0].status is Status.ACTIVE
+    assert cache.stats()["coalesced"] == 9
+
+    async def missing():
+        calls.append(1)
+
+    assert await cache.get(2, missing) is None
+    assert await cache.get(2, missing) is None
+    assert len(calls) == 2
+    assert cache.stats()["negative_hits"] == 1
+
+    await cache.invalidate(1)
+    await cache.get(1, loader)
+    assert len(calls) == 3
+
+
+class SharedRedis:
+    """The commands TieredCache uses, enough to share one store between
+    caches; ``eval`` only knows SET_IF_GENERATION."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        value = self.data.get(key)
+        return None if value is None else str(value).encode()
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def eval(self, script, numkeys, key, generation_key, value, ex, expected):
+        if self.data.get(generation_key, 0) != expected:
+            return 0
+        self.data[key] = value
+        return 1
+
+    def pipeline(self, transaction=True):
+        return SharedRedisPipeline(self)
+
+
+class SharedRedisPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    def delete(self, key):
+        self.commands.append(lambda data: data.pop(key, None))
+
+    def incr(self, key):
+        self.commands.append(lambda data: data.update({key: data.get(key, 0) + 1}))
+
+    def expire(self, key, ex):
+        pass
+
+    async def execute(self):
+        for command in self.commands:
+            command(self.redis.data)
+
+
+def post_loader(content, started=None, release=None):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        if started is not None:
+            started.set()
+            await release.wait()
+        return Post(id=1, owner_id=2, content=content, status=Status.ACTIVE)
+
+    return loader, calls
+
+
+async def test_invalidate_during_load_is_not_cached():
+    cache = EntityCache(Post, maxsize=10, ttl=60, negative_ttl=60)
+    started, release = asyncio.Event(), asyncio.Event()
+    old, _ = post_loader("old", started, release)
+    reading = asyncio.create_task(cache.get(1, old))
+    await started.wait()
+
+    await cache.invalidate(1)
+    new, calls = post_loader("new")
+    assert (await cache.get(1, new)).content == "new"
+    release.set()
+    assert (await reading).content == "old"
+
+    assert (await cache.get(1, new)).content == "new"
+    assert len(calls) == 1
+
+
+async def test_invalidate_from_another_worker_during_load():
+    redis = SharedRedis()
+    reader = EntityCache(Post, maxsize=10, ttl=60, negative_ttl=60, redis=redis)
+    writer = EntityCache(Post, maxsize=10, ttl=60, negative_ttl=60, redis=redis)
+    started, release = asyncio.Event(), asyncio.Event()
+    old, _ = post_loader("old", started, release)
+    reading = asyncio.create_task(reader.get(1, old))
+    await started.wait()
+
+    await writer.invalidate(1)
+    release.set()
+    assert (await reading).content == "old"
+
+    new, calls = post_loader("new")
+    assert (await reader.get(1, new)).content == "new"
+    assert (await writer.get(1, new)).content == "new"
+    assert len(calls) == 1
@@ -0,0 +1,52 @@
+import pytest
+from better_profanity import profanity
+
+from app.core.profanity import ProfanityFilter
+from benchmarks.corpus import make_corpus
+
+profanity_filter = ProfanityFilter(offload_threshold=100)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "hello world",
+        "you are an @$$ hole",
+        "b1tch please",
+        "Sh*t happens",
+        "fvck that",
+        "blow job here",
+        "blowjob here",
+        "f.u.c.k this",
+        "doggy-style now",
+        "2 girls 1 cup now",
+        "fuck's sake",
+        "I like class and assassin movies",
+    ],
+)
+def test_matches_better_profanity(text):
+    assert profanity_filter.contains_profanity(text) == profanity.contains_profanity(
+        text
+    )
+
+
+@pytest.mark.parametrize("text", ["sh!t", "cat s_h_i_t", "l*!n"])
+def test_stricter_than_better_profanity(text):
+    assert profanity_filter.contains_profanity(text)
+    assert not profanity.contains_profanity(text)
+
+
+def test_corpus_parity():
+    texts = make_corpus(150, 1, 40, profane_share=0.3, seed=42)
+    expected = [profanity.contains_profanity(text) for text in texts]
+    assert profanity_filter.contains_profanity_batch(texts) == expected
+    assert any(expected) and not all(expected)
+
+
+async def test_async_offload():
+    short, long = "sh1t happens", "fine words " * 50 + "sh1t"
+    assert await profanity_filter.contains_profanity_async(short)
+    assert await profanity_filter.contains_profanity_async(long)
+    assert await profanity_filter.contains_profanity_batch_async(
+        ["hello", long, "fine"]
+    ) == [False, True, False]
@@ -0,0 +1,20 @@
+import time
+
+from redis.exceptions import ConnectionError
+
+from app.core.token_denylist import TokenDenylist
+
+
+class FailingRedis:
+    async def set(self, key, value, ex=None):
+        raise ConnectionError()
+
+    async def exists(self, key):
+        raise ConnectionError()
+
+
+async def test_revoke_survives_redis_errors():
+    denylist = TokenDenylist(FailingRedis())
+    await denylist.revoke("token", time.time() + 60)
+    assert await denylist.contains("token")
+    assert not await denylist.contains("other")
@@ -0,0 +1,32 @@
+from sqlalchemy import select
+
+from app.core.db import after_commit, commit
+from app.models import User
+from app.tests.api.models import test_users
+from app.tests.conftest import async_session
+
+
+async def test_after_commit_runs_only_on_commit():
+    calls = []
+
+    async def callback():
+        calls.append(1)
+
+    async with async_session() as db:
+        db.add(User(**test_users[0]))
+        after_commit(db, callback)
+        await db.flush()
+        await db.rollback()
+    assert calls == []
+
+    async with async_session() as db:
+        user = User(**test_users[0])
+        db.add(user)
+        await db.flush()
+        assert user.created_at is not None
+        after_commit(db, callback)
+        await commit(db)
+    assert calls == [1]
+
+    async with async_session() as db:
+        assert await db.scalar(select(User.id)) == user.id
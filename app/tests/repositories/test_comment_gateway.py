@@ -0,0 +1,67 @@
+from app.models import Comment
+from app.models.common.enums.status import Status
+from app.repositories.comment_gateway import CommentDbGateway
+from app.tests.conftest import add_comment, async_session
+
+
+async def add_replies(parent_id: int | None, *ids: int, **data) -> None:
+    for id_ in ids:
+        await add_comment(
+            Comment(
+                id=id_, owner_id=1, post_id=1, parent_id=parent_id, content="", **data
+            )
+        )
+
+
+async def get_comment(db, comment_id: int) -> Comment:
+    return await CommentDbGateway(db).get_by_id(1, comment_id)
+
+
+async def test_path_set_on_create(test_db_post):
+    await add_replies(None, 1)
+    await add_replies(1, 2)
+    await add_replies(2, 3)
+
+    async with async_session() as db:
+        comment = await get_comment(db, 3)
+    assert comment.path == "0000000001.0000000002."
+    assert comment.ancestor_ids == [1, 2]
+    assert comment.subtree_path == "0000000001.0000000002.0000000003."
+
+
+async def test_subtree_and_ancestors(test_db_post):
+    await add_replies(None, 1, 10)
+    await add_replies(1, 2, 3)
+    await add_replies(2, 4)
+    await add_replies(3, 5, status=Status.BANNED)
+    await add_replies(10, 11)
+
+    async with async_session() as db:
+        gateway = CommentDbGateway(db)
+        root = await get_comment(db, 1)
+        subtree = await gateway.get_subtree(root)
+        assert [comment.id for comment in subtree] == [2, 3, 4]
+        assert await gateway.count_active_descendants(root) == 3
+        assert await gateway.count_active_descendants(await get_comment(db, 4)) == 0
+
+        ancestors = await gateway.get_ancestors(await get_comment(db, 4))
+        assert [comment.id for comment in ancestors] == [1, 2]
+        assert await gateway.get_ancestors(root) == []
+
+
+async def test_delete_owned_removes_subtree(test_db_post):
+    await add_replies(None, 1, 10)
+    await add_replies(1, 2)
+    await add_replies(2, 3)
+    await add_replies(10, 11)
+
+    async with async_session() as db:
+        gateway = CommentDbGateway(db)
+        deleted = await gateway.delete_owned(1, 1, 1)
+        await db.commit()
+        assert deleted[0].id == 1
+        assert sorted(comment.id for comment in deleted) == [1, 2, 3]
+        assert [c.id for c in await gateway.get_by_ids(1, [1, 2, 3, 10, 11])] == [
+            10,
+            11,
+        ]
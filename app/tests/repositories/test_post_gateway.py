@@ -0,0 +1,30 @@
+from sqlalchemy import func, select
+
+from app.models import Comment, Post
+from app.repositories.post_gateway import PostDbGateway
+from app.tests.conftest import add_comment, async_session
+
+
+async def test_purge_deletes_replies_first(test_db_post):
+    for id_, parent_id in [(1, None), (2, 1), (3, 2), (4, 3), (5, None), (6, 5)]:
+        await add_comment(
+            Comment(id=id_, owner_id=1, post_id=1, parent_id=parent_id, content="")
+        )
+
+    async with async_session() as db:
+        gateway = PostDbGateway(db)
+        await gateway.mark_deleted(await db.get(Post, 1))
+        assert await gateway.count_comments(1, 10) == 6
+        assert await gateway.count_comments(1, 3) == 3
+
+        # 6 and 4 have the greatest paths; no comment goes before its replies.
+        assert not await gateway.purge(1, 2)
+        remaining = await db.scalars(select(Comment.id).order_by(Comment.id))
+        assert remaining.all() == [1, 2, 3, 5]
+
+        assert not await gateway.purge(1, 2)
+        assert await gateway.count_comments(1, 10) == 2
+        assert not await gateway.purge(1, 2)
+        assert await gateway.purge(1, 2)
+        assert await gateway.count_comments(1, 10) == 0
+        assert await db.scalar(select(func.count()).select_from(Post)) == 0
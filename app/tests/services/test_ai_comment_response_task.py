@@ -0,0 +1,115 @@
+from sqlalchemy import select
+
+from app.models import Comment
+from app.models.common.enums.ai_roles import AIRoles
+from app.models.common.enums.status import Status
+from app.repositories.comment_gateway import CommentDbGateway
+from app.schemas.comment import CreateAICommentDTO
+from app.services import ai_comment_response_task
+from app.services.ai_comment_response_task import (
+    generate_ai_replies,
+    parse_comments_history,
+)
+from app.tests.conftest import add_comment, async_session
+
+
+async def add_thread(replies: list[dict]) -> None:
+    parent_id = None
+    for id_, reply in enumerate(replies, start=10):
+        await add_comment(
+            Comment(id=id_, post_id=1, parent_id=parent_id, content=f"c{id_}", **reply)
+        )
+        parent_id = id_
+
+
+async def get_history(comment_id: int, max_depth: int = 30, max_tokens: int = 4000):
+    async with async_session() as db:
+        chain = await CommentDbGateway(db).get_reply_chain(1, comment_id, max_depth)
+    return chain, parse_comments_history(chain, max_tokens) if chain else []
+
+
+async def test_history_single_query(test_db_posts):
+    await add_thread(
+        [
+            {"owner_id": 1},
+            {"owner_id": 2},
+            {"owner_id": 1, "is_ai": True},
+            {"owner_id": 2},
+            {"owner_id": 1, "is_ai": True},
+            {"owner_id": 2},
+        ]
+    )
+
+    chain, history = await get_history(15)
+    assert [comment.id for comment in chain] == [15, 14, 13, 12, 11]
+    assert history == [
+        {"role": AIRoles.USER.value, "content": "c11"},
+        {"role": AIRoles.ASSISTANT.value, "content": "c12"},
+        {"role": AIRoles.USER.value, "content": "c13"},
+        {"role": AIRoles.ASSISTANT.value, "content": "c14"},
+        {"role": AIRoles.USER.value, "content": "c15"},
+    ]
+
+
+async def test_history_stops_at_banned_comment(test_db_posts):
+    await add_thread(
+        [{"owner_id": 2}, {"owner_id": 2, "status": Status.BANNED}, {"owner_id": 2}]
+    )
+
+    chain, history = await get_history(12)
+    assert [comment.id for comment in chain] == [12]
+
+
+async def test_history_limits(test_db_posts):
+    await add_thread([{"owner_id": 2} for _ in range(10)])
+
+    chain, history = await get_history(19, max_depth=4)
+    assert [comment.id for comment in chain] == [19, 18, 17, 16]
+
+    chain, history = await get_history(19, max_tokens=1)
+    assert history == [{"role": AIRoles.USER.value, "content": "c19"}]
+
+
+async def test_history_missing_comment(test_db_post):
+    chain, history = await get_history(999)
+    assert chain == []
+
+
+async def test_replies_coalesced_per_chain(test_db_posts, monkeypatch):
+    histories = []
+
+    async def generate(post, history):
+        histories.append([message["content"] for message in history])
+        return f"reply {len(histories)}"
+
+    monkeypatch.setattr(ai_comment_response_task, "generate_ai_response", generate)
+    # Two AI replies to comment 10 start two branches of its thread; the user
+    # answers the first one twice and the second one once.
+    for id_, parent_id, reply in [
+        (10, None, {"owner_id": 2}),
+        (11, 10, {"owner_id": 1, "is_ai": True}),
+        (12, 10, {"owner_id": 1, "is_ai": True}),
+        (13, 11, {"owner_id": 2}),
+        (14, 12, {"owner_id": 2}),
+        (15, 11, {"owner_id": 2}),
+    ]:
+        await add_comment(
+            Comment(id=id_, post_id=1, parent_id=parent_id, content=f"c{id_}", **reply)
+        )
+
+    await generate_ai_replies(
+        [
+            CreateAICommentDTO(post_id=1, parent_id=id_, user_id=2, thread_id=10)
+            for id_ in (13, 14, 15)
+        ]
+    )
+
+    assert histories == [["c10", "c11", "c13", "c15"], ["c10", "c12", "c14"]]
+    async with async_session() as db:
+        replies = await db.scalars(select(Comment).where(Comment.is_ai))
+        assert {(reply.parent_id, reply.content) for reply in replies} == {
+            (10, "c11"),
+            (10, "c12"),
+            (15, "reply 1"),
+            (14, "reply 2"),
+        }
@@ -0,0 +1,117 @@
+import asyncio
+
+from app.schemas.comment import CreateAICommentDTO
+from app.services.common.ai_reply_dispatcher import AIReplyDispatcher
+
+
+class FakeHandler:
+    def __init__(self) -> None:
+        self.batches = []
+        self.running = 0
+        self.max_running = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, dtos: list[CreateAICommentDTO]) -> None:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await self.release.wait()
+        self.batches.append([dto.parent_id for dto in dtos])
+        self.running -= 1
+
+
+async def wait_idle(dispatcher: AIReplyDispatcher) -> None:
+    while dispatcher.stats()["queue_depth"] or dispatcher.stats()["in_flight"]:
+        await asyncio.sleep(0.01)
+
+
+async def test_dispatcher_limits_concurrency():
+    handler = FakeHandler()
+    dispatcher = AIReplyDispatcher(handler, max_concurrency=2, rate=0, burst=1)
+    for user_id in range(6):
+        await dispatcher.submit(
+            CreateAICommentDTO(post_id=1, parent_id=user_id, user_id=user_id)
+        )
+    await asyncio.sleep(0.05)
+    assert handler.running == 2
+    assert dispatcher.stats()["queue_depth"] == 4
+
+    handler.release.set()
+    await wait_idle(dispatcher)
+    await dispatcher.close()
+
+    assert handler.max_running == 2
+    assert sorted(parent_id for batch in handler.batches for parent_id in batch) == [
+        0,
+        1,
+        2,
+        3,
+        4,
+        5,
+    ]
+    stats = dispatcher.stats()
+    assert stats["completed"] == 6
+    assert stats["latency_p99_ms"] >= stats["latency_p50_ms"] > 0
+
+
+async def test_dispatcher_coalesces_pending_replies():
+    handler = FakeHandler()
+    dispatcher = AIReplyDispatcher(handler, max_concurrency=1, rate=0, burst=1)
+    await dispatcher.submit(
+        CreateAICommentDTO(post_id=1, parent_id=1, user_id=7, thread_id=1)
+    )
+    await asyncio.sleep(0.01)
+    for parent_id in (2, 3, 4):
+        await dispatcher.submit(
+            CreateAICommentDTO(post_id=1, parent_id=parent_id, user_id=7, thread_id=1)
+        )
+    # Another thread of the same post, another post, and a job without a thread.
+    await dispatcher.submit(
+        CreateAICommentDTO(post_id=1, parent_id=5, user_id=7, thread_id=5)
+    )
+    await dispatcher.submit(
+        CreateAICommentDTO(post_id=2, parent_id=6, user_id=7, thread_id=1)
+    )
+    await dispatcher.submit(CreateAICommentDTO(post_id=1, parent_id=7, user_id=7))
+
+    handler.release.set()
+    await wait_idle(dispatcher)
+    await dispatcher.close()
+
+    assert handler.batches == [[1], [2, 3, 4], [5], [6], [7]]
+    assert dispatcher.stats()["coalesced"] == 2
+
+
+async def test_dispatcher_close_returns_waiting_jobs():
+    handler = FakeHandler()
+    dispatcher = AIReplyDispatcher(handler, max_concurrency=1, rate=0, burst=1)
+    for parent_id in range(3):
+        await dispatcher.submit(CreateAICommentDTO(post_id=1, parent_id=parent_id))
+    await asyncio.sleep(0.01)
+
+    closing = asyncio.create_task(dispatcher.close())
+    await asyncio.sleep(0.01)
+    handler.release.set()
+    undrained = await closing
+
+    assert handler.batches == [[0]]
+    assert [dto.parent_id for dto in undrained] == [1, 2]
+    assert dispatcher.stats()["queue_depth"] == 0
+
+    await dispatcher.submit(CreateAICommentDTO(post_id=1, parent_id=1))
+    await wait_idle(dispatcher)
+    assert handler.batches == [[0], [1]]
+    await dispatcher.close()
+
+
+async def test_dispatcher_rate_limit():
+    handler = FakeHandler()
+    handler.release.set()
+    dispatcher = AIReplyDispatcher(handler, max_concurrency=10, rate=50, burst=1)
+    started = asyncio.get_running_loop().time()
+    for parent_id in range(5):
+        await dispatcher.submit(CreateAICommentDTO(post_id=1, parent_id=parent_id))
+    await wait_idle(dispatcher)
+    await dispatcher.close()
+
+    assert len(handler.batches) == 5
+    assert asyncio.get_running_loop().time() - started >= 4 / 50
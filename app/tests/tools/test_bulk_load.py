@@ -0,0 +1,149 @@
+import json
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.models import Comment, Post, User
+from app.models.common.enums.status import Status
+from app.repositories.counter_gateway import (
+    ACTIVE_POSTS,
+    POSTS_VERSION,
+    USERS_TOTAL,
+    CounterDbGateway,
+    post_comments_key,
+    post_comments_version_key,
+)
+from app.tests.conftest import add_model, async_session, test_users
+from app.tools.bulk_load import Synthetic, read_records, run
+
+
+async def seed_counters():
+    # As the migration that added the counters did.
+    async with async_session() as db:
+        await CounterDbGateway(db).increment_many({USERS_TOTAL: 1, ACTIVE_POSTS: 0})
+        await db.commit()
+
+
+async def test_load_remaps_ids(tmp_path, test_db_user):
+    await seed_counters()
+    users = tmp_path / "users.csv"
+    users.write_text(
+        "id,username,email,hashed_password\n"
+        "1,legacy1,legacy1@example.com,x\n"
+        "7,legacy7,legacy7@example.com,x\n"
+        "7,duplicate,duplicate@example.com,x\n"
+    )
+    posts = tmp_path / "posts.ndjson"
+    posts.write_text(
+        "\n".join(
+            json.dumps(post)
+            for post in [
+                {
+                    "id": 1,
+                    "owner_id": 7,
+                    "content": "Legacy post",
+                    "created_at": "2020-01-01T10:00:00+02:00",
+                },
+                {"id": 2, "owner_id": 99, "content": "Unknown owner"},
+            ]
+        )
+    )
+    comments = tmp_path / "comments.ndjson"
+    comments.write_text(
+        "\n".join(
+            json.dumps(comment)
+            for comment in [
+                {"id": 5, "owner_id": 1, "post_id": 1, "content": "Root"},
+                {"id": 6, "owner_id": 7, "post_id": 1, "parent_id": 5, "content": "A"},
+                {"id": 8, "owner_id": 1, "post_id": 1, "parent_id": 6, "content": "B"},
+                {"id": 9, "owner_id": 1, "post_id": 1, "parent_id": 42, "content": ""},
+                {"id": 10, "owner_id": 1, "post_id": 2, "content": "Lost post"},
+                {
+                    "id": 11,
+                    "owner_id": 1,
+                    "post_id": 1,
+                    "content": "Banned",
+                    "status": "banned",
+                },
+            ]
+        )
+    )
+
+    report = await run(
+        settings.TEST_DB_URI,
+        users=read_records(str(users)),
+        posts=read_records(str(posts)),
+        comments=read_records(str(comments)),
+        batch_size=2,
+    )
+    assert report["users"]["rows"] == 2
+    assert report["users"]["skipped"] == 1
+    assert report["posts"]["skipped"] == 1
+    assert report["comments"]["rows"] == 4
+    assert report["comments"]["skipped"] == 2
+
+    async with async_session() as db:
+        owner = await db.scalar(select(User).where(User.username == "legacy7"))
+        assert owner.id != 7 and owner.id != test_users[0]["id"]
+        post = await db.scalar(select(Post).where(Post.content == "Legacy post"))
+        assert post.owner_id == owner.id
+        assert post.created_at == datetime(2020, 1, 1, 8)
+
+        result = await db.scalars(
+            select(Comment).where(Comment.post_id == post.id).order_by(Comment.id)
+        )
+        root, a, b, banned = result.all()
+        assert (a.parent_id, b.parent_id) == (root.id, a.id)
+        assert b.path == root.subtree_path + f"{a.id:010d}."
+        assert banned.status == Status.BANNED
+
+        counters = CounterDbGateway(db)
+        assert await counters.get(post_comments_key(post.id)) == 3
+        assert await counters.get("users") == 3
+        assert await counters.get(POSTS_VERSION) == 1
+        assert await counters.get(post_comments_version_key(post.id)) == 1
+
+    # The application keeps inserting after the import without id clashes.
+    await add_model(
+        User(username="after", email="after@example.com", hashed_password="x")
+    )
+
+
+async def test_generate(test_db_user):
+    synthetic = Synthetic(users=5, posts=10, comments=300, max_depth=3, seed=1)
+    report = await run(
+        settings.TEST_DB_URI,
+        users=synthetic.users("x"),
+        posts=synthetic.posts(),
+        comments=synthetic.comments(),
+        batch_size=100,
+    )
+    assert report["comments"]["rows"] == 300
+
+    async with async_session() as db:
+        depth = func.length(Comment.path) / 11 + 1
+        assert await db.scalar(select(func.max(depth))) == 3
+        assert await db.scalar(
+            select(func.count()).where(Comment.parent_id.is_not(None))
+        )
+
+
+async def test_load_users_only(test_db_post):
+    await seed_counters()
+    user = {
+        "id": 1,
+        "username": "new",
+        "email": "new@example.com",
+        "hashed_password": "x",
+    }
+    report = await run(settings.TEST_DB_URI, users=[user])
+    assert report["users"]["rows"] == 1
+
+    async with async_session() as db:
+        counters = CounterDbGateway(db)
+        assert await counters.get(USERS_TOTAL) == 2
+        # Posts and comments are left alone.
+        assert await counters.get(ACTIVE_POSTS) == 0
+        assert await counters.get(POSTS_VERSION) is None
+        assert await counters.get(post_comments_key(test_db_post.id)) is None
@@ -0,0 +1,606 @@
+"""Bulk import of users, posts and comments through COPY.
+
+Streams rows from NDJSON (one object per line) or CSV files, or from a
+synthetic forum generator, into the database in batches of COPY. Each batch
+is copied into a temporary staging table and inserted from there by one
+statement: source ids are replaced by fresh ones drawn from the table
+sequences, recorded in a temporary table rather than in memory, owner, post
+and parent references are remapped through it and comment paths are built.
+A row can only reference rows that appear earlier in the same import, and a
+source id is only loaded once; rows that break either rule are skipped. The
+whole import is one transaction, finished by adding the loaded rows to the
+counters and daily stats.
+
+    python -m app.tools.bulk_load load --users users.ndjson --posts posts.csv \\
+        --comments comments.ndjson
+    python -m app.tools.bulk_load generate --users 10000 --posts 100000 \\
+        --comments 5000000 --max-depth 8 --reply-share 0.6
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import random
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from asyncpg import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.common.enums.status import Status
+
+COLUMNS = {
+    "users": ["id", "username", "email", "hashed_password", "created_at"],
+    "posts": [
+        "id",
+        "owner_id",
+        "content",
+        "status",
+        "ai_enabled",
+        "ai_delay_minutes",
+        "created_at",
+    ],
+    "comments": [
+        "id",
+        "owner_id",
+        "post_id",
+        "parent_id",
+        "content",
+        "status",
+        "is_ai",
+        "created_at",
+    ],
+}
+
+# Columns holding source ids of other rows.
+REFERENCES = {
+    "users": [],
+    "posts": ["owner_id"],
+    "comments": ["owner_id", "post_id", "parent_id"],
+}
+
+# Source id -> new id of every loaded row, for remapping references.
+SOURCE_IDS_SQL = """
+CREATE TEMP TABLE source_ids (
+    tbl text, source_id text, new_id integer, PRIMARY KEY (tbl, source_id)
+) ON COMMIT DROP
+"""
+
+
+def staging_sql(table: str) -> str:
+    """A temporary table for the rows of a batch: the columns of ``table``
+    with source ids as text, and the position of each row in the batch."""
+    columns = [
+        f"NULL::text AS {column}" if column in REFERENCES[table] else column
+        for column in COLUMNS[table][1:]
+    ]
+    return f"""
+    CREATE TEMP TABLE staging_{table} ON COMMIT DROP AS
+    SELECT NULL::integer AS position, NULL::text AS source_id, {", ".join(columns)}
+    FROM {table} WITH NO DATA
+    """
+
+
+def is_new(table: str) -> str:
+    """Whether the source id of a staged row was neither loaded before nor
+    appears earlier in the batch."""
+    return f"""
+    (
+        SELECT true FROM source_ids
+        WHERE tbl = '{table}' AND source_id = staging.source_id
+    ) IS NULL
+    AND NOT EXISTS (
+        SELECT FROM staging_{table} earlier
+        WHERE earlier.source_id = staging.source_id
+        AND earlier.position < staging.position
+    )
+    """
+
+
+def source_id_of(table: str, column: str) -> str:
+    # One lookup per row keeps to the primary key of source_ids, however
+    # large it grows.
+    return f"""
+    (
+        SELECT new_id FROM source_ids
+        WHERE tbl = '{table}' AND source_id = staging.{column}
+    )
+    """
+
+
+# Loads a staged batch: gives new ids to the rows whose references resolve,
+# records them in source_ids and inserts the rows with their references
+# remapped. Returns the number of rows inserted.
+LOAD_SQL = {
+    "users": f"""
+    WITH new AS (
+        SELECT *, nextval(pg_get_serial_sequence('users', 'id'))::integer AS id
+        FROM staging_users staging
+        WHERE {is_new("users")}
+    ), mapped AS (
+        INSERT INTO source_ids (tbl, source_id, new_id)
+        SELECT 'users', source_id, id FROM new
+    ), inserted AS (
+        INSERT INTO users (id, username, email, hashed_password, created_at)
+        SELECT id, username, email, hashed_password, created_at FROM new
+        RETURNING 1
+    )
+    SELECT count(*) FROM inserted
+    """,
+    "posts": f"""
+    WITH resolved AS (
+        SELECT *, {source_id_of("users", "owner_id")} AS owner
+        FROM staging_posts staging
+        WHERE {is_new("posts")}
+    ), new AS (
+        SELECT *, nextval(pg_get_serial_sequence('posts', 'id'))::integer AS id
+        FROM resolved
+        WHERE owner IS NOT NULL
+    ), mapped AS (
+        INSERT INTO source_ids (tbl, source_id, new_id)
+        SELECT 'posts', source_id, id FROM new
+    ), inserted AS (
+        INSERT INTO posts (
+            id, owner_id, content, status, ai_enabled, ai_delay_minutes, created_at
+        )
+        SELECT id, owner, content, status, ai_enabled, ai_delay_minutes, created_at
+        FROM new
+        RETURNING 1
+    )
+    SELECT count(*) FROM inserted
+    """,
+    # Top-level comments and replies to earlier batches start the trees, and
+    # replies within the batch follow their parents; paths are built on the
+    # way, so they never need a pass of their own.
+    "comments": f"""
+    WITH RECURSIVE resolved AS (
+        SELECT position, source_id, parent_id AS parent_source,
+               {source_id_of("users", "owner_id")} AS owner,
+               {source_id_of("posts", "post_id")} AS post,
+               {source_id_of("comments", "parent_id")} AS parent
+        FROM staging_comments staging
+        WHERE {is_new("comments")}
+    ), tree (position, source_id, id, parent_id, path) AS (
+        SELECT position, source_id,
+               nextval(pg_get_serial_sequence('comments', 'id'))::integer, parent,
+               coalesce((
+                   SELECT path || lpad(id::text, 10, '0') || '.'
+                   FROM comments WHERE id = resolved.parent
+               ), '')
+        FROM resolved
+        WHERE owner IS NOT NULL AND post IS NOT NULL
+        AND (parent_source IS NULL OR parent IS NOT NULL)
+        UNION ALL
+        SELECT resolved.position, resolved.source_id,
+               nextval(pg_get_serial_sequence('comments', 'id'))::integer, tree.id,
+               tree.path || lpad(tree.id::text, 10, '0') || '.'
+        FROM resolved
+        JOIN tree ON resolved.parent_source = tree.source_id
+        AND resolved.position > tree.position
+        WHERE owner IS NOT NULL AND post IS NOT NULL AND parent IS NULL
+    ), mapped AS (
+        INSERT INTO source_ids (tbl, source_id, new_id)
+        SELECT 'comments', source_id, id FROM tree
+    ), inserted AS (
+        INSERT INTO comments (
+            id, owner_id, post_id, parent_id, content, status, is_ai, created_at,
+            path
+        )
+        SELECT tree.id, owner, post, tree.parent_id, content, status, is_ai,
+               created_at, tree.path
+        FROM tree
+        JOIN resolved USING (position)
+        JOIN staging_comments USING (position)
+        RETURNING 1
+    )
+    SELECT count(*) FROM inserted
+    """,
+}
+
+# Run after an import that loaded rows into the table, on those rows only.
+# Counters are kept by increments, so the loaded rows are added to them, and
+# versions only ever move forward, or clients would revalidate stale copies
+# against a version seen before; see app.api.conditional.
+FINALIZE_SQL = {
+    "users": [
+        """
+        INSERT INTO counters (name, value)
+        SELECT 'users', count(*) FROM source_ids WHERE tbl = 'users'
+        UNION ALL
+        SELECT 'users:version', 1
+        ON CONFLICT (name) DO UPDATE SET value = counters.value + excluded.value
+        """,
+    ],
+    "posts": [
+        """
+        INSERT INTO counters (name, value)
+        SELECT 'posts:active', count(*)
+        FROM source_ids JOIN posts ON posts.id = source_ids.new_id
+        WHERE tbl = 'posts' AND status = 'ACTIVE'
+        UNION ALL
+        SELECT 'posts:version', 1
+        ON CONFLICT (name) DO UPDATE SET value = counters.value + excluded.value
+        """,
+    ],
+    "comments": [
+        """
+        INSERT INTO counters (name, value)
+        SELECT 'posts:' || post_id || ':comments:active',
+               count(*) FILTER (WHERE status = 'ACTIVE')
+        FROM source_ids JOIN comments ON comments.id = source_ids.new_id
+        WHERE tbl = 'comments'
+        GROUP BY post_id
+        UNION ALL
+        SELECT DISTINCT 'posts:' || post_id || ':comments:version', 1
+        FROM source_ids JOIN comments ON comments.id = source_ids.new_id
+        WHERE tbl = 'comments'
+        ON CONFLICT (name) DO UPDATE SET value = counters.value + excluded.value
+        """,
+        """
+        INSERT INTO comment_daily_stats (post_id, day, total, banned)
+        SELECT post_id, date(created_at), count(*),
+               count(*) FILTER (WHERE status = 'BANNED')
+        FROM source_ids JOIN comments ON comments.id = source_ids.new_id
+        WHERE tbl = 'comments'
+        GROUP BY post_id, date(created_at)
+        ON CONFLICT (post_id, day) DO UPDATE
+        SET total = comment_daily_stats.total + excluded.total,
+            banned = comment_daily_stats.banned + excluded.banned
+        """,
+    ],
+}
+
+
+class BulkLoader:
+    """Copies rows of one import into the database over ``conn``."""
+
+    def __init__(self, conn: Connection, batch_size: int) -> None:
+        self.conn = conn
+        self.batch_size = batch_size
+        self.now = datetime.now()
+        self.report: dict[str, dict[str, float]] = {}
+
+    async def create_temp_tables(self) -> None:
+        await self.conn.execute(SOURCE_IDS_SQL)
+        for table in COLUMNS:
+            await self.conn.execute(staging_sql(table))
+            await self.conn.execute(f"CREATE INDEX ON staging_{table} (source_id)")
+
+    async def load_users(self, records: Iterable[dict]) -> None:
+        await self._load("users", records, self._user_row)
+
+    async def load_posts(self, records: Iterable[dict]) -> None:
+        await self._load("posts", records, self._post_row)
+
+    async def load_comments(self, records: Iterable[dict]) -> None:
+        await self._load("comments", records, self._comment_row)
+
+    async def _load(
+        self,
+        table: str,
+        records: Iterable[dict],
+        to_row: Callable[[dict], tuple],
+    ) -> None:
+        started = time.perf_counter()
+        loaded = skipped = 0
+        staging = f"staging_{table}"
+        for batch in batched(records, self.batch_size):
+            await self.conn.execute(f"TRUNCATE {staging}")
+            await self.conn.copy_records_to_table(
+                staging,
+                records=[
+                    (position, *to_row(record)) for position, record in enumerate(batch)
+                ],
+                columns=["position", "source_id", *COLUMNS[table][1:]],
+            )
+            inserted = await self.conn.fetchval(LOAD_SQL[table])
+            loaded += inserted
+            skipped += len(batch) - inserted
+            elapsed = time.perf_counter() - started
+            print(f"{table}: {loaded} rows, {loaded / elapsed:.0f} rows/s")
+        elapsed = time.perf_counter() - started
+        self.report[table] = {
+            "rows": loaded,
+            "skipped": skipped,
+            "seconds": elapsed,
+            "rows_per_second": loaded / elapsed if elapsed else 0.0,
+        }
+
+    async def finalize(self) -> None:
+        started = time.perf_counter()
+        # Temporary tables are never analyzed on their own.
+        await self.conn.execute("ANALYZE source_ids")
+        for table, statements in FINALIZE_SQL.items():
+            if self.report.get(table, {}).get("rows"):
+                for sql in statements:
+                    await self.conn.execute(sql)
+        self.report["finalize"] = {"seconds": time.perf_counter() - started}
+
+    async def sync_sequences(self) -> None:
+        """Moves each id sequence past the largest id in its table, in case
+        rows were inserted with explicit ids before."""
+        for table in COLUMNS:
+            await self.conn.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"GREATEST(max(id), nextval(pg_get_serial_sequence('{table}', 'id')))) "
+                f"FROM {table}"
+            )
+
+    def _user_row(self, record: dict) -> tuple:
+        return (
+            source_id(record["id"]),
+            record["username"],
+            record["email"],
+            record["hashed_password"],
+            self._datetime(record.get("created_at")),
+        )
+
+    def _post_row(self, record: dict) -> tuple:
+        return (
+            source_id(record["id"]),
+            source_id(record.get("owner_id")),
+            record["content"],
+            self._status(record.get("status")),
+            to_bool(record.get("ai_enabled")),
+            int(record.get("ai_delay_minutes") or 0),
+            self._datetime(record.get("created_at")),
+        )
+
+    def _comment_row(self, record: dict) -> tuple:
+        return (
+            source_id(record["id"]),
+            source_id(record.get("owner_id")),
+            source_id(record.get("post_id")),
+            source_id(record.get("parent_id")),
+            record["content"],
+            self._status(record.get("status")),
+            to_bool(record.get("is_ai")),
+            self._datetime(record.get("created_at")),
+        )
+
+    def _datetime(self, value: Any) -> datetime:
+        if not value:
+            return self.now
+        # Stored naive, in UTC; an offset is converted, not dropped.
+        value = datetime.fromisoformat(value)
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @staticmethod
+    def _status(value: str | None) -> str:
+        return Status[value.upper()].name if value else Status.ACTIVE.name
+
+
+def source_id(value: Any) -> str | None:
+    return None if value in (None, "") else str(value)
+
+
+def to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "t", "yes")
+    return bool(value)
+
+
+def batched(records: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def read_records(path: str) -> Iterator[dict]:
+    with open(path, newline="", encoding="utf-8") as file:
+        if Path(path).suffix.lower() == ".csv":
+            yield from csv.DictReader(file)
+            return
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+WORDS = (
+    "the be to of and a in that have it for not on with as you do at this but "
+    "by from they we say or an will one all would there what so up out if about "
+    "who get which go when make can like time no just know take people into year "
+    "good some could see other than then now look only come over think also back "
+    "after use two how work first well way even new want because any give day "
+    "post comment thread reply great thanks agree really interesting article"
+).split()
+
+
+class Synthetic:
+    """A reproducible synthetic forum, as source records for ``BulkLoader``.
+
+    Comments are spread over ``days`` in time order. Each one goes to a post
+    that already exists, recent posts more often the higher ``skew`` is, and
+    with probability ``reply_share`` replies to one of the latest comments of
+    that post, provided it is less than ``max_depth`` levels deep.
+    """
+
+    def __init__(
+        self,
+        users: int,
+        posts: int,
+        comments: int,
+        max_depth: int = 6,
+        reply_share: float = 0.5,
+        skew: float = 2.0,
+        banned_share: float = 0.02,
+        days: int = 365,
+        seed: int = 0,
+    ) -> None:
+        self.counts = {"users": users, "posts": posts, "comments": comments}
+        self.max_depth = max_depth
+        self.reply_share = reply_share
+        self.skew = skew
+        self.banned_share = banned_share
+        self.start = datetime.now() - timedelta(days=days)
+        self.span = timedelta(days=days)
+        self.seed = seed
+        # Unique per run, so repeated imports don't clash on usernames.
+        self.prefix = f"u{int(time.time())}_"
+
+    def users(self, hashed_password: str) -> Iterator[dict]:
+        for id_ in range(1, self.counts["users"] + 1):
+            yield {
+                "id": id_,
+                "username": f"{self.prefix}{id_}",
+                "email": f"{self.prefix}{id_}@example.com",
+                "hashed_password": hashed_password,
+                "created_at": self.start.isoformat(),
+            }
+
+    def posts(self) -> Iterator[dict]:
+        rng = random.Random(self.seed)
+        total = self.counts["posts"]
+        for id_ in range(1, total + 1):
+            yield {
+                "id": id_,
+                "owner_id": rng.randint(1, self.counts["users"]),
+                "content": self._text(rng, 20, 200),
+                "status": self._status(rng),
+                "created_at": self._at(id_ - 1, total).isoformat(),
+            }
+
+    def comments(self) -> Iterator[dict]:
+        rng = random.Random(self.seed + 1)
+        total, posts = self.counts["comments"], self.counts["posts"]
+        # Latest comments of each post with their depth, reply candidates.
+        recent: dict[int, deque[tuple[int, int]]] = {}
+        for id_ in range(1, total + 1):
+            available = max(1, min(posts, posts * id_ // total))
+            post_id = available - int(available * rng.random() ** self.skew)
+            thread = recent.setdefault(post_id, deque(maxlen=16))
+            parent_id, depth = None, 1
+            if thread and rng.random() < self.reply_share:
+                candidate, candidate_depth = rng.choice(thread)
+                if candidate_depth < self.max_depth:
+                    parent_id, depth = candidate, candidate_depth + 1
+            thread.append((id_, depth))
+            yield {
+                "id": id_,
+                "owner_id": rng.randint(1, self.counts["users"]),
+                "post_id": post_id,
+                "parent_id": parent_id,
+                "content": self._text(rng, 3, 60),
+                "status": self._status(rng),
+                "created_at": self._at(id_ - 1, total).isoformat(),
+            }
+
+    def _at(self, index: int, total: int) -> datetime:
+        return self.start + self.span * (index / total)
+
+    def _status(self, rng: random.Random) -> str:
+        banned = rng.random() < self.banned_share
+        return (Status.BANNED if banned else Status.ACTIVE).name
+
+    @staticmethod
+    def _text(rng: random.Random, min_words: int, max_words: int) -> str:
+        words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+        return " ".join(words).capitalize() + "."
+
+
+async def run(
+    db_uri: str,
+    users: Iterable[dict] = (),
+    posts: Iterable[dict] = (),
+    comments: Iterable[dict] = (),
+    batch_size: int = 10_000,
+) -> dict[str, dict[str, float]]:
+    engine = create_async_engine(db_uri)
+    try:
+        async with engine.connect() as conn:
+            raw = (await conn.get_raw_connection()).driver_connection
+            # On the asyncpg connection itself, which all statements go
+            # through; SQLAlchemy would only begin once it executes one.
+            async with raw.transaction():
+                loader = BulkLoader(raw, batch_size)
+                await loader.create_temp_tables()
+                await loader.sync_sequences()
+                await loader.load_users(users)
+                await loader.load_posts(posts)
+                await loader.load_comments(comments)
+                await loader.finalize()
+    finally:
+        await engine.dispose()
+    return loader.report
+
+
+def print_report(report: dict[str, dict[str, float]], elapsed: float) -> None:
+    print(f"{'':<10}{'rows':>12}{'skipped':>10}{'seconds':>10}{'rows/s':>12}")
+    for table in COLUMNS:
+        if table in report:
+            stats = report[table]
+            print(
+                f"{table:<10}{stats['rows']:>12.0f}{stats['skipped']:>10.0f}"
+                f"{stats['seconds']:>10.2f}{stats['rows_per_second']:>12.0f}"
+            )
+    print(f"finalize {report['finalize']['seconds']:.2f}s, total {elapsed:.2f}s")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-uri", default=settings.DB_URI)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load = commands.add_parser("load", help="import NDJSON or CSV files")
+    for table in COLUMNS:
+        load.add_argument(f"--{table}", help=f"{table} file, .csv or NDJSON")
+
+    generate = commands.add_parser("generate", help="import a synthetic forum")
+    generate.add_argument("--users", type=int, default=1_000)
+    generate.add_argument("--posts", type=int, default=10_000)
+    generate.add_argument("--comments", type=int, default=100_000)
+    generate.add_argument("--max-depth", type=int, default=6)
+    generate.add_argument("--reply-share", type=float, default=0.5)
+    generate.add_argument("--skew", type=float, default=2.0)
+    generate.add_argument("--banned-share", type=float, default=0.02)
+    generate.add_argument("--days", type=int, default=365)
+    generate.add_argument("--password", default="password")
+    generate.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "load":
+        sources = {
+            table: read_records(getattr(args, table))
+            for table in COLUMNS
+            if getattr(args, table)
+        }
+    else:
+        synthetic = Synthetic(
+            args.users,
+            args.posts,
+            args.comments,
+            args.max_depth,
+            args.reply_share,
+            args.skew,
+            args.banned_share,
+            args.days,
+            args.seed,
+        )
+        sources = {
+            "users": synthetic.users(get_password_hash(args.password)),
+            "posts": synthetic.posts(),
+            "comments": synthetic.comments(),
+        }
+        print(f'Users are named "{synthetic.prefix}<n>", password "{args.password}"')
+
+    started = time.perf_counter()
+    report = await run(args.db_uri, batch_size=args.batch_size, **sources)
+    print_report(report, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+import random
+
+from better_profanity.utils import read_wordlist
+
+from app.core.profanity import WORDLIST_PATH
+
+COMMON_WORDS = (
+    "the be to of and a in that have it for not on with he as you do at this "
+    "but his by from they we say her she or an will my one all would there "
+    "their what so up out if about who get which go me when make can like time "
+    "no just him know take people into year your good some could them see other "
+    "than then now look only come its over think also back after use two how our "
+    "work first well way even new want because any these give day most us post "
+    "comment thread reply great thanks agree really interesting article class "
+    "assassin grape cocktail scunthorpe classic passage analysis document"
+).split()
+
+LEET = {"a": "4", "e": "3", "i": "1", "o": "0", "s": "$", "t": "7"}
+
+
+def leetspeak(word: str, rng: random.Random) -> str:
+    return "".join(
+        LEET[char] if char in LEET and rng.random() < 0.3 else char for char in word
+    )
+
+
+def make_corpus(
+    size: int, min_words: int, max_words: int, profane_share: float, seed: int = 0
+) -> list[str]:
+    """Synthetic post bodies: common words with occasional wordlist entries,
+    some of them in leetspeak, and punctuation between sentences."""
+    rng = random.Random(seed)
+    wordlist = list(read_wordlist(WORDLIST_PATH))
+    texts = []
+    for _ in range(size):
+        words = []
+        for _ in range(rng.randint(min_words, max_words)):
+            word = rng.choice(COMMON_WORDS)
+            if rng.random() < 0.1:
+                word += rng.choice(".,!?")
+            words.append(word)
+        if rng.random() < profane_share:
+            words.insert(
+                rng.randrange(len(words)), leetspeak(rng.choice(wordlist), rng)
+            )
+        # better_profanity skips a one-character final word, keep it out of play
+        texts.append(" ".join(words) + " end.")
+    return texts
@@ -0,0 +1,135 @@
+"""Throughput and tail latency of the list endpoints with FastAPI's default
+response handling versus ``DTOResponse``.
+
+Seeds posts and comments on one post into a scratch database (all tables
+are dropped and recreated). The default path is served by copies of the
+routes mounted under /baseline, which return the DTO and leave validation
+and encoding to FastAPI; both run the same service code in-process.
+
+    python -m benchmarks.json_responses --db-uri postgresql+asyncpg://.../bench
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.dependencies import get_comment_service, get_db, get_post_service
+from app.core.config import settings
+from app.core.db import Base, commit
+from app.main.web import create_app
+from app.schemas.comment import CommentsListResultDTO, ReadCommentsListDTO
+from app.schemas.pagination import Pagination
+from app.schemas.post import PostId, PostsListResultDTO
+from app.services.comment_service import CommentService
+from app.services.post_service import PostService
+
+SEED_SQL = [
+    """
+    INSERT INTO users (username, email, hashed_password)
+    SELECT 'user' || i, 'user' || i || '@example.com', 'x'
+    FROM generate_series(1, 100) AS i
+    """,
+    """
+    INSERT INTO posts (owner_id, content, status, ai_enabled, ai_delay_minutes)
+    SELECT 1 + i % 100, repeat('post body ', 20) || i, 'ACTIVE', false, 0
+    FROM generate_series(1, :rows) AS i
+    """,
+    """
+    INSERT INTO comments (owner_id, post_id, content, status, is_ai)
+    SELECT 1 + i % 100, 1, repeat('comment body ', 10) || i, 'ACTIVE', false
+    FROM generate_series(1, :rows) AS i
+    """,
+]
+
+
+def add_baseline_routes(app: FastAPI) -> None:
+    @app.get("/baseline/posts/")
+    async def read_posts_all(
+        pagination: Pagination = Depends(),
+        post_service: PostService = Depends(get_post_service),
+    ) -> PostsListResultDTO:
+        return await post_service.get_posts(pagination)
+
+    @app.get("/baseline/posts/{post_id}/comments/")
+    async def read_all_comments(
+        post_id: PostId = Depends(),
+        pagination: Pagination = Depends(),
+        comment_service: CommentService = Depends(get_comment_service),
+    ) -> CommentsListResultDTO:
+        dto = ReadCommentsListDTO(post_id=post_id.post_id, pagination=pagination)
+        return await comment_service.get_post_comments(dto)
+
+
+async def measure(
+    client: AsyncClient, url: str, requests: int, concurrency: int
+) -> tuple[float, float]:
+    """Requests per second and p99 latency in ms."""
+    remaining = iter(range(requests))
+    latencies = []
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return requests / elapsed, latencies[int(len(latencies) * 0.99) - 1] * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-uri", required=True, help="scratch database, wiped")
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--limit", type=int, default=settings.MAX_PAGE_SIZE)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.db_uri, pool_size=args.concurrency)
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TYPE IF EXISTS status CASCADE"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        for sql in SEED_SQL:
+            await conn.execute(text(sql), {"rows": args.rows})
+        await conn.execute(text("ANALYZE"))
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+            await commit(db)
+
+    app = create_app()
+    add_baseline_routes(app)
+    app.dependency_overrides[get_db] = override_get_db
+
+    endpoints = ["/posts/", "/posts/1/comments/"]
+    query = f"?limit={args.limit}&total_mode=cached"
+    print(f"{args.limit}-item pages, {args.requests} requests")
+    print(f"{'':<40}{'requests/s':>12}{'p99 ms':>10}")
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        for endpoint in endpoints:
+            for label, prefix in (("default", "/baseline"), ("DTOResponse", "/api")):
+                url = prefix + endpoint + query
+                await measure(client, url, args.concurrency, args.concurrency)
+                rps, p99 = await measure(client, url, args.requests, args.concurrency)
+                name = f"GET /api{endpoint} {label}"
+                print(f"{name:<40}{rps:>12.0f}{p99:>10.2f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
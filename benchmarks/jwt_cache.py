@@ -0,0 +1,97 @@
+"""Request throughput on /api/auth/me/ with and without the decoded JWT cache.
+
+Creates the schema in a scratch database (all tables are dropped and
+recreated), adds one user and replays the same access token against the
+endpoint in-process, first with the cache disabled and then enabled.
+
+    python -m benchmarks.jwt_cache --db-uri postgresql+asyncpg://.../bench
+"""
+
+import argparse
+import asyncio
+import time
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.dependencies import get_db
+from app.core.db import Base
+from app.core.security import create_access_token, decode_token, token_cache
+from app.main.web import create_app
+from app.models import User
+
+
+def measure_decode(token: str, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        decode_token(token)
+    return repeat / (time.perf_counter() - started)
+
+
+async def measure_requests(
+    client: AsyncClient, token: str, requests: int, concurrency: int
+) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.get("/api/auth/me/", headers=headers)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-uri", required=True, help="scratch database, wiped")
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--decodes", type=int, default=50_000)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.db_uri)
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TYPE IF EXISTS status CASCADE"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with session_factory() as db:
+        user = User(username="bench", email="bench@example.com", hashed_password="x")
+        db.add(user)
+        await db.commit()
+
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    app = create_app()
+    app.dependency_overrides[get_db] = override_get_db
+    token = create_access_token(user.id)
+    maxsize = token_cache.maxsize or 10_000
+
+    results = {}
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        for label, size in (("without cache", 0), ("with cache", maxsize)):
+            token_cache.maxsize = size
+            token_cache.clear()
+            await measure_requests(client, token, args.concurrency, args.concurrency)
+            results[label] = (
+                measure_decode(token, args.decodes),
+                await measure_requests(client, token, args.requests, args.concurrency),
+            )
+    await engine.dispose()
+
+    print(f"{'':<16}{'decode/s':>12}{'requests/s':>14}")
+    for label, (decodes, requests) in results.items():
+        print(f"{label:<16}{decodes:>12.0f}{requests:>14.0f}")
+    print(f"cache: {token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+"""Latency and allocations of one list page read as ORM entities versus as
+plain rows.
+
+Seeds users, posts and comments on one post into a scratch database (all
+tables are dropped and recreated), then builds the same page of DTOs both
+ways: the previous path selects the entities and runs ``model_validate``
+on each of them, the current one is the gateway's column select and
+``to_dtos``. Allocations are the peak traced by ``tracemalloc`` while one
+page is read and converted.
+
+    python -m benchmarks.list_reads --db-uri postgresql+asyncpg://.../bench
+"""
+
+import argparse
+import asyncio
+import gc
+import statistics
+import time
+import tracemalloc
+from typing import Awaitable, Callable
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.db import Base
+from app.models import Comment, Post, User
+from app.models.common.enums.status import Status
+from app.repositories.comment_gateway import CommentDbGateway
+from app.repositories.post_gateway import PostDbGateway
+from app.repositories.user_gateway import UserDbGateway
+from app.schemas.comment import CommentDTO
+from app.schemas.post import PostDTO
+from app.schemas.user import UserDTO
+from app.services.common.base_service import to_dtos
+
+SEED_SQL = [
+    """
+    INSERT INTO users (username, email, hashed_password)
+    SELECT 'user' || i, 'user' || i || '@example.com', 'x'
+    FROM generate_series(1, :rows) AS i
+    """,
+    """
+    INSERT INTO posts (owner_id, content, status, ai_enabled, ai_delay_minutes)
+    SELECT 1 + i % 100, repeat('post body ', 20) || i, 'ACTIVE', false, 0
+    FROM generate_series(1, :rows) AS i
+    """,
+    """
+    INSERT INTO comments (owner_id, post_id, content, status, is_ai)
+    SELECT 1 + i % 100, 1, repeat('comment body ', 10) || i, 'ACTIVE', false
+    FROM generate_series(1, :rows) AS i
+    """,
+]
+
+Page = Callable[[AsyncSession, int], Awaitable[list]]
+
+
+def orm_page(model, dto, *where) -> Page:
+    async def read(db: AsyncSession, limit: int) -> list:
+        stmt = select(model).where(*where).order_by(model.created_at, model.id)
+        entities = (await db.scalars(stmt.limit(limit))).all()
+        return [dto.model_validate(entity, from_attributes=True) for entity in entities]
+
+    return read
+
+
+PAGES: dict[str, tuple[Page, Page]] = {
+    "posts": (
+        orm_page(Post, PostDTO, Post.status == Status.ACTIVE),
+        lambda db, limit: PostDbGateway(db).get_list(0, limit),
+    ),
+    "users": (
+        orm_page(User, UserDTO),
+        lambda db, limit: UserDbGateway(db).get_list(0, limit),
+    ),
+    "comments": (
+        orm_page(
+            Comment, CommentDTO, Comment.post_id == 1, Comment.status == Status.ACTIVE
+        ),
+        lambda db, limit: CommentDbGateway(db).get_list_by_post_id(1, 0, limit),
+    ),
+}
+DTOS = {"posts": PostDTO, "users": UserDTO, "comments": CommentDTO}
+
+
+async def measure(
+    sessions: async_sessionmaker, read: Page, limit: int, repeat: int
+) -> tuple[float, float, float]:
+    """Median and p95 latency in ms and peak allocated KiB per page."""
+    latencies, peaks = [], []
+    for traced in (False, True):
+        # tracemalloc slows everything down, so timings come from a pass
+        # without it.
+        if traced:
+            tracemalloc.start()
+        for _ in range(repeat):
+            async with sessions() as db:
+                await db.execute(text("SELECT 1"))  # keep the checkout out of it
+                gc.collect()
+                if traced:
+                    tracemalloc.reset_peak()
+                    before = tracemalloc.get_traced_memory()[0]
+                    await read(db, limit)
+                    peaks.append((tracemalloc.get_traced_memory()[1] - before) / 1024)
+                else:
+                    started = time.perf_counter()
+                    await read(db, limit)
+                    latencies.append((time.perf_counter() - started) * 1000)
+        tracemalloc.stop()
+    latencies.sort()
+    return (
+        statistics.median(latencies),
+        latencies[int(len(latencies) * 0.95) - 1],
+        statistics.median(peaks),
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-uri", required=True, help="scratch database, wiped")
+    parser.add_argument("--rows", type=int, default=1_000, help="page size")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.db_uri)
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TYPE IF EXISTS status CASCADE"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        for sql in SEED_SQL:
+            await conn.execute(text(sql), {"rows": args.rows})
+        await conn.execute(text("ANALYZE"))
+    sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    print(f"{args.rows}-row page, median of {args.repeat} runs")
+    print(f"{'':<22}{'p50 ms':>10}{'p95 ms':>10}{'peak KiB':>12}")
+    for name, (orm_read, gateway_read) in PAGES.items():
+        dto = DTOS[name]
+
+        async def rows_read(db: AsyncSession, limit: int) -> list:
+            return to_dtos(dto, await gateway_read(db, limit))
+
+        for label, read in (("orm", orm_read), ("rows", rows_read)):
+            await measure(sessions, read, args.rows, 3)  # warm up
+            p50, p95, peak = await measure(sessions, read, args.rows, args.repeat)
+            print(f"{name + ' ' + label:<22}{p50:>10.2f}{p95:>10.2f}{peak:>12.0f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
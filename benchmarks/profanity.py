@@ -0,0 +1,54 @@
+"""Profanity check throughput: the precompiled trie against better_profanity.
+
+Runs both matchers over the same synthetic corpus of post bodies and reports
+texts per second and how many verdicts differ.
+
+    python -m benchmarks.profanity --texts 2000 --max-words 400
+"""
+
+import argparse
+import time
+
+from better_profanity import profanity
+
+from app.core.profanity import ProfanityFilter
+from benchmarks.corpus import make_corpus
+
+
+def measure(check, texts: list[str]) -> tuple[float, list[bool]]:
+    started = time.perf_counter()
+    verdicts = [check(text) for text in texts]
+    return len(texts) / (time.perf_counter() - started), verdicts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=2_000)
+    parser.add_argument("--min-words", type=int, default=5)
+    parser.add_argument("--max-words", type=int, default=400)
+    parser.add_argument("--profane-share", type=float, default=0.1)
+    args = parser.parse_args()
+
+    texts = make_corpus(args.texts, args.min_words, args.max_words, args.profane_share)
+    print(f"{len(texts)} texts, {sum(map(len, texts)) / len(texts):.0f} chars avg")
+
+    started = time.perf_counter()
+    profanity.load_censor_words()
+    library_load = time.perf_counter() - started
+    profanity_filter = ProfanityFilter()
+    started = time.perf_counter()
+    profanity_filter.load()
+    trie_load = time.perf_counter() - started
+
+    library_rate, expected = measure(profanity.contains_profanity, texts)
+    trie_rate, verdicts = measure(profanity_filter.contains_profanity, texts)
+    mismatches = sum(a != b for a, b in zip(expected, verdicts))
+
+    print(f"{'':<16}{'load, ms':>10}{'texts/s':>12}")
+    print(f"{'better_profanity':<16}{library_load * 1000:>10.1f}{library_rate:>12.0f}")
+    print(f"{'trie':<16}{trie_load * 1000:>10.1f}{trie_rate:>12.0f}")
+    print(f"speedup {trie_rate / library_rate:.1f}x, {mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Query plans and latencies of the gateway queries with and without the
+secondary indexes.
+
+Seeds a synthetic dataset into a scratch database (all tables are dropped
+and recreated) and runs every hot gateway query twice: once with only the
+primary keys in place and once with the indexes declared on the models.
+
+    python -m benchmarks.query_indexes --db-uri postgresql+asyncpg://.../bench
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import AddConstraint, DropConstraint, UniqueConstraint
+
+from app.core.db import Base
+from app.models import Comment, CommentDailyStats, Post, User  # noqa: F401
+from app.repositories.comment_gateway import CommentDbGateway
+from app.repositories.comment_stats_gateway import CommentStatsDbGateway
+from app.repositories.post_gateway import PostDbGateway
+from app.repositories.user_gateway import UserDbGateway
+
+SEED_SQL = [
+    """
+    INSERT INTO users (username, email, hashed_password)
+    SELECT 'user' || i, 'user' || i || '@example.com', 'x'
+    FROM generate_series(1, :users) AS i
+    """,
+    """
+    INSERT INTO posts (owner_id, content, status, ai_enabled, ai_delay_minutes)
+    SELECT 1 + (i % :users), 'post ' || i,
+           CASE WHEN i % 20 = 0 THEN 'BANNED' ELSE 'ACTIVE' END::status,
+           false, 0
+    FROM generate_series(1, :posts) AS i
+    """,
+    # A tenth of the comments land on post 1 so it behaves like a hot thread.
+    """
+    INSERT INTO comments (owner_id, post_id, content, status, is_ai, created_at)
+    SELECT 1 + (i % :users),
+           CASE WHEN i % 10 = 0 THEN 1 ELSE 1 + (i % :posts) END,
+           'comment ' || i,
+           CASE WHEN i % 15 = 0 THEN 'BANNED' ELSE 'ACTIVE' END::status,
+           false,
+           now() - make_interval(mins => i % 43200)
+    FROM generate_series(1, :comments) AS i
+    """,
+    """
+    UPDATE comments SET parent_id = id - 10
+    WHERE post_id = 1 AND id > 10 AND id % 3 = 0
+    """,
+    """
+    WITH RECURSIVE tree (id, path) AS (
+        SELECT id, ''::text FROM comments WHERE parent_id IS NULL
+        UNION ALL
+        SELECT comments.id, tree.path || lpad(tree.id::text, 10, '0') || '.'
+        FROM comments JOIN tree ON comments.parent_id = tree.id
+    )
+    UPDATE comments SET path = tree.path
+    FROM tree
+    WHERE comments.id = tree.id AND tree.path <> ''
+    """,
+    """
+    INSERT INTO comment_daily_stats (post_id, day, total, banned)
+    SELECT post_id, date(created_at), count(*),
+           count(*) FILTER (WHERE status = 'BANNED')
+    FROM comments
+    GROUP BY post_id, date(created_at)
+    """,
+]
+
+
+async def count_descendants(db) -> int:
+    gateway = CommentDbGateway(db)
+    return await gateway.count_active_descendants(await gateway.get_by_id(1, 20))
+
+
+def queries(users: int):
+    today = date.today()
+    return {
+        "user by email": lambda db: UserDbGateway(db).get_by_email(
+            f"user{users // 2}@example.com"
+        ),
+        "user by username": lambda db: UserDbGateway(db).get_by_username(
+            f"user{users // 2}"
+        ),
+        "users page": lambda db: UserDbGateway(db).get_list(0, 10),
+        "posts page": lambda db: PostDbGateway(db).get_list(0, 10),
+        "posts by owner": lambda db: PostDbGateway(db).get_user_posts(7),
+        "post comments page": lambda db: CommentDbGateway(db).get_list_by_post_id(
+            1, 0, 10
+        ),
+        "post comments count": lambda db: CommentDbGateway(db).get_total(1),
+        "comment subtree count": count_descendants,
+        "daily breakdown": lambda db: CommentStatsDbGateway(db).get_daily(
+            1, today - timedelta(days=30), today
+        ),
+    }
+
+
+async def seed(engine: AsyncEngine, args: argparse.Namespace) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TYPE IF EXISTS status CASCADE"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        params = {"users": args.users, "posts": args.posts, "comments": args.comments}
+        for sql in SEED_SQL:
+            await conn.execute(text(sql), params)
+    await analyze(engine)
+
+
+async def analyze(engine: AsyncEngine) -> None:
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE"))
+
+
+def secondary_indexes():
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            yield index
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                yield constraint
+
+
+async def drop_indexes(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        for item in secondary_indexes():
+            if isinstance(item, UniqueConstraint):
+                await conn.execute(DropConstraint(item))
+            else:
+                await conn.run_sync(item.drop)
+    await analyze(engine)
+
+
+async def create_indexes(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        for item in secondary_indexes():
+            if isinstance(item, UniqueConstraint):
+                await conn.execute(AddConstraint(item))
+            else:
+                await conn.run_sync(item.create)
+    await analyze(engine)
+
+
+async def measure(engine: AsyncEngine, users: int, repeat: int) -> dict:
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    results = {}
+    for name, query in queries(users).items():
+        timings = []
+        for _ in range(repeat):
+            async with session_factory() as db:
+                started = time.perf_counter()
+                await query(db)
+                timings.append((time.perf_counter() - started) * 1000)
+
+        captured.clear()
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        async with session_factory() as db:
+            await query(db)
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+        statement, parameters = captured[-1]
+        async with engine.connect() as conn:
+            plan = await conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF) {statement}", parameters
+            )
+            plan_lines = [row[0] for row in plan]
+        results[name] = (statistics.median(timings), plan_lines)
+    return results
+
+
+def report(before: dict, after: dict, verbose: bool) -> None:
+    print(f"{'query':<24}{'before, ms':>12}{'after, ms':>12}{'speedup':>10}")
+    for name, (before_ms, _) in before.items():
+        after_ms = after[name][0]
+        print(
+            f"{name:<24}{before_ms:>12.2f}{after_ms:>12.2f}"
+            f"{before_ms / after_ms:>9.1f}x"
+        )
+    for name in before:
+        print(f"\n== {name}")
+        for label, plans in (("before", before), ("after", after)):
+            lines = plans[name][1]
+            if not verbose:
+                lines = [line for line in lines if "Scan" in line] or lines[:1]
+            print(f"  {label}:")
+            for line in lines:
+                print(f"    {line}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-uri", required=True, help="scratch database, wiped")
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--comments", type=int, default=2_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--verbose", action="store_true", help="print full plans")
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.db_uri)
+    print(
+        f"Seeding {args.users} users, {args.posts} posts, {args.comments} comments..."
+    )
+    await seed(engine, args)
+
+    await drop_indexes(engine)
+    before = await measure(engine, args.users, args.repeat)
+    await create_indexes(engine)
+    after = await measure(engine, args.users, args.repeat)
+    await engine.dispose()
+
+    report(before, after, args.verbose)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())